@@ -0,0 +1,36 @@
+import paths
+from benchmark.core.run_benchmark import run_benchmark
+from benchmark.core.compare_benchmark import compare_benchmark
+from benchmark.utils.find_scaling_exponent import find_scaling_exponent
+
+# Hệ số nhân số chia lưới so với lưới mặc định
+scales = (0.25, 0.5, 1.0)
+repeat = 1
+measure_memory = True
+output_path = "results/benchmark/benchmark.jsonl"
+
+# File benchmark của phiên bản trước để phát hiện regression (None: bỏ qua)
+baseline_path = None
+
+records = run_benchmark(scales=scales,
+                        output_path=output_path,
+                        repeat=repeat,
+                        measure_memory=measure_memory)
+
+print(f"\n{'STAGE':<36}{'SCALE':>7}{'CELLS':>10}{'TIME (s)':>12}{'PEAK (MB)':>12}")
+for record in records:
+    peak = "-" if record["peak_memory"] is None else f"{record['peak_memory'] / 1024 ** 2:.1f}"
+    print(f"{record['stage']:<36}{record['scale']:>7}{record['n_cells']:>10}{record['time']:>12.3f}{peak:>12}")
+
+print("\nScaling exponent (time ~ n_cells^p):")
+for stage, exponent in find_scaling_exponent(records).exponent.items():
+    print(f"  {stage:<36}{exponent:.2f}")
+
+if baseline_path is not None:
+    comparison = compare_benchmark(output_path, baseline_path)
+    regressions = [item for item in comparison if item["regression"]]
+    for item in regressions:
+        print(f"[REGRESSION] {item['stage']} (scale {item['scale']}): "
+              f"{item['baseline_time']:.3f}s -> {item['time']:.3f}s (x{item['ratio']:.2f})")
+    if not regressions:
+        print("No regression against baseline.")
@@ -0,0 +1,32 @@
+from benchmark.core.run_benchmark import load_benchmark
+
+def compare_benchmark(path,
+                      baseline_path,
+                      tolerance=0.25,
+                      min_time=0.05,
+                      run_id=None,
+                      baseline_run_id=None):
+    """
+    So sánh lần chạy benchmark với baseline theo từng (scale, stage).
+    Một stage bị coi là chậm đi (regression) khi time > (1 + tolerance) * baseline
+    và baseline đủ lớn (>= min_time giây) để không bị nhiễu chi phối.
+    Trả về list dict: scale, stage, n_cells, time, baseline_time, ratio, regression.
+    """
+    records = load_benchmark(path, run_id=run_id)
+    baseline = {(record["scale"], record["stage"]): record
+                for record in load_benchmark(baseline_path, run_id=baseline_run_id)}
+
+    comparison = []
+    for record in records:
+        reference = baseline.get((record["scale"], record["stage"]))
+        if reference is None:
+            continue
+        ratio = record["time"] / reference["time"] if reference["time"] > 0 else float("inf")
+        comparison.append({"scale": record["scale"],
+                           "stage": record["stage"],
+                           "n_cells": record["n_cells"],
+                           "time": record["time"],
+                           "baseline_time": reference["time"],
+                           "ratio": ratio,
+                           "regression": reference["time"] >= min_time and ratio > 1 + tolerance})
+    return comparison
@@ -0,0 +1,167 @@
+import os
+import json
+import time
+import platform
+import numpy as np
+from benchmark.utils.measure_stage import measure_stage
+
+# Lưới mặc định của AxialFluxMotorType1.create_adaptive_mesh, scale = 1.0
+DEFAULT_MESH_PARAMETER = {"n_r_in": 2,
+                          "n_r_1": 3,
+                          "n_r_2": 6,
+                          "n_r_3": 3,
+                          "n_r_out": 2,
+                          "n_theta": 70,
+                          "n_z_in_air": 2,
+                          "n_z_rotor_yoke": 3,
+                          "n_z_magnet": 3,
+                          "n_z_airgap": 3,
+                          "n_z_tooth_tip_1": 3,
+                          "n_z_tooth_tip_2": 3,
+                          "n_z_tooth_body": 6,
+                          "n_z_stator_yoke": 3,
+                          "n_z_out_air": 2}
+
+DEFAULT_MOTOR_PARAMETER = {"magnet_length": 4.0 * 1e-3,
+                           "airgap": 0.5 * 1e-3}
+
+DEFAULT_SOLVER_PARAMETER = {"method": "conjugate_gradient",
+                            "max_iteration": 3,
+                            "max_relative_residual": 1 * 1e-4}
+
+# Thứ tự các stage trong một lần chạy pipeline
+STAGES = ["create_geometry",
+          "create_adaptive_mesh",
+          "create_reluctance_network",
+          "update_reluctance_network",
+          "create_magnetic_potential_equation",
+          "solve_magnetic_equation",
+          "workspace_save",
+          "workspace_load"]
+
+# Biến tạm trong workspace, bị xóa sau mỗi lần chạy
+WORKSPACE_KEY = "_benchmark_motor"
+
+def scale_mesh_parameter(scale, mesh_parameter=None):
+    """Nhân số chia lưới theo mỗi hướng với scale (tối thiểu 2 ô mỗi vùng)"""
+    mesh_parameter = DEFAULT_MESH_PARAMETER if mesh_parameter is None else mesh_parameter
+    return {name: max(2, int(round(value * scale))) for name, value in mesh_parameter.items()}
+
+def run_pipeline(mesh_parameter,
+                 motor_parameter=None,
+                 solver_parameter=None,
+                 trace_memory=False):
+    """
+    Chạy toàn bộ pipeline một lần trên motor mới, trả về (shape lưới, {stage: measure_stage.Output}).
+    """
+    from motor_type.models.AxialFluxMotorType1 import AxialFluxMotorType1
+    from storage.core import workspace
+
+    motor_parameter = DEFAULT_MOTOR_PARAMETER if motor_parameter is None else motor_parameter
+    solver_parameter = DEFAULT_SOLVER_PARAMETER if solver_parameter is None else solver_parameter
+    measurements = {}
+
+    def run(stage, function):
+        measurements[stage] = measure_stage(function, trace_memory=trace_memory)
+        return measurements[stage].value
+
+    def load_motor():
+        # Load đầy đủ (kể cả các Element) để đo chi phí thực trước khi giải
+        motor = workspace.load(WORKSPACE_KEY)
+        motor.reluctance_network.elements
+        return motor
+
+    motor = AxialFluxMotorType1(**motor_parameter)
+    run("create_geometry", motor.create_geometry)
+    run("create_adaptive_mesh", lambda: motor.create_adaptive_mesh(**mesh_parameter))
+    run("create_reluctance_network", motor.create_reluctance_network)
+
+    network = motor.reluctance_network
+    run("update_reluctance_network",
+        lambda: network.update_reluctance_network(magnetic_potential=network.magnetic_potential))
+    run("create_magnetic_potential_equation",
+        lambda: network.create_magnetic_potential_equation(debug=False))
+    run("solve_magnetic_equation",
+        lambda: network.solve_magnetic_equation(debug=False, **solver_parameter))
+
+    try:
+        run("workspace_save", lambda: workspace.save(**{WORKSPACE_KEY: motor}))
+        run("workspace_load", load_motor)
+    finally:
+        workspace.delete(WORKSPACE_KEY)
+
+    return tuple(network.elements.shape), measurements
+
+def run_benchmark(scales=(0.5, 1.0),
+                  output_path="results/benchmark/benchmark.jsonl",
+                  repeat=1,
+                  warmup=True,
+                  measure_memory=True,
+                  mesh_parameter=None,
+                  motor_parameter=None,
+                  solver_parameter=None,
+                  label=None):
+    """
+    Đo thời gian và đỉnh bộ nhớ của từng stage ở nhiều kích thước lưới.
+    - scales: hệ số nhân số chia lưới (n_theta, n_r_*, n_z_*).
+    - repeat: số lần chạy đo thời gian, lấy thời gian nhỏ nhất.
+    - warmup: chạy bỏ một lần pipeline ở scale đầu tiên trước khi đo, để chi phí
+      import / khởi tạo lần đầu không rơi vào scale đầu tiên.
+    - measure_memory: chạy thêm một lần với tracemalloc để lấy đỉnh bộ nhớ.
+    Mỗi (scale, stage) ghi một dòng JSON vào output_path (ghi nối), trả về list các dòng.
+    """
+    run_id = time.strftime("%Y%m%d-%H%M%S")
+    environment = {"python": platform.python_version(),
+                   "numpy": np.__version__,
+                   "platform": platform.platform(),
+                   "processor": platform.processor()}
+
+    if warmup and len(scales) > 0:
+        run_pipeline(scale_mesh_parameter(scales[0], mesh_parameter), motor_parameter, solver_parameter)
+
+    records = []
+    for scale in scales:
+        scaled_mesh_parameter = scale_mesh_parameter(scale, mesh_parameter)
+
+        times = {stage: [] for stage in STAGES}
+        shape = None
+        for _ in range(max(int(repeat), 1)):
+            shape, measurements = run_pipeline(scaled_mesh_parameter, motor_parameter, solver_parameter)
+            for stage, measurement in measurements.items():
+                times[stage].append(measurement.time)
+
+        peak_memory = {}
+        if measure_memory:
+            _, measurements = run_pipeline(scaled_mesh_parameter, motor_parameter, solver_parameter,
+                                           trace_memory=True)
+            peak_memory = {stage: measurement.peak_memory for stage, measurement in measurements.items()}
+
+        for stage in STAGES:
+            records.append({"run_id": run_id,
+                            "label": label,
+                            "scale": scale,
+                            "shape": list(shape),
+                            "n_cells": int(np.prod(shape)),
+                            "stage": stage,
+                            "time": min(times[stage]),
+                            "times": times[stage],
+                            "peak_memory": peak_memory.get(stage),
+                            "mesh_parameter": scaled_mesh_parameter,
+                            "environment": environment})
+
+    if output_path is not None:
+        os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+        with open(output_path, "a", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record) + "\n")
+
+    return records
+
+def load_benchmark(path, run_id=None):
+    """Đọc các dòng của một lần chạy (mặc định: lần chạy cuối cùng trong file)"""
+    with open(path, "r", encoding="utf-8") as f:
+        records = [json.loads(line) for line in f if line.strip()]
+    if not records:
+        return []
+    run_id = records[-1]["run_id"] if run_id is None else run_id
+    return [record for record in records if record["run_id"] == run_id]
@@ -0,0 +1,25 @@
+from dataclasses import dataclass, field
+from typing import Dict
+import numpy as np
+
+@dataclass
+class Output:
+    # stage -> số mũ p trong time ~ n_cells^p (1: tuyến tính, 2: bậc hai, ...)
+    exponent: Dict[str, float] = field(default_factory=dict)
+
+def find_scaling_exponent(records):
+    """
+    Ước lượng độ tăng thời gian theo số ô lưới của từng stage bằng hồi quy
+    log(time) theo log(n_cells). Cần ít nhất 2 kích thước lưới khác nhau.
+    """
+    result = Output()
+    stages = dict.fromkeys(record["stage"] for record in records)
+    for stage in stages:
+        points = [(record["n_cells"], record["time"]) for record in records
+                  if record["stage"] == stage and record["time"] > 0]
+        n_cells = np.array([point[0] for point in points], dtype=float)
+        if len(np.unique(n_cells)) < 2:
+            continue
+        times = np.array([point[1] for point in points], dtype=float)
+        result.exponent[stage] = float(np.polyfit(np.log(n_cells), np.log(times), 1)[0])
+    return result
@@ -0,0 +1,38 @@
+from dataclasses import dataclass
+from typing import Any, Optional
+import time
+import tracemalloc
+
+@dataclass
+class Output:
+    value: Any
+    time: float                     # giây (wall clock)
+    peak_memory: Optional[int]      # byte, None nếu không đo bộ nhớ
+
+def measure_stage(function, trace_memory=False):
+    """
+    Chạy function() và đo thời gian, kèm đỉnh bộ nhớ Python/numpy cấp phát
+    trong lúc chạy (tracemalloc) nếu trace_memory=True.
+    tracemalloc làm chậm code Python thuần nên thời gian chỉ nên lấy từ lần
+    chạy không đo bộ nhớ.
+    """
+    if not trace_memory:
+        start = time.perf_counter()
+        value = function()
+        return Output(value=value, time=time.perf_counter() - start, peak_memory=None)
+
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    baseline, _ = tracemalloc.get_traced_memory()
+    try:
+        start = time.perf_counter()
+        value = function()
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+
+    return Output(value=value, time=elapsed, peak_memory=peak - baseline)
@@ -1,5 +1,8 @@
 import numpy as np
-import pyvista as pv
+from system.core.set_dpi_awareness import set_dpi_awareness
+
+# Số cell từ đó show() chỉ vẽ mặt ngoài của lưới
+SURFACE_ONLY_CELL_THRESHOLD = 500000
 
 
 class CylindricalMesh:
@@ -73,6 +76,8 @@ class CylindricalMesh:
 
     def to_pyvista_grid(self):
         """Xuất sang đối tượng pyvista.StructuredGrid."""
+        # pyvista chỉ import khi cần hiển thị, solver không phụ thuộc vào nó
+        import pyvista as pv
         grid = pv.StructuredGrid(self.X, self.Y, self.Z)
         try:
             vols = self.get_cell_volumes().flatten(order='F')
@@ -85,13 +90,17 @@ class CylindricalMesh:
              show_edges=True, 
              notebook=False, 
              plotter=None,      # Hỗ trợ gộp Plotter
-             opacity=0.3):      # Độ trong suốt (để nhìn xuyên qua khi vẽ chồng)
+             opacity=0.3,       # Độ trong suốt (để nhìn xuyên qua khi vẽ chồng)
+             surface_only=None):  # Chỉ vẽ mặt ngoài; None = tự bật với lưới lớn
         """
         Hiển thị lưới 3D sử dụng PyVista.
         Hỗ trợ vẽ độc lập hoặc vẽ chồng lên Geometry.
         """
+        import pyvista as pv
+
         # --- 1. XÁC ĐỊNH PLOTTER ---
         if plotter is None:
+            set_dpi_awareness()
             pv.set_plot_theme("dark")
             pl = pv.Plotter(notebook=notebook, window_size=[1200, 900])
             pl.set_background("#1A1A1A") 
@@ -105,6 +114,11 @@ class CylindricalMesh:
 
         # --- 2. CHUẨN BỊ DỮ LIỆU ---
         grid = self.to_pyvista_grid()
+        if surface_only is None:
+            surface_only = self.total_cells > SURFACE_ONLY_CELL_THRESHOLD
+        if surface_only:
+            # Lưới lớn: chỉ đẩy mặt ngoài xuống renderer
+            grid = grid.extract_surface()
 
         # --- 3. VẼ MESH ---
         pl.add_mesh(grid, 
@@ -1,5 +1,4 @@
 from core_class.utils.find_vacuum_reluctance import find_vacuum_reluctance
-from core_class.utils.extract_element_info import extract_element_info
 from core_class.utils.find_element_dimension import find_element_dimension
 from core_class.utils.find_minimum_reluctance import find_minimum_reluctance
 from core_class.utils.find_magnet_source import find_magnet_source
@@ -24,8 +23,11 @@ class Element:
                  mesh=None,
                  magnetic_potential=None,
                  winding_current=None,
-                 elements=None):
-        
+                 elements=None,
+                 segment_index=None):
+        # extract_element_info cần trimesh, chỉ dùng khi tạo phần tử từ geometry
+        from core_class.utils.extract_element_info import extract_element_info
+
         self.position = position
         self.mesh = mesh
         self.material_database = motor.material_database
@@ -34,11 +36,16 @@ class Element:
         self.elements = elements
         self.flat_position = find_flat_position(element=self).flat_position
 
+        # segment_index: phân loại đã cache (cùng geometry), bỏ qua bước giao khối
         info = extract_element_info(position=position,
                                     geometry=geometry,
-                                    mesh=mesh)
+                                    mesh=mesh,
+                                    segment_index=segment_index)
         
+        self.segment_index = info.segment_index
         self.material = info.material
+        self.material_id = self.material_database.find_material_id(material=info.material,
+                                                                   material_name=info.material_name)
         self.dimension = info.dimension
         self.dimension_ratio = find_element_segment_dimension_ratio(element=self).dimension_ratio
         self.coordinate = info.coordinate
@@ -79,24 +86,33 @@ class Element:
 
     def update_element(self, magnetic_potential=None, winding_current=None):
         if winding_current is not None:
-            self.winding_current = winding_current
-            self.winding_source = find_winding_source(element=self).winding_source
-            self.magnetic_source = find_branch_magnetic_source(element=self).branch_magnetic_source
+            self.update_winding(winding_current=winding_current)
 
         if magnetic_potential is not None:
-            self.flux_direct = find_flux_direct(element=self).flux_direct
-
-            flux_density = find_flux_density(element=self)
-            self.flux_density_direct = flux_density.flux_density_direct
-            self.flux_density_average = flux_density.flux_density_average
-            
+            self.update_flux()
             permeability_data = find_relative_permeability(element=self)
-            self.relative_permeability = permeability_data.relative_permeability
-            self.d_relative_permeability_d_B = permeability_data.d_relative_permeability_d_B
-            
-            self.reluctance = find_reluctance_updated(element=self).reluctance
-            
-            self.own_magnetic_potential = find_own_magnetic_potential(element=self).own_magnetic_potential
+            self.update_permeability(relative_permeability=permeability_data.relative_permeability,
+                                     d_relative_permeability_d_B=permeability_data.d_relative_permeability_d_B)
+
+    def update_winding(self, winding_current):
+        self.winding_current = winding_current
+        self.winding_source = find_winding_source(element=self).winding_source
+        self.magnetic_source = find_branch_magnetic_source(element=self).branch_magnetic_source
+
+    def update_flux(self):
+        self.flux_direct = find_flux_direct(element=self).flux_direct
+
+        flux_density = find_flux_density(element=self)
+        self.flux_density_direct = flux_density.flux_density_direct
+        self.flux_density_average = flux_density.flux_density_average
+
+    def update_permeability(self, relative_permeability, d_relative_permeability_d_B):
+        self.relative_permeability = relative_permeability
+        self.d_relative_permeability_d_B = d_relative_permeability_d_B
+
+        self.reluctance = find_reluctance_updated(element=self).reluctance
+
+        self.own_magnetic_potential = find_own_magnetic_potential(element=self).own_magnetic_potential
 
     def set_reluctance_minimum(self):
         self.reluctance = self.minimum_reluctance.copy()
@@ -1,25 +1,41 @@
-from core_class.utils.find_geometry_dimension_in_mesh import find_geometry_dimension_in_mesh
-from core_class.utils.create_elements import create_elements
-from core_class.utils.add_elements_lite import add_elements_lite
-from core_class.utils.show_reluctance_network import show_reluctance_network
+from core_class.utils.create_material_ids import create_material_ids
+from core_class.utils.create_segment_ids import create_segment_ids
+from core_class.utils.add_solution_history import add_solution_history
+from core_class.models.SolutionHistory import SolutionHistory
 from core_class.utils.create_magnetic_potential import create_magnetic_potential
 from core_class.utils.create_winding_current import create_winding_current
 from core_class.utils.update_reluctance_network import update_reluctance_network
 from core_class.utils.set_minimum_reluctance import set_minimum_reluctance
 from core_class.utils.rotate_reluctance_network import rotate_reluctance_network
 from core_class.utils.set_reluctance_at_zero import set_reluctance_at_zero
+from core_class.utils.find_flux_linkage import find_flux_linkage
+from core_class.utils.save_reluctance_network import save_reluctance_network
+from core_class.utils.load_reluctance_network import load_reluctance_network
+from core_class.utils.create_memory_report import create_memory_report
 from solver.core.create_magnetic_potential_equation import create_magnetic_potential_equation
 from solver.core.solve_magnetic_equation import solve_magnetic_equation
+from solver.core.solve_magnetic_equation_cached import solve_magnetic_equation_cached
+from solver.core.find_adjoint_sensitivity import find_adjoint_sensitivity
+from solver.models.SlidingInterfaceSolver import SlidingInterfaceSolver
+from storage.models.SolveCache import SolveCache
+from storage.core.lazy_component import load_lazy_component, load_all_lazy_components
 
 
 class ReluctanceNetwork:
+    # Lưu qua workspace dưới dạng thư mục mảng thay vì pickle đồ thị Element
+    array_native_storage = True
+
     def __init__(self,
                  motor = None,
                  geometry = None,
                  mesh = None,
                  magnetic_potential = None,
-                 winding_current = None,):
-        
+                 winding_current = None,
+                 segment_ids = None):
+        # Chỉ cần trimesh / shapely khi dựng mạng từ geometry, không cần khi load để giải
+        from core_class.utils.find_geometry_dimension_in_mesh import find_geometry_dimension_in_mesh
+        from core_class.utils.create_elements import create_elements
+
         self.symmetry_factor = motor.symmetry_factor
         self.material_database = motor.material_database
         self.geometry = geometry
@@ -31,11 +47,34 @@ class ReluctanceNetwork:
         
         self.winding_current = create_winding_current(reluctance_network=self)
         self.magnetic_potential = create_magnetic_potential(reluctance_network= self)
-        self.elements = create_elements(self)
-        self.list_elements_lite = None
+        # segment_ids: phân loại phần tử theo segment của một lần dựng trước cùng geometry
+        self.elements = create_elements(self, segment_ids=segment_ids)
+        self.material_ids = create_material_ids(reluctance_network=self)
+        self.solution_history = None
+        self.solve_cache = None
+
+    def create_solution_history(self,
+                                capacity = 8,
+                                path = None):
+        # path: file .npy để lưu lịch sử dạng memmap (sweep dài)
+        self.solution_history = SolutionHistory(shape = self.elements.shape,
+                                                capacity = capacity,
+                                                path = path)
+        return self.solution_history
+
+    def set_solve_cache(self,
+                        path = None,
+                        max_bytes = 2 * 1024 ** 3):
+        # path=None: tắt cache
+        self.solve_cache = SolveCache(root = path, max_bytes = max_bytes) if path is not None else None
+        return self.solve_cache
 
-    def add_elements_lite(self):
-        add_elements_lite(reluctance_network = self)
+    def create_segment_ids(self):
+        # Chỉ số segment của từng phần tử, để dựng lại mạng cùng geometry không phải phân loại
+        return create_segment_ids(reluctance_network = self)
+
+    def add_solution_history(self):
+        add_solution_history(reluctance_network = self)
     
     def update_reluctance_network(self,
                                   magnetic_potential = None,
@@ -66,15 +105,52 @@ class ReluctanceNetwork:
                                 max_relative_residual = 1 * 1e-4,
                                 adaptive_damping_factor = (0.12,0.12),
                                 load_step = 1,
-                                debug = False):
+                                debug = False,
+                                callback = None,
+                                ordering = "nested_dissection",
+                                matrix_free = False,
+                                preconditioner = "multigrid"):
         
+        if getattr(self, "solve_cache", None) is not None:
+            return solve_magnetic_equation_cached(reluctance_network = self,
+                                                  solve_cache = self.solve_cache,
+                                                  method = method,
+                                                  max_iteration = max_iteration,
+                                                  max_relative_residual = max_relative_residual,
+                                                  adaptive_damping_factor = adaptive_damping_factor,
+                                                  load_step = load_step,
+                                                  debug = debug,
+                                                  callback = callback,
+                                                  ordering = ordering,
+                                                  matrix_free = matrix_free,
+                                                  preconditioner = preconditioner)
+
         return solve_magnetic_equation(reluctance_network = self,
                                 method = method,
                                 max_iteration = max_iteration,
                                 max_relative_residual = max_relative_residual,
                                 adaptive_damping_factor = adaptive_damping_factor,
                                 load_step = load_step,
-                                debug = debug)
+                                debug = debug,
+                                callback = callback,
+                                ordering = ordering,
+                                matrix_free = matrix_free,
+                                preconditioner = preconditioner)
+    def find_adjoint_sensitivity(self,
+                                 objective,
+                                 frozen_permeability = False,
+                                 ordering = "nested_dissection"):
+        # Đạo hàm của objective theo tham số nhánh của mọi ô tại nghiệm hiện tại
+        return find_adjoint_sensitivity(reluctance_network = self,
+                                        objective = objective,
+                                        frozen_permeability = frozen_permeability,
+                                        ordering = ordering)
+
+    def find_flux_linkage(self,
+                          use_symmetry_factor = True):
+        return find_flux_linkage(reluctance_network = self,
+                                 use_symmetry_factor = use_symmetry_factor)
+
     def rotate(self,
                z_indices = [0,1,2],
                n_step = 1):
@@ -82,8 +158,80 @@ class ReluctanceNetwork:
                               z_indices = z_indices,
                               n_step = n_step)
 
+    def create_sliding_interface_solver(self,
+                                        n_rotor_layer,
+                                        rotor_offset = 0,
+                                        load_factor = 1.0,
+                                        dense = None):
+        # Từ trở hiện tại được đóng băng, các lớp z < n_rotor_layer quay theo rotor
+        return SlidingInterfaceSolver.from_reluctance_network(reluctance_network = self,
+                                                              n_rotor_layer = n_rotor_layer,
+                                                              rotor_offset = rotor_offset,
+                                                              load_factor = load_factor,
+                                                              dense = dense)
+
     def show(self,
-             use_symmetry_factor = True):
+             use_symmetry_factor = True,
+             level_of_detail = None,
+             lod_block = (2, 2, 2)):
+        from core_class.utils.show_reluctance_network import show_reluctance_network
         show_reluctance_network(reluctance_network=self,
-                                use_symmetry_factor = use_symmetry_factor)
-    
\ No newline at end of file
+                                use_symmetry_factor = use_symmetry_factor,
+                                level_of_detail = level_of_detail,
+                                lod_block = lod_block)
+    
+
+    def render(self,
+               output_dir,
+               frames = None,
+               mode = "material",
+               use_symmetry_factor = True,
+               window_size = (1600, 900),
+               camera_position = None,
+               n_workers = None,
+               video_path = None,
+               fps = 10):
+        from core_class.utils.render_reluctance_network import render_reluctance_network
+        return render_reluctance_network(reluctance_network = self,
+                                         output_dir = output_dir,
+                                         frames = frames,
+                                         mode = mode,
+                                         use_symmetry_factor = use_symmetry_factor,
+                                         window_size = window_size,
+                                         camera_position = camera_position,
+                                         n_workers = n_workers,
+                                         video_path = video_path,
+                                         fps = fps)
+
+    def memory_report(self,
+                      include_matrix = True,
+                      sample_size = 5000,
+                      debug = True):
+        report = create_memory_report(reluctance_network = self,
+                                      include_matrix = include_matrix,
+                                      sample_size = sample_size)
+        if debug:
+            print(report.report)
+        return report
+
+    def save(self, path):
+        save_reluctance_network(reluctance_network = self,
+                                path = path)
+
+    @staticmethod
+    def load(path,
+             motor = None,
+             geometry = None,
+             lazy = True):
+        return load_reluctance_network(path = path,
+                                       motor = motor,
+                                       geometry = geometry,
+                                       lazy = lazy)
+
+    def __getattr__(self, name):
+        # Thành phần chưa load (xem storage.core.lazy_component)
+        return load_lazy_component(self, name)
+
+    def __getstate__(self):
+        load_all_lazy_components(self)
+        return self.__dict__
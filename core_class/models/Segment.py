@@ -4,6 +4,7 @@ class Segment:
     def __init__(self,
                  mesh=None,
                  material="air",
+                 material_name=None,
                  magnet_source=0.0,
                  magnetization_direction=np.array([0., 0., 1.]),
                  winding_vector=np.array([0., 0., 0.]),
@@ -12,6 +13,8 @@ class Segment:
         
         self.mesh = mesh
         self.material = material
+        # Tên vật liệu cụ thể đã đăng ký trong MaterialDataBase (None = mặc định của nhóm)
+        self.material_name = material_name
         self.magnet_source = float(magnet_source)
         
         self.magnetization_direction = np.array(magnetization_direction, dtype=float)
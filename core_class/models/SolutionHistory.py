@@ -0,0 +1,116 @@
+import os
+import json
+import numpy as np
+
+# Các trường lưu cho mỗi phần tử ở mỗi frame
+FIELDS = ["B_r", "B_t", "B_z", "B_abs", "material_id", "magnetization_z"]
+FIELD_INDEX = {name: index for index, name in enumerate(FIELDS)}
+
+# File header nhỏ cạnh file .npy: số frame đã ghi xong và kích thước lưới
+HEADER_SUFFIX = ".header.json"
+
+class SolutionHistory:
+    """
+    Lịch sử nghiệm dạng cột: mảng (frames, cells, fields) cấp phát trước.
+    Thứ tự cell là thứ tự phẳng F của lưới (i + j*nr + k*nr*nt), trùng với
+    thứ tự cell của CylindricalMesh.to_pyvista_grid().
+    - path=None: mảng trong RAM, tăng gấp đôi dung lượng khi đầy.
+    - path='...npy': mảng np.memmap trên đĩa, dùng cho sweep dài. Số frame đã ghi
+      xong được lưu trong <path>.header.json sau mỗi frame, nên file của một sweep
+      bị dừng giữa chừng mở lại được bằng SolutionHistory.open(path).
+    """
+
+    def __init__(self, shape, capacity=8, path=None, dtype=np.float32):
+        self.shape = tuple(shape)
+        self.n_cells = int(np.prod(self.shape))
+        self.path = path
+        self.n_frames = 0
+        self.data = self._allocate(max(int(capacity), 1), dtype)
+        self._save_header()
+
+    @classmethod
+    def open(cls, path):
+        """Mở lại lịch sử memmap đã ghi tại path, chỉ lấy các frame đã ghi xong"""
+        with open(path + HEADER_SUFFIX, "r", encoding="utf-8") as f:
+            header = json.load(f)
+        history = cls.__new__(cls)
+        history.shape = tuple(header["shape"])
+        history.n_cells = int(np.prod(history.shape))
+        history.path = path
+        history.n_frames = int(header["n_frames"])
+        history.data = np.load(path, mmap_mode="r+")
+        return history
+
+    @classmethod
+    def from_array(cls, data, shape):
+        history = cls.__new__(cls)
+        history.shape = tuple(shape)
+        history.n_cells = int(np.prod(history.shape))
+        history.path = None
+        history.n_frames = data.shape[0]
+        history.data = np.array(data)
+        return history
+
+    def _allocate(self, capacity, dtype, path=None):
+        shape = (capacity, self.n_cells, len(FIELDS))
+        path = self.path if path is None else path
+        if path is None:
+            return np.zeros(shape, dtype=dtype)
+        return np.lib.format.open_memmap(path, mode="w+", dtype=dtype, shape=shape)
+
+    def _grow(self):
+        capacity = 2 * self.data.shape[0]
+        if self.path is None:
+            data = self._allocate(capacity, self.data.dtype)
+            data[:self.n_frames] = self.data[:self.n_frames]
+            self.data = data
+            return
+
+        # Ghi sang file mới lớn hơn rồi thay thế file cũ
+        temp_path = self.path + ".tmp"
+        data = self._allocate(capacity, self.data.dtype, path=temp_path)
+        data[:self.n_frames] = self.data[:self.n_frames]
+        data.flush()
+        del data
+        self.data.flush()
+        self.data = None
+        os.replace(temp_path, self.path)
+        self.data = np.load(self.path, mmap_mode="r+")
+
+    def _save_header(self):
+        if self.path is None:
+            return
+        temp_path = self.path + HEADER_SUFFIX + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({"n_frames": self.n_frames, "shape": list(self.shape)}, f)
+        os.replace(temp_path, self.path + HEADER_SUFFIX)
+
+    def add_frame(self, frame):
+        """Ghi một frame (cells, fields); với memmap, số frame chỉ tăng sau khi dữ liệu đã ghi"""
+        if self.n_frames == self.data.shape[0]:
+            self._grow()
+        self.data[self.n_frames] = frame
+        self.flush()
+        self.n_frames += 1
+        self._save_header()
+
+    def frame(self, index):
+        """Dữ liệu (cells, fields) của một frame, hỗ trợ chỉ số âm"""
+        return self.data[:self.n_frames][index]
+
+    def field(self, name, frame=None):
+        """
+        Một trường dạng lưới (nr, nt, nz) tại frame, hoặc (frames, nr, nt, nz) nếu frame=None.
+        """
+        values = self.data[:self.n_frames, :, FIELD_INDEX[name]]
+        if frame is not None:
+            return values[frame].reshape(self.shape, order='F')
+        values = values.reshape((self.n_frames,) + self.shape[::-1])
+        return values.transpose((0,) + tuple(range(len(self.shape), 0, -1)))
+
+    def flush(self):
+        if isinstance(self.data, np.memmap):
+            self.data.flush()
+
+    def __len__(self):
+        return self.n_frames
@@ -0,0 +1,66 @@
+import sys
+import os
+from types import SimpleNamespace
+import numpy as np
+import paths
+
+def check_uniform_block(lod_level, material_id):
+    # Mọi cell gốc trong một cell thô có cùng mã vật liệu (khi theta không bị gộp)
+    first = np.full(lod_level.n_coarse_cells, -1)
+    first[lod_level.cell_map] = material_id
+    assert np.array_equal(first[lod_level.cell_map], material_id)
+
+def test():
+    from core_class.models.CylindricalMesh import CylindricalMesh
+    from core_class.utils.create_lod_level import create_lod_level
+    from core_class.utils.find_lod_frame_data import find_lod_frame_data
+
+    # Theo z: 4 lớp sắt, 1 lớp nam châm mỏng, 1 lớp khe hở, 4 lớp sắt
+    mesh = CylindricalMesh(r_nodes=np.linspace(0.01, 0.05, 5),
+                           theta_nodes=np.linspace(0.0, np.pi / 2, 5),
+                           z_nodes=np.arange(11) * 1e-3)
+    z_material = np.array([1, 1, 1, 1, 2, 0, 1, 1, 1, 1])
+    material_3d = np.broadcast_to(z_material, (mesh.n_cells_r, mesh.n_cells_t, mesh.n_cells_z))
+    material_id = material_3d.ravel(order='F')
+
+    # Lưới thô cũ (khối cố định) nuốt lớp nam châm và khe hở
+    fixed = create_lod_level(mesh, block=(2, 1, 2))
+    assert fixed.mesh.n_cells_z == 5
+
+    lod_level = create_lod_level(mesh, block=(2, 1, 2), material_id=material_id)
+    assert np.allclose(lod_level.mesh.z_nodes, [0, 2e-3, 4e-3, 5e-3, 6e-3, 8e-3, 10e-3])
+    assert lod_level.mesh.n_cells_r == 2 and lod_level.mesh.n_cells_t == 4
+    assert lod_level.n_coarse_cells == lod_level.mesh.total_cells
+    check_uniform_block(lod_level, material_id)
+
+    # |B| lệch quá dung sai giữa hai lớp r thì không gộp
+    flux_density = np.where(material_3d == 0, np.nan, 1.0)
+    flux_density[1:, ...] += 0.5 * (material_3d[1:, ...] != 0)
+    flux_lod = create_lod_level(mesh, block=(2, 1, 2), material_id=material_id,
+                                flux_density=flux_density.ravel(order='F'), flux_tolerance=0.2)
+    assert np.allclose(flux_lod.mesh.r_nodes, [0.01, 0.02, 0.04, 0.05])
+    loose_lod = create_lod_level(mesh, block=(2, 1, 2), material_id=material_id,
+                                 flux_density=flux_density.ravel(order='F'), flux_tolerance=1.0)
+    assert np.allclose(loose_lod.mesh.r_nodes, [0.01, 0.03, 0.05])
+
+    # Màu của cell thô: lớp khe hở vẫn là air, lớp nam châm vẫn là nam châm
+    sector_material = np.tile(material_id, 2)
+    frame_data = SimpleNamespace(color_id=sector_material[None, :].astype(np.int8),
+                                 flux_density=np.where(sector_material == 0, np.nan, 1.0)[None, :].astype(np.float32))
+    lod_data = find_lod_frame_data(frame_data, cell_map=lod_level.cell_map,
+                                   n_coarse_cells=lod_level.n_coarse_cells, n_sector=2)
+    coarse_shape = (lod_level.mesh.n_cells_r, lod_level.mesh.n_cells_t, lod_level.mesh.n_cells_z)
+    coarse_color = lod_data.color_id[0][:lod_level.n_coarse_cells].reshape(coarse_shape, order='F')
+    assert np.array_equal(coarse_color[0, 0], [1, 1, 2, 0, 1, 1])
+    assert np.array_equal(lod_data.color_id[0][:lod_level.n_coarse_cells], lod_data.color_id[0][lod_level.n_coarse_cells:])
+    coarse_flux = lod_data.flux_density[0][:lod_level.n_coarse_cells].reshape(coarse_shape, order='F')
+    assert np.isnan(coarse_flux[0, 0, 3]) and np.isclose(coarse_flux[0, 0, 2], 1.0)
+
+if __name__ == "__main__":
+    current_file = os.path.abspath(__file__)
+    root_dir = os.path.dirname(os.path.dirname(os.path.dirname(current_file)))
+
+    if root_dir not in sys.path:
+        sys.path.append(root_dir)
+
+    test()
@@ -0,0 +1,50 @@
+import sys
+import os
+from types import SimpleNamespace
+import numpy as np
+import paths
+
+def test():
+    from core_class.utils.find_flux_discontinuity import find_flux_discontinuity
+
+    mesh = SimpleNamespace(r_nodes=np.array([0.01, 0.02, 0.04, 0.05]),
+                           theta_nodes=np.linspace(0.0, np.pi / 2, 5),
+                           z_nodes=np.array([0.0, 1e-3, 3e-3]),
+                           periodic_boundary=True)
+    network = SimpleNamespace(mesh=mesh)
+    dt, dz = np.diff(mesh.theta_nodes), np.diff(mesh.z_nodes)
+
+    # B đều: không có bước nhảy
+    B = np.zeros((3, 4, 2, 4))
+    B[..., :3] = [0.3, -0.2, 1.1]
+    uniform = find_flux_discontinuity(network, flux_density_field=B)
+    assert uniform.indicator_r.shape == (2,) and uniform.indicator_t.shape == (4,) and uniform.indicator_z.shape == (1,)
+    for value in (uniform.indicator_r, uniform.indicator_t, uniform.indicator_z):
+        assert np.allclose(value, 0.0)
+
+    # Bước nhảy 0.5 T của B_z qua đường nút r thứ 2 (r = 0.04): eta = 0.25 * sum(r * dtheta * dz)
+    B[2:, :, :, 2] += 0.5
+    jump = find_flux_discontinuity(network, flux_density_field=B)
+    assert np.isclose(jump.indicator_r[1], 0.25 * 0.04 * np.sum(dt) * np.sum(dz))
+    assert np.isclose(jump.indicator_r[0], 0.0)
+    assert np.allclose(jump.indicator_t, 0.0) and np.allclose(jump.indicator_z, 0.0)
+
+    # Bước nhảy theta ở ô cuối -> ô đầu chỉ thấy khi biên tuần hoàn
+    B[..., 2] = 0.0
+    B[:, 3, :, 1] += 1.0
+    periodic = find_flux_discontinuity(network, flux_density_field=B)
+    area = np.sum(np.diff(mesh.r_nodes)) * np.sum(dz)
+    assert np.allclose(periodic.indicator_t, [0.0, 0.0, area, area])
+
+    mesh.periodic_boundary = False
+    open_boundary = find_flux_discontinuity(network, flux_density_field=B)
+    assert np.allclose(open_boundary.indicator_t, [0.0, 0.0, area])
+
+if __name__ == "__main__":
+    current_file = os.path.abspath(__file__)
+    root_dir = os.path.dirname(os.path.dirname(os.path.dirname(current_file)))
+
+    if root_dir not in sys.path:
+        sys.path.append(root_dir)
+
+    test()
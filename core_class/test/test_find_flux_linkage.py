@@ -0,0 +1,40 @@
+import sys
+import os
+from types import SimpleNamespace
+import numpy as np
+import paths
+
+def create_element(axial_flux, winding_vector):
+    flux_direct = np.zeros((2, 3))
+    flux_direct[:, 2] = axial_flux
+    return SimpleNamespace(flux_direct=flux_direct, element_winding_vector=np.asarray(winding_vector, dtype=float))
+
+def test():
+    from core_class.utils.find_flux_linkage import find_flux_linkage
+
+    elements = np.empty((2, 1, 1), dtype=object)
+    elements[0, 0, 0] = create_element([1e-4, 3e-4], [10.0, 0.0, -5.0])
+    elements[1, 0, 0] = create_element([5e-4, 5e-4], [0.0, 0.0, 0.0])
+    network = SimpleNamespace(elements=elements,
+                              mesh=SimpleNamespace(theta_nodes=np.linspace(0.0, np.pi / 2, 4)),
+                              geometry=SimpleNamespace(geometry=[SimpleNamespace(winding_vector=np.zeros(3))]))
+
+    # Trung bình hai nhánh z (2e-4) nhân số vòng, phần tử không có cuộn dây bị bỏ qua
+    sector = find_flux_linkage(network, use_symmetry_factor=False).flux_linkage
+    assert np.allclose(sector, [2e-3, 0.0, -1e-3])
+
+    # Sector 1/4 vòng: nhân 4
+    assert np.allclose(find_flux_linkage(network).flux_linkage, 4 * sector)
+
+    # Phần tử chưa giải (flux_direct None) không đóng góp
+    elements[0, 0, 0].flux_direct = None
+    assert np.allclose(find_flux_linkage(network).flux_linkage, 0.0)
+
+if __name__ == "__main__":
+    current_file = os.path.abspath(__file__)
+    root_dir = os.path.dirname(os.path.dirname(os.path.dirname(current_file)))
+
+    if root_dir not in sys.path:
+        sys.path.append(root_dir)
+
+    test()
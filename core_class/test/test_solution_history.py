@@ -0,0 +1,93 @@
+import sys
+import os
+import tempfile
+from types import SimpleNamespace
+import numpy as np
+import paths
+
+SHAPE = (2, 3, 2)
+
+def create_frame(value):
+    from core_class.models.SolutionHistory import FIELDS
+
+    n_cells = int(np.prod(SHAPE))
+    return value + np.arange(n_cells * len(FIELDS), dtype=np.float32).reshape(n_cells, len(FIELDS))
+
+def check_append_and_grow():
+    from core_class.models.SolutionHistory import SolutionHistory, FIELD_INDEX
+
+    history = SolutionHistory(shape=SHAPE, capacity=2)
+    for value in range(5):
+        history.add_frame(create_frame(100 * value))
+    assert len(history) == 5 and history.data.shape[0] == 8
+    assert np.array_equal(history.frame(-1), create_frame(400))
+    assert np.array_equal(history.frame(1), create_frame(100))
+
+    # Trường dạng lưới theo thứ tự F
+    B_abs = history.field("B_abs", frame=2)
+    assert B_abs.shape == SHAPE
+    assert np.array_equal(B_abs.ravel(order='F'), create_frame(200)[:, FIELD_INDEX["B_abs"]])
+    assert np.array_equal(history.field("B_abs")[2], B_abs)
+
+def check_memmap_reopen(root):
+    from core_class.models.SolutionHistory import SolutionHistory
+
+    path = os.path.join(root, "history.npy")
+    history = SolutionHistory(shape=SHAPE, capacity=2, path=path)
+    assert len(SolutionHistory.open(path)) == 0
+    for value in range(3):
+        history.add_frame(create_frame(value))
+
+    # Mở lại khi sweep chưa kết thúc (không flush / đóng): chỉ thấy các frame đã ghi xong
+    reopened = SolutionHistory.open(path)
+    assert len(reopened) == 3 and reopened.shape == SHAPE and reopened.data.shape[0] == 4
+    assert np.array_equal(reopened.frame(2), create_frame(2))
+
+    # Ghi tiếp vào file đã mở lại, kể cả khi phải tăng dung lượng
+    del history
+    for value in range(3, 6):
+        reopened.add_frame(create_frame(value))
+    assert SolutionHistory.open(path).data.shape[0] == 8
+    again = SolutionHistory.open(path)
+    assert len(again) == 6
+    assert np.array_equal(again.frame(5), create_frame(5)) and np.array_equal(again.frame(0), create_frame(0))
+
+def check_add_solution_history():
+    from core_class.utils.add_solution_history import add_solution_history
+    from core_class.models.SolutionHistory import FIELD_INDEX
+
+    elements = np.empty(SHAPE, dtype=object, order='F')
+    for flat_index, index in enumerate(np.ndindex(SHAPE)):
+        flux_density = None if flat_index == 0 else np.array([1.0, 2.0, 3.0, flat_index])
+        elements[index] = SimpleNamespace(flux_density_average=flux_density,
+                                          magnetization_direction=np.array([0.0, 0.0, -1.0 if index[2] else 1.0]))
+    material_ids = np.asfortranarray(np.arange(np.prod(SHAPE)).reshape(SHAPE) % 3)
+    network = SimpleNamespace(elements=elements, material_ids=material_ids, solution_history=None)
+
+    add_solution_history(network)
+    add_solution_history(network)
+    history = network.solution_history
+    assert len(history) == 2
+    assert np.array_equal(history.field("material_id", frame=1), material_ids)
+    assert np.array_equal(history.field("magnetization_z", frame=0)[:, :, 1], -np.ones(SHAPE[:2]))
+    B_abs = history.field("B_abs", frame=0)
+    for index in np.ndindex(SHAPE):
+        element = elements[index]
+        expected = 0.0 if element.flux_density_average is None else element.flux_density_average[3]
+        assert B_abs[index] == expected
+    assert history.frame(0)[0, FIELD_INDEX["B_r"]] == 0.0
+
+def test():
+    check_append_and_grow()
+    with tempfile.TemporaryDirectory() as root:
+        check_memmap_reopen(root)
+    check_add_solution_history()
+
+if __name__ == "__main__":
+    current_file = os.path.abspath(__file__)
+    root_dir = os.path.dirname(os.path.dirname(os.path.dirname(current_file)))
+
+    if root_dir not in sys.path:
+        sys.path.append(root_dir)
+
+    test()
@@ -0,0 +1,29 @@
+import numpy as np
+from core_class.models.SolutionHistory import SolutionHistory, FIELDS, FIELD_INDEX
+from core_class.utils.save_reluctance_network import stack_element_field
+
+def add_solution_history(reluctance_network):
+    """
+    Ghi trạng thái hiện tại (B, material id, hướng từ hóa) vào một frame mới
+    của reluctance_network.solution_history, không tạo đối tượng cho từng phần tử.
+    """
+    elements = reluctance_network.elements
+    if reluctance_network.solution_history is None:
+        reluctance_network.solution_history = SolutionHistory(shape=elements.shape)
+
+    element_list = list(elements.ravel(order='F'))
+    n_cells = len(element_list)
+    frame = np.zeros((n_cells, len(FIELDS)), dtype=reluctance_network.solution_history.data.dtype)
+    frame[:, FIELD_INDEX["material_id"]] = np.ravel(reluctance_network.material_ids, order='F')
+
+    # Phần tử chưa có giá trị (None) giữ 0
+    flux_density = stack_element_field(element_list, "flux_density_average", (n_cells,))
+    if flux_density is not None:
+        B_start = FIELD_INDEX["B_r"]
+        frame[:, B_start:B_start + 4] = np.nan_to_num(flux_density, nan=0.0)
+
+    magnetization_direction = stack_element_field(element_list, "magnetization_direction", (n_cells,))
+    if magnetization_direction is not None:
+        frame[:, FIELD_INDEX["magnetization_z"]] = np.nan_to_num(magnetization_direction[:, -1], nan=0.0)
+
+    reluctance_network.solution_history.add_frame(frame)
@@ -2,7 +2,8 @@ from core_class.models.Element import Element
 import numpy as np 
 from tqdm import tqdm
 
-def create_elements(motor, debug=True):
+def create_elements(motor, segment_ids=None, debug=True):
+    # segment_ids: (nr, nt, nz) chỉ số segment của từng phần tử đã phân loại trước (tùy chọn)
     nr = int(motor.mesh.n_cells_r)
     nt = int(motor.mesh.n_cells_t)
     nz = int(motor.mesh.n_cells_z)
@@ -27,7 +28,8 @@ def create_elements(motor, debug=True):
                         mesh=motor.mesh,
                         magnetic_potential=motor.magnetic_potential,
                         winding_current=motor.winding_current,
-                        elements=elements
+                        elements=elements,
+                        segment_index=None if segment_ids is None else segment_ids[position]
                     )
                     pbar.update(1)
 
@@ -0,0 +1,96 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, List
+import numpy as np
+import pyvista as pv
+
+@dataclass
+class SegmentRenderData:
+    segment_index: int
+    template_key: Any
+    transform: np.ndarray       # 4x4, áp lên polydata template (actor.user_matrix)
+    category: str               # iron / magnet / coil / air / default
+    info: str
+
+@dataclass
+class Output:
+    key: tuple
+    templates: Dict[Any, pv.PolyData] = field(default_factory=dict)
+    segments: List[SegmentRenderData] = field(default_factory=list)
+
+def find_geometry_render_key(geometry):
+    """Khóa nhận biết thay đổi của danh sách segment (thêm / bớt / thay mesh, vật liệu)"""
+    return tuple((id(segment), id(segment.mesh), str(segment.material)) for segment in geometry.geometry)
+
+def create_geometry_render_data(geometry):
+    """
+    Chuẩn bị một lần dữ liệu hiển thị của Geometry: polydata đã clean + normals và
+    chuỗi thông tin của từng segment. Các segment là bản xoay của cùng một mesh
+    (rotate_mesh_z) dùng chung một polydata template, chỉ khác ma trận biến đổi.
+    """
+    result = Output(key=find_geometry_render_key(geometry))
+    template_transform = {}
+
+    for segment_index, segment in enumerate(geometry.geometry):
+        mesh_data = segment.mesh
+        if mesh_data is None:
+            continue
+
+        metadata = getattr(mesh_data, "metadata", {}) or {}
+        template_key = metadata.get("render_template", ("segment", segment_index))
+        mesh_transform = np.asarray(metadata.get("render_transform", np.eye(4)), dtype=float)
+
+        if template_key not in result.templates:
+            try:
+                pv_mesh = pv.wrap(mesh_data)
+                pv_mesh = pv_mesh.clean()
+                pv_mesh = pv_mesh.compute_normals(point_normals=True,
+                                                  split_vertices=True,
+                                                  feature_angle=30.0,
+                                                  inplace=True)
+            except Exception:
+                continue
+            result.templates[template_key] = pv_mesh
+            template_transform[template_key] = mesh_transform
+
+        # Biến đổi tương đối so với segment đầu tiên tạo ra template
+        transform = mesh_transform @ np.linalg.inv(template_transform[template_key])
+
+        result.segments.append(SegmentRenderData(segment_index=segment_index,
+                                                 template_key=template_key,
+                                                 transform=transform,
+                                                 category=find_material_category(segment.material),
+                                                 info=create_segment_info(segment)))
+    return result
+
+def find_material_category(material):
+    mat = str(material).lower()
+    if "iron" in mat or "steel" in mat:
+        return "iron"
+    if "magnet" in mat:
+        return "magnet"
+    if "copper" in mat or "coil" in mat:
+        return "coil"
+    if "air" in mat:
+        return "air"
+    return "default"
+
+def create_segment_info(segment):
+    lines = [f"{'ATTRIBUTE':<22} : {'VALUE'}", "-" * 45]
+    attrs = [a for a in vars(segment) if not a.startswith('__') and a != 'mesh']
+    priority_keys = ['material', 'index', 'r_length', 't_length', 'z_length']
+    attrs.sort(key=lambda x: (0 if x in priority_keys else 1, x))
+
+    for attr in attrs:
+        value = getattr(segment, attr)
+        val_str = str(value)
+        if value is None: val_str = "None"
+        elif isinstance(value, float): val_str = f"{value:.4f}"
+        elif isinstance(value, (np.ndarray, list)):
+            try:
+                v = np.array(value).flatten()
+                if len(v) <= 3: val_str = "[" + ", ".join([f"{x:.2f}" for x in v]) + "]"
+                else: val_str = f"Array {np.shape(value)}"
+            except: pass
+        lines.append(f"{attr:<22} : {val_str}")
+
+    return "\n".join(lines)
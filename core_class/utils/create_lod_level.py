@@ -0,0 +1,76 @@
+from dataclasses import dataclass
+import numpy as np
+from core_class.models.CylindricalMesh import CylindricalMesh
+
+# Chênh lệch |B| (T) lớn nhất giữa hai lớp cell được gộp
+LOD_FLUX_TOLERANCE = 0.2
+
+@dataclass
+class Output:
+    mesh: CylindricalMesh       # lưới thô, mỗi cell gộp tối đa block cell của lưới gốc
+    cell_map: np.ndarray        # (cells lưới gốc,) chỉ số cell thô theo thứ tự F
+    n_coarse_cells: int
+
+def find_layer_group(n_layer, step, is_similar=None):
+    """
+    Chỉ số nhóm của từng lớp cell dọc một trục: gộp tối đa step lớp liền kề,
+    mở nhóm mới khi lớp không giống lớp đầu nhóm (is_similar(first, layer) = False).
+    """
+    layer_group = np.zeros(n_layer, dtype=np.int64)
+    first, group = 0, 0
+    for layer in range(1, n_layer):
+        if layer - first >= step or (is_similar is not None and not is_similar(first, layer)):
+            first, group = layer, group + 1
+        layer_group[layer] = group
+    return layer_group
+
+def coarsen_nodes(nodes, layer_group):
+    first_layer = np.flatnonzero(np.diff(layer_group, prepend=-1))
+    return nodes[np.append(first_layer, len(nodes) - 1)]
+
+def create_lod_level(mesh, block=(2, 2, 2), material_id=None, flux_density=None,
+                     flux_tolerance=LOD_FLUX_TOLERANCE):
+    """
+    Mức chi tiết thô của lưới: gộp tối đa block = (br, bt, bz) cell liền kề.
+    material_id / flux_density: mã vật liệu và |B| (NaN ở air) của từng cell theo thứ tự F.
+    Theo r và z chỉ gộp hai lớp khi mọi cặp cell cùng mã vật liệu và lệch |B| không quá
+    flux_tolerance, nên các lớp mỏng (khe hở, nam châm) được giữ nguyên. Theo theta vẫn
+    gộp đều block[1] cell vì rotor quay làm biên vật liệu theo theta đổi giữa các frame.
+    Dữ liệu hiển thị của cell thô được gộp bằng find_lod_frame_data.
+    """
+    block = tuple(max(1, int(b)) for b in block)
+    shape = (mesh.n_cells_r, mesh.n_cells_t, mesh.n_cells_z)
+    material = None if material_id is None else np.asarray(material_id).reshape(shape, order='F')
+    flux = None if flux_density is None else np.asarray(flux_density, dtype=float).reshape(shape, order='F')
+
+    def create_similar(axis):
+        if material is None and flux is None:
+            return None
+
+        def is_similar(first, layer):
+            if material is not None and not np.array_equal(np.take(material, first, axis=axis),
+                                                           np.take(material, layer, axis=axis)):
+                return False
+            if flux is not None:
+                # So sánh với NaN (air) luôn False: cặp air - air không làm tách lớp
+                flux_error = np.abs(np.take(flux, first, axis=axis) - np.take(flux, layer, axis=axis))
+                return not np.any(flux_error > flux_tolerance)
+            return True
+        return is_similar
+
+    r_group = find_layer_group(shape[0], block[0], create_similar(0))
+    t_group = find_layer_group(shape[1], block[1])
+    z_group = find_layer_group(shape[2], block[2], create_similar(2))
+
+    coarse_mesh = CylindricalMesh(r_nodes=coarsen_nodes(mesh.r_nodes, r_group),
+                                  theta_nodes=coarsen_nodes(mesh.theta_nodes, t_group),
+                                  z_nodes=coarsen_nodes(mesh.z_nodes, z_group),
+                                  periodic_boundary=mesh.periodic_boundary,
+                                  detail_parameter=mesh.detail_parameter)
+
+    i, j, k = np.meshgrid(r_group, t_group, z_group, indexing='ij')
+    cell_map = (i + j * coarse_mesh.n_cells_r + k * coarse_mesh.n_cells_r * coarse_mesh.n_cells_t).ravel(order='F')
+
+    return Output(mesh=coarse_mesh,
+                  cell_map=cell_map,
+                  n_coarse_cells=coarse_mesh.total_cells)
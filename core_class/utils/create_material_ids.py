@@ -0,0 +1,14 @@
+import numpy as np
+
+def create_material_ids(reluctance_network):
+    """
+    Gom material id của từng phần tử vào một mảng số nguyên (nr, nt, nz), thứ tự F.
+    """
+    elements = reluctance_network.elements
+    material_ids = np.zeros(elements.shape, dtype=np.int32, order='F')
+
+    for index, element in np.ndenumerate(elements):
+        if element is not None:
+            material_ids[index] = element.material_id
+
+    return material_ids
@@ -0,0 +1,170 @@
+from dataclasses import dataclass, field
+from typing import Dict
+import sys
+import numpy as np
+from storage.core.lazy_component import is_lazy_component_loaded
+
+try:
+    from pympler import asizeof
+except ImportError:
+    asizeof = None
+
+# Thuộc tính của Element trỏ tới đối tượng dùng chung của cả mạng, không tính theo phần tử
+SHARED_ELEMENT_ATTRIBUTES = {"mesh", "material_database", "magnetic_potential", "elements", "winding_current"}
+
+COMPONENTS = ["elements",
+              "element_arrays",
+              "neighbor_tables",
+              "network_arrays",
+              "mesh",
+              "history",
+              "geometry",
+              "matrices"]
+
+@dataclass
+class Output:
+    components: Dict[str, int] = field(default_factory=dict)    # byte theo từng thành phần
+    notes: Dict[str, str] = field(default_factory=dict)
+    total_bytes: int = 0
+    n_cells: int = 0
+    bytes_per_cell: float = 0.0
+    report: str = ""
+
+def find_array_size(array):
+    # Chỉ tính dữ liệu mảng (view của mảng khác cũng tính đủ nbytes)
+    return int(array.nbytes)
+
+def find_object_size(value):
+    """Kích thước sâu (byte) của một giá trị Python / numpy"""
+    if value is None:
+        return 0
+    if isinstance(value, np.ndarray):
+        if value.dtype == object:
+            return sys.getsizeof(value) + value.nbytes + sum(find_object_size(item) for item in value.flat)
+        return sys.getsizeof(np.empty(0)) + find_array_size(value)
+    if asizeof is not None:
+        return asizeof.asizeof(value)
+    if isinstance(value, (list, tuple, set)):
+        return sys.getsizeof(value) + sum(find_object_size(item) for item in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(find_object_size(k) + find_object_size(v) for k, v in value.items())
+    return sys.getsizeof(value)
+
+def find_sparse_matrix_size(matrix):
+    if matrix is None:
+        return 0
+    if isinstance(matrix, np.ndarray):
+        return find_array_size(matrix)
+    return sum(find_array_size(getattr(matrix, name))
+               for name in ("data", "indices", "indptr", "row", "col") if hasattr(matrix, name))
+
+def create_memory_report(reluctance_network, include_matrix=True, sample_size=5000):
+    """
+    Ước lượng bộ nhớ (byte) theo từng thành phần của ReluctanceNetwork:
+    - elements: đối tượng Element, __dict__ và các giá trị nhỏ, mảng object chứa các Element
+    - element_arrays: mảng numpy riêng của từng phần tử (reluctance, flux, ...)
+    - neighbor_tables: bảng vị trí phần tử lân cận
+    - network_arrays / mesh: thế từ, material_ids, mảng toạ độ của lưới
+    - history: các frame của SolutionHistory (memmap thì nằm trên đĩa)
+    - geometry: mesh của các segment (và polydata hiển thị nếu đã dựng)
+    - matrices: G, J, Ja dựng lại một lần để đo (include_matrix=False để bỏ qua)
+    Với mạng lớn chỉ đo sample_size phần tử cách đều rồi ngoại suy (sample_size=None: đo hết).
+    Dùng pympler.asizeof nếu có, nếu không thì ước lượng bằng sys.getsizeof.
+    Thành phần load lười chưa được load sẽ không bị load để đo.
+    """
+    result = Output(components={name: 0 for name in COMPONENTS})
+    components = result.components
+
+    if is_lazy_component_loaded(reluctance_network, "elements"):
+        elements = reluctance_network.elements
+        element_list = [element for element in elements.flat if element is not None]
+        components["elements"] += sys.getsizeof(elements) + elements.nbytes
+
+        sample = element_list
+        if sample_size is not None and len(element_list) > sample_size:
+            sample = [element_list[index] for index in np.linspace(0, len(element_list) - 1, sample_size).astype(int)]
+            result.notes["elements"] = f"estimated from {len(sample)} of {len(element_list)} elements"
+        scale = len(element_list) / max(len(sample), 1)
+
+        element_bytes = {"elements": 0, "element_arrays": 0, "neighbor_tables": 0}
+        for element in sample:
+            element_bytes["elements"] += sys.getsizeof(element) + sys.getsizeof(element.__dict__)
+            for name, value in element.__dict__.items():
+                if name in SHARED_ELEMENT_ATTRIBUTES:
+                    continue
+                if name == "neighbor_elements_position":
+                    element_bytes["neighbor_tables"] += find_object_size(value)
+                elif isinstance(value, np.ndarray) and value.dtype != object:
+                    element_bytes["element_arrays"] += find_array_size(value)
+                    element_bytes["elements"] += sys.getsizeof(np.empty(0))
+                else:
+                    element_bytes["elements"] += find_object_size(value)
+        for name, value in element_bytes.items():
+            components[name] += int(value * scale)
+    else:
+        result.notes["elements"] = "not loaded"
+
+    components["network_arrays"] += find_array_size(np.asarray(reluctance_network.magnetic_potential.data))
+    material_ids = getattr(reluctance_network, "material_ids", None)
+    if material_ids is not None:
+        components["network_arrays"] += find_array_size(material_ids)
+
+    mesh = reluctance_network.mesh
+    if mesh is not None:
+        components["mesh"] = sum(find_array_size(value) for value in vars(mesh).values()
+                                 if isinstance(value, np.ndarray))
+
+    if not is_lazy_component_loaded(reluctance_network, "solution_history"):
+        result.notes["history"] = "not loaded"
+    elif reluctance_network.solution_history is not None:
+        history = reluctance_network.solution_history
+        components["history"] = find_array_size(history.data)
+        result.notes["history"] = f"{len(history)} frames, capacity {history.data.shape[0]}"
+        if isinstance(history.data, np.memmap):
+            result.notes["history"] += ", memory-mapped on disk"
+
+    if not is_lazy_component_loaded(reluctance_network, "geometry"):
+        result.notes["geometry"] = "not loaded"
+    elif reluctance_network.geometry is not None:
+        components["geometry"] = find_geometry_size(reluctance_network.geometry)
+
+    if include_matrix and is_lazy_component_loaded(reluctance_network, "elements"):
+        equation = reluctance_network.create_magnetic_potential_equation(debug=False)
+        components["matrices"] = sum(find_sparse_matrix_size(matrix) for matrix in (equation.G, equation.J, equation.Ja))
+        result.notes["matrices"] = f"G: {equation.G.shape[0]} x {equation.G.shape[1]}, nnz {equation.G.nnz}"
+
+    result.total_bytes = int(sum(components.values()))
+    result.n_cells = int(reluctance_network.magnetic_potential.data.size)
+    result.bytes_per_cell = result.total_bytes / max(result.n_cells, 1)
+    result.report = format_memory_report(result)
+    return result
+
+def find_geometry_size(geometry):
+    size = 0
+    for segment in geometry.geometry:
+        mesh = segment.mesh
+        if mesh is None:
+            continue
+        for name in ("vertices", "faces"):
+            value = getattr(mesh, name, None)
+            if isinstance(value, np.ndarray):
+                size += find_array_size(value)
+        # Cache của trimesh (normals, adjacency, ...)
+        cache = getattr(getattr(mesh, "_cache", None), "cache", {})
+        size += sum(find_array_size(value) for value in cache.values() if isinstance(value, np.ndarray))
+
+    render_data = getattr(geometry, "render_data", None)
+    if render_data is not None:
+        size += sum(int(template.actual_memory_size) * 1024 for template in render_data.templates.values())
+    return size
+
+def format_memory_report(result):
+    lines = [f"{'COMPONENT':<18}{'MB':>12}{'BYTE/CELL':>12}{'SHARE':>9}  NOTE"]
+    for name in COMPONENTS:
+        value = result.components[name]
+        share = value / result.total_bytes if result.total_bytes > 0 else 0.0
+        lines.append(f"{name:<18}{value / 1024 ** 2:>12.3f}{value / max(result.n_cells, 1):>12.1f}"
+                     f"{share:>9.1%}  {result.notes.get(name, '')}")
+    lines.append(f"{'total':<18}{result.total_bytes / 1024 ** 2:>12.3f}{result.bytes_per_cell:>12.1f}"
+                 f"{'':>9}  {result.n_cells} cells")
+    return "\n".join(lines)
@@ -0,0 +1,15 @@
+import numpy as np
+
+def create_segment_ids(reluctance_network):
+    """
+    Gom chỉ số segment (trong geometry) của từng phần tử vào mảng (nr, nt, nz), thứ tự F,
+    -1 là air. Chỉ có với phần tử vừa dựng từ geometry (không có sau khi load).
+    """
+    elements = reluctance_network.elements
+    segment_ids = np.full(elements.shape, -1, dtype=np.int32, order='F')
+
+    for index, element in np.ndenumerate(elements):
+        if element is not None:
+            segment_ids[index] = element.segment_index
+
+    return segment_ids
@@ -0,0 +1,95 @@
+from dataclasses import dataclass
+import numpy as np
+import pyvista as pv
+
+@dataclass
+class Output:
+    surface: pv.PolyData
+    face_cells: np.ndarray      # (faces, 2): cell hai bên mặt, -1 = bên ngoài lưới
+    n_cells: int                # số cell hiển thị (đã nhân symmetry_factor)
+
+def create_viewer_surface(reluctance_network, use_symmetry_factor=True, mesh=None):
+    """
+    Tạo một lần PolyData chứa mọi mặt tứ giác của lưới (mặt r, theta, z), kèm cell ở
+    hai bên mỗi mặt. Mỗi frame chỉ cần tô màu các mặt (find_viewer_face_data):
+    mặt giữa hai cell cùng loại vật liệu được ẩn, nên không phải threshold lại lưới.
+    Thứ tự cell: sector 0 (thứ tự F của mesh), sector 1, ...
+    mesh: lưới khác thay cho reluctance_network.mesh (ví dụ lưới thô của create_lod_level).
+    """
+    if mesh is None:
+        mesh = reluctance_network.mesh
+    n_r, n_t, n_z = mesh.n_cells_r, mesh.n_cells_t, mesh.n_cells_z
+    n_cells = n_r * n_t * n_z
+    n_points = mesh.nr * mesh.nt * mesh.nz
+
+    symmetry_factor = int(getattr(reluctance_network, "symmetry_factor", 1))
+    n_sector = symmetry_factor if use_symmetry_factor and symmetry_factor > 1 else 1
+    # Nối mặt theta cuối của sector với mặt đầu của sector kế tiếp
+    connect_theta = mesh.periodic_boundary and n_sector == max(symmetry_factor, 1)
+
+    def point_index(i, j, k):
+        return i + j * mesh.nr + k * mesh.nr * mesh.nt
+
+    def cell_index(i, j, k):
+        inside = (i >= 0) & (i < n_r) & (j >= 0) & (j < n_t) & (k >= 0) & (k < n_z)
+        return np.where(inside, i + j * n_r + k * n_r * n_t, -1)
+
+    faces, left, right = [], [], []
+
+    # Mặt r = const
+    i, j, k = np.meshgrid(np.arange(n_r + 1), np.arange(n_t), np.arange(n_z), indexing='ij')
+    i, j, k = i.ravel(), j.ravel(), k.ravel()
+    faces.append(np.stack([point_index(i, j, k), point_index(i, j + 1, k),
+                           point_index(i, j + 1, k + 1), point_index(i, j, k + 1)], axis=1))
+    left.append(cell_index(i - 1, j, k))
+    right.append(cell_index(i, j, k))
+
+    # Mặt theta = const (mặt j = n_t được nối với sector sau nếu tuần hoàn)
+    first_plane = 1 if connect_theta else 0
+    i, j, k = np.meshgrid(np.arange(n_r), np.arange(first_plane, n_t + 1), np.arange(n_z), indexing='ij')
+    i, j, k = i.ravel(), j.ravel(), k.ravel()
+    faces.append(np.stack([point_index(i, j, k), point_index(i + 1, j, k),
+                           point_index(i + 1, j, k + 1), point_index(i, j, k + 1)], axis=1))
+    left.append(cell_index(i, j - 1, k))
+    theta_right = cell_index(i, j, k)
+    wrap = (j == n_t)
+    if connect_theta:
+        # Cell đầu của sector kế tiếp, đánh dấu bằng offset n_cells
+        theta_right[wrap] = cell_index(i[wrap], 0, k[wrap]) + n_cells
+    right.append(theta_right)
+
+    # Mặt z = const
+    i, j, k = np.meshgrid(np.arange(n_r), np.arange(n_t), np.arange(n_z + 1), indexing='ij')
+    i, j, k = i.ravel(), j.ravel(), k.ravel()
+    faces.append(np.stack([point_index(i, j, k), point_index(i + 1, j, k),
+                           point_index(i + 1, j + 1, k), point_index(i, j + 1, k)], axis=1))
+    left.append(cell_index(i, j, k - 1))
+    right.append(cell_index(i, j, k))
+
+    faces = np.concatenate(faces)
+    face_cells = np.stack([np.concatenate(left), np.concatenate(right)], axis=1)
+
+    # Nhân bản theo sector: xoay điểm, dịch chỉ số điểm / cell
+    sector_points = np.stack([mesh.X.ravel(order='F'), mesh.Y.ravel(order='F'), mesh.Z.ravel(order='F')], axis=1)
+    angle_step = 2 * np.pi / max(symmetry_factor, 1)
+    all_points, all_faces, all_face_cells = [], [], []
+    for sector in range(n_sector):
+        c, s = np.cos(sector * angle_step), np.sin(sector * angle_step)
+        points = sector_points.copy()
+        points[:, 0] = c * sector_points[:, 0] - s * sector_points[:, 1]
+        points[:, 1] = s * sector_points[:, 0] + c * sector_points[:, 1]
+        all_points.append(points)
+        all_faces.append(faces + sector * n_points)
+
+        cells = face_cells.copy()
+        inside = cells >= 0
+        cells[inside] = (cells[inside] + sector * n_cells) % (n_sector * n_cells)
+        all_face_cells.append(cells)
+
+    faces = np.concatenate(all_faces)
+    vtk_faces = np.hstack([np.full((faces.shape[0], 1), 4), faces]).ravel()
+    surface = pv.PolyData(np.concatenate(all_points), vtk_faces)
+
+    return Output(surface=surface,
+                  face_cells=np.concatenate(all_face_cells),
+                  n_cells=n_sector * n_cells)
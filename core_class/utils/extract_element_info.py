@@ -7,10 +7,13 @@ from typing import Optional, List, Any
 @dataclass
 class ElementInfo:
     material: str = "air"
+    material_name: Optional[str] = None
     magnet_source: float = 0.0
     magnetization_direction: np.ndarray = field(default_factory=lambda: np.array([0., 0., 1.]))
     winding_vector: np.ndarray = field(default_factory=lambda: np.array([0., 0., 0.]))
     winding_normal: np.ndarray = field(default_factory=lambda: np.array([0., 0., 1.]))
+    # Chỉ số segment chiếm ưu thế trong geometry, -1 nếu là air
+    segment_index: int = -1
     
     # --- COORDINATE (2x3) ---
     # Row 0: Start Coordinate [r_i, t_j, z_k]
@@ -25,7 +28,11 @@ class ElementInfo:
     # Row 1: Segment Info (Geometry size)
     dimension: np.ndarray = field(default_factory=lambda: np.zeros((2, 3)))
 
-def extract_element_info(position: tuple, geometry: Any, mesh: Any) -> Optional[ElementInfo]:
+def extract_element_info(position: tuple, geometry: Any, mesh: Any, segment_index: Optional[int] = None) -> Optional[ElementInfo]:
+    """
+    segment_index: kết quả phân loại đã có (chỉ số segment, -1 = air) thì bỏ qua bước giao
+    khối voxel với geometry; chỉ hợp lệ khi geometry có cùng hình dạng.
+    """
     if not isinstance(position, (tuple, list)) or len(position) != 3:
         raise TypeError("Position phải là tuple (i_r, i_t, i_z)")
 
@@ -50,6 +57,12 @@ def extract_element_info(position: tuple, geometry: Any, mesh: Any) -> Optional[
     d_r = abs(r_next - r_i)
     d_t = abs(t_next - t_j) # Góc mở (Radian)
     d_z = abs(z_next - z_k)
+
+    segments_list = geometry.geometry if hasattr(geometry, 'geometry') else geometry
+    if segment_index is not None:
+        segment_index = int(segment_index)
+        dominant_segment = segments_list[segment_index] if segment_index >= 0 else None
+        return build_element_info(dominant_segment, segment_index, coord_array, [d_r, d_t, d_z])
     
     # Tính độ dài cung để tạo Box vật lý cho việc check giao cắt (Intersection)
     r_avg = (r_i + r_next) / 2.0
@@ -76,12 +89,12 @@ def extract_element_info(position: tuple, geometry: Any, mesh: Any) -> Optional[
     vox_bounds = voxel_mesh.bounds 
 
     # --- 4. FIND DOMINANT SEGMENT ---
-    segments_list = geometry.geometry if hasattr(geometry, 'geometry') else geometry
     segment_volumes = {}
     material_volumes = defaultdict(float)
     occupied_volume = 0.0
 
-    for seg in segments_list:
+    segment_indices = {}
+    for index, seg in enumerate(segments_list):
         if not hasattr(seg, 'mesh') or seg.mesh is None: continue
         
         seg_bounds = seg.mesh.bounds
@@ -94,6 +107,7 @@ def extract_element_info(position: tuple, geometry: Any, mesh: Any) -> Optional[
                 vol = intersection.volume
                 if vol > 1e-12:
                     segment_volumes[seg] = vol
+                    segment_indices[seg] = index
                     material_volumes[seg.material] += vol
                     occupied_volume += vol
         except Exception: continue
@@ -110,6 +124,12 @@ def extract_element_info(position: tuple, geometry: Any, mesh: Any) -> Optional[
                     max_seg_vol = vol
                     dominant_segment = seg
 
+    dominant_index = segment_indices[dominant_segment] if dominant_segment is not None else -1
+    return build_element_info(dominant_segment, dominant_index, coord_array, [d_r, d_t, d_z])
+
+def build_element_info(dominant_segment, segment_index, coord_array, row_element):
+    d_r, d_t, d_z = row_element
+
     # --- HELPER FUNCTIONS ---
     def get_vec(obj, attr):
         val = getattr(obj, attr, None)
@@ -121,9 +141,7 @@ def extract_element_info(position: tuple, geometry: Any, mesh: Any) -> Optional[
 
     # --- 5. BUILD DIMENSION MATRIX (2x3) ---
     
-    # Row 0: Element [r, theta(rad), z]
-    row_element = [d_r, d_t, d_z]
-
+    # Row 0: Element [r, theta(rad), z] = row_element
     # Row 1: Segment [r, theta(rad), z]
     if dominant_segment is None:
         row_segment = row_element # Air -> Segment = Element
@@ -154,6 +172,8 @@ def extract_element_info(position: tuple, geometry: Any, mesh: Any) -> Optional[
 
     return ElementInfo(
         material=dominant_segment.material,
+        material_name=getattr(dominant_segment, "material_name", None),
+        segment_index=segment_index,
         magnet_source=safe_float(dominant_segment, "magnet_source", 0.0),
         magnetization_direction=get_vec(dominant_segment, "magnetization_direction"),
         winding_vector=get_vec(dominant_segment, "winding_vector"),
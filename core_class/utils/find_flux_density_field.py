@@ -0,0 +1,20 @@
+from dataclasses import dataclass
+import numpy as np
+
+@dataclass
+class Output:
+    flux_density_field: np.ndarray
+
+def find_flux_density_field(reluctance_network):
+    """
+    Gom flux_density_average của mọi phần tử vào mảng (nr, nt, nz, 4):
+    [B_r, B_t, B_z, |B|]. Phần tử chưa được cập nhật có giá trị 0.
+    """
+    elements = reluctance_network.elements
+    flux_density_field = np.zeros(elements.shape + (4,))
+
+    for index, element in np.ndenumerate(elements):
+        if element is not None and element.flux_density_average is not None:
+            flux_density_field[index] = element.flux_density_average
+
+    return Output(flux_density_field=flux_density_field)
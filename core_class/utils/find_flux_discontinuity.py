@@ -0,0 +1,49 @@
+from dataclasses import dataclass
+import numpy as np
+from core_class.utils.find_flux_density_field import find_flux_density_field
+
+@dataclass
+class Output:
+    indicator_r: np.ndarray   # (nr-1,) theo từng đường nút r bên trong
+    indicator_t: np.ndarray   # (nt,) nếu biên tuần hoàn, ngược lại (nt-1,)
+    indicator_z: np.ndarray   # (nz-1,) theo từng đường nút z bên trong
+
+def find_flux_discontinuity(reluctance_network, flux_density_field=None):
+    """
+    Ước lượng sai số cục bộ từ bước nhảy của vector B giữa hai phần tử kề nhau.
+    Với mỗi mặt chung: eta = |B_a - B_b|^2 * diện tích mặt, cộng dồn theo từng
+    đường nút (mặt phẳng r, theta hoặc z) để biết nên chèn nút ở đâu.
+    """
+    mesh = reluctance_network.mesh
+    if flux_density_field is None:
+        flux_density_field = find_flux_density_field(reluctance_network).flux_density_field
+
+    B = flux_density_field[..., :3]
+    r_nodes, t_nodes, z_nodes = mesh.r_nodes, mesh.theta_nodes, mesh.z_nodes
+
+    dr = np.diff(r_nodes)
+    dt = np.diff(t_nodes)
+    dz = np.diff(z_nodes)
+    r_center = (r_nodes[:-1] + r_nodes[1:]) / 2
+
+    # Mặt r: cung tại r_i, diện tích r_i * dtheta * dz
+    jump_r = np.sum((B[1:] - B[:-1]) ** 2, axis=-1)
+    area_r = r_nodes[1:-1, None, None] * dt[None, :, None] * dz[None, None, :]
+    indicator_r = np.sum(jump_r * area_r, axis=(1, 2))
+
+    # Mặt theta: diện tích dr * dz, nối vòng nếu biên tuần hoàn
+    if mesh.periodic_boundary:
+        jump_t = np.sum((np.roll(B, -1, axis=1) - B) ** 2, axis=-1)
+    else:
+        jump_t = np.sum((B[:, 1:] - B[:, :-1]) ** 2, axis=-1)
+    area_t = (dr[:, None] * dz[None, :])[:, None, :]
+    indicator_t = np.sum(jump_t * area_t, axis=(0, 2))
+
+    # Mặt z: hình vành khăn r * dr * dtheta
+    jump_z = np.sum((B[:, :, 1:] - B[:, :, :-1]) ** 2, axis=-1)
+    area_z = (r_center * dr)[:, None, None] * dt[None, :, None]
+    indicator_z = np.sum(jump_z * area_z, axis=(0, 1))
+
+    return Output(indicator_r=indicator_r,
+                  indicator_t=indicator_t,
+                  indicator_z=indicator_z)
@@ -0,0 +1,31 @@
+from dataclasses import dataclass
+import numpy as np
+
+@dataclass
+class Output:
+    flux_linkage: np.ndarray
+
+def find_flux_linkage(reluctance_network, use_symmetry_factor=True):
+    """
+    Từ thông móc vòng từng pha: tổng theo phần tử của từ thông dọc trục
+    (trung bình hai nhánh z) nhân với element_winding_vector.
+    Nếu use_symmetry_factor thì nhân thêm số lần lặp của sector lưới.
+    """
+    elements = reluctance_network.elements
+    mesh = reluctance_network.mesh
+    number_of_phase = reluctance_network.geometry.geometry[0].winding_vector.size
+    flux_linkage = np.zeros(number_of_phase)
+
+    for element in elements.flat:
+        if element is None or element.flux_direct is None:
+            continue
+        if not np.any(element.element_winding_vector):
+            continue
+        axial_flux = 0.5 * (element.flux_direct[0, 2] + element.flux_direct[1, 2])
+        flux_linkage += axial_flux * element.element_winding_vector
+
+    if use_symmetry_factor:
+        theta_span = mesh.theta_nodes[-1] - mesh.theta_nodes[0]
+        flux_linkage *= round(2 * np.pi / theta_span)
+
+    return Output(flux_linkage=flux_linkage)
@@ -0,0 +1,37 @@
+from dataclasses import dataclass, field
+from typing import List
+import numpy as np
+from core_class.utils.save_reluctance_network import stack_element_field
+from solver.utils.find_cell_flux import find_cell_flux, gather_cell_value
+
+@dataclass
+class Output:
+    value: float
+    flux_gradient: List[np.ndarray] = field(default_factory=list)  # dPsi / d(từ thông liên kết), theo find_link_flux
+
+def find_flux_linkage_gradient(reluctance_network, link_flux, phase_weight, use_symmetry_factor=True):
+    """
+    Tổ hợp phase_weight . flux_linkage (vd. phase_weight = [1, 0, 0]: từ thông móc
+    vòng pha thứ nhất) của find_flux_linkage, tính từ từ thông liên kết (find_link_flux),
+    cùng đạo hàm theo từ thông trên từng liên kết (tuyến tính nên không phụ thuộc link_flux).
+    """
+    elements = reluctance_network.elements
+    shape = elements.shape
+    mesh = reluctance_network.mesh
+    periodic_boundary = bool(reluctance_network.magnetic_potential.periodic_boundary)
+
+    element_list = [elements[index] for index in np.ndindex(shape)]
+    winding_vector = stack_element_field(element_list, "element_winding_vector", shape)
+    cell_weight = 0.5 * (np.nan_to_num(winding_vector) @ np.asarray(phase_weight, dtype=float))
+
+    if use_symmetry_factor:
+        theta_span = mesh.theta_nodes[-1] - mesh.theta_nodes[0]
+        cell_weight = cell_weight * round(2 * np.pi / theta_span)
+
+    cell_flux = find_cell_flux(link_flux, shape, periodic_boundary).cell_flux
+    value = float(np.sum(cell_weight * cell_flux[2]))
+
+    flux_gradient = [np.zeros_like(link_flux[0]),
+                     np.zeros_like(link_flux[1]),
+                     gather_cell_value(cell_weight, 2, periodic_boundary)]
+    return Output(value=value, flux_gradient=flux_gradient)
@@ -0,0 +1,38 @@
+from dataclasses import dataclass
+import numpy as np
+
+@dataclass
+class Output:
+    color_id: np.ndarray        # (frames, coarse cells)
+    flux_density: np.ndarray    # (frames, coarse cells), NaN nếu khối toàn air
+
+def find_lod_frame_data(frame_data, cell_map, n_coarse_cells, n_sector=1):
+    """
+    Gộp dữ liệu hiển thị (find_viewer_frame_data) lên lưới thô của create_lod_level:
+    theo r và z khối chỉ chứa một vật liệu, theo theta màu là mã màu chiếm đa số trong
+    khối (air cũng được tính), |B| là trung bình của các cell không phải air.
+    """
+    n_fine = cell_map.size
+    # Chỉ số cell thô cho mọi sector đã nhân bản
+    tiled_map = (cell_map[None, :] + n_coarse_cells * np.arange(n_sector)[:, None]).ravel()
+    n_total = n_coarse_cells * n_sector
+
+    n_frames = frame_data.color_id.shape[0]
+    color_id = np.zeros((n_frames, n_total), dtype=np.int8)
+    flux_density = np.full((n_frames, n_total), np.nan, dtype=np.float32)
+    n_colors = int(frame_data.color_id.max()) + 1 if frame_data.color_id.size else 1
+
+    for frame in range(n_frames):
+        fine_color = frame_data.color_id[frame][:n_fine * n_sector].astype(np.int64)
+        counts = np.bincount(tiled_map * n_colors + fine_color,
+                             minlength=n_total * n_colors).reshape(n_total, n_colors)
+        color_id[frame] = np.argmax(counts, axis=1)
+
+        fine_flux = frame_data.flux_density[frame][:n_fine * n_sector]
+        valid = ~np.isnan(fine_flux)
+        total = np.bincount(tiled_map[valid], weights=fine_flux[valid], minlength=n_total)
+        count = np.bincount(tiled_map[valid], minlength=n_total)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            flux_density[frame] = np.where(count > 0, total / count, np.nan)
+
+    return Output(color_id=color_id, flux_density=flux_density)
@@ -10,13 +10,13 @@ def find_minimum_reluctance(element):
     reluctance = element.vacuum_reluctance
     
     if element.material == "magnet":
-        material_database = element.material_database
-        maximum_permeance = material_database.magnet.relative_permeance
+        magnet = element.material_database.get_material(element.material_id)
+        maximum_permeance = magnet.relative_permeance
         reluctance = reluctance * 1/maximum_permeance
 
     elif element.material == "iron":
-        material_database = element.material_database
-        maximum_permeance = find_maximum_permeance(material_database=material_database).mu_r_max
+        iron = element.material_database.get_material(element.material_id)
+        maximum_permeance = find_maximum_permeance(iron=iron).mu_r_max
         reluctance = reluctance * 1/maximum_permeance
 
     return Output(reluctance= reluctance)
@@ -1,6 +1,6 @@
 from dataclasses import dataclass
 import numpy as np
-from material.core.lookup_BH_curve import lookup_BH_curve
+from material.core.lookup_BH_curve_uniform import lookup_BH_curve_uniform
 
 @dataclass
 class Output:
@@ -12,14 +12,15 @@ def find_relative_permeability(element):
     d_relative_permeability_d_B = np.zeros((2, 3))
 
     if element.material == "iron":
-        data = lookup_BH_curve(B_input=element.flux_density_direct, 
-                               material_database=element.material_database, 
-                               return_du_dB=True)
+        iron = element.material_database.get_material(element.material_id)
+        data = lookup_BH_curve_uniform(B_input=element.flux_density_direct,
+                                       iron=iron)
         relative_permeability = data.mu_r
         d_relative_permeability_d_B = data.dmu_r_dB
 
     elif element.material == "magnet":
-        relative_permeability.fill(element.material_database.magnet.relative_permeance)
+        magnet = element.material_database.get_material(element.material_id)
+        relative_permeability.fill(magnet.relative_permeance)
 
     return Output(relative_permeability=relative_permeability,
                   d_relative_permeability_d_B=d_relative_permeability_d_B)
\ No newline at end of file
@@ -0,0 +1,59 @@
+from dataclasses import dataclass
+import hashlib
+import numpy as np
+
+# Dữ liệu đầu vào của phần tử quyết định nghiệm (nguồn, từ trở, kích thước)
+KEY_ELEMENT_FIELDS = ["material_id",
+                      "magnetic_source",
+                      "vacuum_reluctance",
+                      "minimum_reluctance",
+                      "length",
+                      "section_area",
+                      "winding_current"]
+
+@dataclass
+class Output:
+    key: str
+
+def find_solve_key(reluctance_network, solver_parameter=None):
+    """
+    Mã băm nội dung (sha256) của mọi đầu vào của bài toán: lưới, dữ liệu từng phần tử
+    (đã bao gồm vị trí rotor vì phần tử rotor được dịch khi quay), dòng điện,
+    đường cong B-H và tham số solver. Hai case có cùng key cho cùng nghiệm.
+    """
+    digest = hashlib.sha256()
+
+    def update(value):
+        if value is None:
+            digest.update(b"none")
+        else:
+            array = np.ascontiguousarray(value, dtype=float)
+            digest.update(str(array.shape).encode())
+            digest.update(array.tobytes())
+
+    mesh = reluctance_network.mesh
+    update(mesh.r_nodes)
+    update(mesh.theta_nodes)
+    update(mesh.z_nodes)
+    digest.update(repr(reluctance_network.magnetic_potential.periodic_boundary).encode())
+
+    element_list = list(reluctance_network.elements.ravel(order='F'))
+    for name in KEY_ELEMENT_FIELDS:
+        digest.update(name.encode())
+        for element in element_list:
+            update(None if element is None else getattr(element, name))
+
+    for material in reluctance_network.material_database.materials:
+        digest.update(f"{material.category}:{material.name}".encode())
+        update(getattr(material, "relative_permeance", None))
+        update(getattr(material, "coercivity", None))
+        B_H_curve = getattr(material, "B_H_curve", None)
+        if B_H_curve is not None:
+            update(B_H_curve["B_data"])
+            update(B_H_curve["H_data"])
+
+    for name, value in sorted((solver_parameter or {}).items()):
+        if name not in ("debug", "callback"):
+            digest.update(f"{name}={value!r}".encode())
+
+    return Output(key=digest.hexdigest())
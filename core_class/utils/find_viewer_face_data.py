@@ -0,0 +1,27 @@
+from dataclasses import dataclass
+import numpy as np
+
+@dataclass
+class Output:
+    color_id: np.ndarray        # (faces,) mã màu của mặt, -1 = ẩn
+    flux_density: np.ndarray    # (faces,) |B| của cell không phải air, NaN nếu không có
+
+def find_viewer_face_data(face_cells, color_id, flux_density):
+    """
+    Tô màu các mặt từ dữ liệu cell của một frame (find_viewer_frame_data).
+    Mặt chỉ hiện khi hai cell hai bên khác mã màu; mặt lấy màu / B của bên có mã lớn hơn
+    (vật liệu thay vì air, air thay vì bên ngoài).
+    """
+    outside = face_cells < 0
+    cells = np.where(outside, 0, face_cells)
+    side_color = np.where(outside, -1, color_id[cells])
+
+    use_right = side_color[:, 1] > side_color[:, 0]
+    face_color = np.where(use_right, side_color[:, 1], side_color[:, 0])
+    face_cell = np.where(use_right, cells[:, 1], cells[:, 0])
+
+    visible = side_color[:, 0] != side_color[:, 1]
+    face_color = np.where(visible, face_color, -1)
+    face_flux_density = np.where(visible & (face_color > 0), flux_density[face_cell], np.nan)
+
+    return Output(color_id=face_color, flux_density=face_flux_density)
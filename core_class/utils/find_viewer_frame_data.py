@@ -0,0 +1,40 @@
+from dataclasses import dataclass
+import numpy as np
+from core_class.models.SolutionHistory import FIELD_INDEX
+
+# Mã màu hiển thị: 0 air, 1 iron, 2 magnet (+z), 3 coil, 4 magnet (-z)
+VIEWER_COLORS = {0: "#444444", 1: "#E0E0E0", 2: "#FF3333", 3: "#FF9900", 4: "#3366FF"}
+CATEGORY_COLOR_ID = {"iron": 1, "magnet": 2}
+
+@dataclass
+class Output:
+    color_id: np.ndarray        # (frames, cells) int8
+    flux_density: np.ndarray    # (frames, cells) float32, NaN ở phần tử air
+
+def find_viewer_frame_data(reluctance_network, frames=None, use_symmetry_factor=True):
+    """
+    Mã màu vật liệu và |B| cho các frame của solution_history (frames=None: mọi frame),
+    theo thứ tự cell của lưới hiển thị (đã nhân symmetry_factor nếu có).
+    Kết quả có kích thước frames x cell hiển thị: viewer gọi với từng frame khi vẽ.
+    """
+    history = reluctance_network.solution_history
+    if frames is None:
+        frames = np.arange(len(history))
+    data = history.data[:len(history)][np.asarray(frames)]
+
+    color_id_of_material = np.array([CATEGORY_COLOR_ID.get(material.category, 0)
+                                     for material in reluctance_network.material_database.materials],
+                                    dtype=np.int8)
+    color_id = color_id_of_material[data[:, :, FIELD_INDEX["material_id"]].astype(int)]
+    # Nam châm hướng âm dùng màu riêng
+    color_id[(color_id == 2) & (data[:, :, FIELD_INDEX["magnetization_z"]] < 0)] = 4
+
+    flux_density = data[:, :, FIELD_INDEX["B_abs"]].astype(np.float32)
+    flux_density[color_id == 0] = np.nan
+
+    symmetry_factor = int(getattr(reluctance_network, "symmetry_factor", 1))
+    if use_symmetry_factor and symmetry_factor > 1:
+        color_id = np.tile(color_id, (1, symmetry_factor))
+        flux_density = np.tile(flux_density, (1, symmetry_factor))
+
+    return Output(color_id=color_id, flux_density=flux_density)
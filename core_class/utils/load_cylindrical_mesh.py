@@ -0,0 +1,14 @@
+from core_class.models.CylindricalMesh import CylindricalMesh
+from storage.models.KeyValueStore import KeyValueStore
+
+def load_cylindrical_mesh(path):
+    store = KeyValueStore(path)
+    metadata = store.load("metadata")
+    if metadata is None or metadata.get("format") != "CylindricalMesh":
+        raise ValueError(f"No CylindricalMesh stored at '{path}'")
+
+    return CylindricalMesh(r_nodes=store.load("r_nodes"),
+                           theta_nodes=store.load("theta_nodes"),
+                           z_nodes=store.load("z_nodes"),
+                           periodic_boundary=metadata["periodic_boundary"],
+                           detail_parameter=metadata["detail_parameter"])
@@ -0,0 +1,28 @@
+from core_class.models.Geometry import Geometry
+from core_class.models.Segment import Segment
+from storage.models.KeyValueStore import KeyValueStore
+
+def load_geometry(path):
+    # trimesh chỉ cần khi thực sự dựng lại geometry (load lười, xem load_motor)
+    import trimesh
+
+    store = KeyValueStore(path)
+    metadata = store.load("metadata")
+    if metadata is None or metadata.get("format") != "Geometry":
+        raise ValueError(f"No Geometry stored at '{path}'")
+
+    vertices = store.load("vertices")
+    faces = store.load("faces")
+    vertex_offset = store.load("vertex_offset")
+    face_offset = store.load("face_offset")
+
+    segments = []
+    for i, segment_data in enumerate(metadata["segments"]):
+        mesh = None
+        if metadata["has_mesh"][i]:
+            mesh = trimesh.Trimesh(vertices=vertices[vertex_offset[i]:vertex_offset[i + 1]],
+                                   faces=faces[face_offset[i]:face_offset[i + 1]],
+                                   process=False)
+        segments.append(Segment(mesh=mesh, **segment_data))
+
+    return Geometry(geometry=segments)
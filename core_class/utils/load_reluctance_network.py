@@ -0,0 +1,107 @@
+import os
+import numpy as np
+from core_class.models.Element import Element
+from core_class.models.SolutionHistory import SolutionHistory
+from core_class.models.MagneticPotential import MagneticPotential
+from core_class.utils.find_flat_position import find_flat_position
+from core_class.utils.get_neighbor_elements_position import get_neighbor_elements_position
+from core_class.utils.load_cylindrical_mesh import load_cylindrical_mesh
+from core_class.utils.load_geometry import load_geometry
+from core_class.utils.save_reluctance_network import ELEMENT_FIELDS
+from storage.models.KeyValueStore import KeyValueStore
+from storage.core.lazy_component import set_lazy_component
+
+def load_reluctance_network(path, motor=None, geometry=None, lazy=True):
+    """
+    Dựng lại ReluctanceNetwork từ thư mục lưu bởi save_reluctance_network.
+    Nếu truyền motor thì dùng chung geometry, material_database và mesh của motor
+    (trừ khi mạng có mesh lưu riêng).
+    lazy=True: elements, geometry và solution_history chỉ được load khi truy cập
+    lần đầu, ví dụ chỉ xem lịch sử thì không cần dựng lại các Element.
+    """
+    from core_class.models.ReluctanceNetwork import ReluctanceNetwork
+
+    store = KeyValueStore(path)
+    metadata = store.load("metadata")
+    if metadata is None or metadata.get("format") != "ReluctanceNetwork":
+        raise ValueError(f"No ReluctanceNetwork stored at '{path}'")
+
+    shape = tuple(metadata["shape"])
+
+    if motor is not None:
+        material_database = motor.material_database
+        # Mesh chỉ được lưu riêng khi khác mesh của motor
+        has_own_mesh = os.path.isdir(os.path.join(path, "mesh"))
+        mesh = load_cylindrical_mesh(os.path.join(path, "mesh")) if has_own_mesh else motor.mesh
+    else:
+        material_database = store.load("material_database")
+        mesh = load_cylindrical_mesh(os.path.join(path, "mesh"))
+
+    def load_network_geometry():
+        if geometry is not None:
+            return geometry
+        if motor is not None:
+            return motor.geometry
+        if os.path.isdir(os.path.join(path, "geometry")):
+            return load_geometry(os.path.join(path, "geometry"))
+        return None
+
+    reluctance_network = ReluctanceNetwork.__new__(ReluctanceNetwork)
+    reluctance_network.symmetry_factor = metadata["symmetry_factor"]
+    reluctance_network.material_database = material_database
+    reluctance_network.mesh = mesh
+    reluctance_network.winding_current = metadata["winding_current"]
+    reluctance_network.magnetic_potential = MagneticPotential(data=np.asfortranarray(store.load("magnetic_potential")),
+                                                              periodic_boundary=metadata["periodic_boundary"])
+    reluctance_network.material_ids = np.asfortranarray(store.load("material_ids"))
+    reluctance_network.solve_cache = None
+
+    components = {"geometry": load_network_geometry,
+                  "elements": lambda: load_elements(store, metadata, reluctance_network),
+                  "solution_history": lambda: load_history(store, shape)}
+    for name, loader in components.items():
+        if lazy:
+            set_lazy_component(reluctance_network, name, loader)
+        else:
+            setattr(reluctance_network, name, loader())
+
+    return reluctance_network
+
+def load_elements(store, metadata, reluctance_network):
+    shape = tuple(metadata["shape"])
+    mesh = reluctance_network.mesh
+    material_database = reluctance_network.material_database
+
+    fields = {name: store.load(name) for name in ELEMENT_FIELDS if name not in metadata["none_fields"]}
+    material_names = metadata["material_names"]
+    material_code = store.load("material_code")
+    element_winding_current = metadata["element_winding_current"]
+
+    elements = np.empty(shape, dtype=object, order='F')
+    for index in np.ndindex(shape):
+        element = Element.__new__(Element)
+        element.position = index
+        element.mesh = mesh
+        element.material_database = material_database
+        element.magnetic_potential = reluctance_network.magnetic_potential
+        element.winding_current = element_winding_current
+        element.elements = elements
+        element.material = material_names[material_code[index]]
+
+        for name in ELEMENT_FIELDS:
+            value = fields[name][index] if name in fields else None
+            if isinstance(value, np.generic):
+                value = value.item()
+            setattr(element, name, value)
+
+        element.flat_position = find_flat_position(element=element).flat_position
+        element.neighbor_elements_position = get_neighbor_elements_position(element=element).neighbor_elements_position
+        elements[index] = element
+
+    return elements
+
+def load_history(store, shape):
+    data = store.load("history")
+    if data is None:
+        return None
+    return SolutionHistory.from_array(data, shape)
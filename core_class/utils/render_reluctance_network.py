@@ -0,0 +1,139 @@
+from dataclasses import dataclass, field
+from typing import List, Optional
+from concurrent.futures import ProcessPoolExecutor
+import os
+import numpy as np
+import pyvista as pv
+from core_class.utils.create_viewer_surface import create_viewer_surface
+from core_class.utils.find_viewer_frame_data import find_viewer_frame_data, VIEWER_COLORS
+from core_class.utils.find_viewer_face_data import find_viewer_face_data
+
+@dataclass
+class Output:
+    image_paths: List[str] = field(default_factory=list)
+    video_path: Optional[str] = None
+
+# Plotter off-screen của mỗi process worker, tạo một lần rồi dùng lại cho mọi frame
+_worker_state = {}
+
+def render_reluctance_network(reluctance_network,
+                              output_dir,
+                              frames=None,
+                              mode="material",
+                              use_symmetry_factor=True,
+                              window_size=(1600, 900),
+                              camera_position=None,
+                              n_workers=None,
+                              video_path=None,
+                              fps=10):
+    """
+    Render không cần màn hình các frame của solution_history ra PNG (frame_0000.png, ...)
+    và tùy chọn ghép thành video (.mp4 cần imageio-ffmpeg, .gif dùng imageio).
+    - mode: "material" (màu vật liệu) hoặc "flux" (|B|).
+    - n_workers: số process render song song (None = số CPU, 1 = chạy tuần tự).
+    """
+    history = reluctance_network.solution_history
+    if history is None or len(history) == 0:
+        raise ValueError("No solution history to render")
+    if mode not in ("material", "flux"):
+        raise ValueError(f"Unknown render mode '{mode}'")
+
+    if frames is None:
+        frames = np.arange(len(history))
+    frames = np.atleast_1d(frames).astype(int)
+    os.makedirs(output_dir, exist_ok=True)
+
+    viewer_surface = create_viewer_surface(reluctance_network, use_symmetry_factor=use_symmetry_factor)
+    frame_data = find_viewer_frame_data(reluctance_network, frames=frames, use_symmetry_factor=use_symmetry_factor)
+
+    # Dữ liệu mặt của mọi frame, tính ở process chính (rẻ so với render)
+    color_table = create_color_table()
+    scalars = []
+    for index in range(len(frames)):
+        face_data = find_viewer_face_data(face_cells=viewer_surface.face_cells,
+                                          color_id=frame_data.color_id[index],
+                                          flux_density=frame_data.flux_density[index])
+        scalars.append(color_table[face_data.color_id] if mode == "material" else face_data.flux_density)
+
+    image_paths = [os.path.join(output_dir, f"frame_{frame:04d}.png") for frame in frames]
+    labels = [f"Frame: {frame}/{len(history) - 1}" for frame in frames]
+
+    surface = viewer_surface.surface
+    worker_arguments = (np.asarray(surface.points), np.asarray(surface.faces), mode,
+                        tuple(window_size), camera_position)
+
+    if n_workers is None:
+        n_workers = os.cpu_count() or 1
+    n_workers = max(1, min(int(n_workers), len(frames)))
+
+    tasks = [(scalars[i::n_workers], image_paths[i::n_workers], labels[i::n_workers])
+             for i in range(n_workers)]
+    if n_workers == 1:
+        init_render_worker(*worker_arguments)
+        render_frames(tasks[0])
+    else:
+        with ProcessPoolExecutor(max_workers=n_workers,
+                                 initializer=init_render_worker,
+                                 initargs=worker_arguments) as executor:
+            list(executor.map(render_frames, tasks))
+
+    result = Output(image_paths=image_paths)
+    if video_path is not None:
+        write_video(image_paths, video_path, fps=fps)
+        result.video_path = video_path
+
+    return result
+
+def create_color_table():
+    # Dòng cuối (mã -1) cho mặt bị ẩn; air rất mờ như trong viewer
+    color_table = np.array([[int(color[k:k + 2], 16) for k in (1, 3, 5)] + [255]
+                            for _, color in sorted(VIEWER_COLORS.items())] + [[0, 0, 0, 0]], dtype=np.uint8)
+    color_table[0, 3] = int(255 * 0.05)
+    return color_table
+
+def init_render_worker(points, faces, mode, window_size, camera_position):
+    surface = pv.PolyData(points, faces)
+    plotter = pv.Plotter(off_screen=True, window_size=list(window_size))
+    plotter.set_background("#050505")
+    plotter.add_axes()
+
+    if mode == "material":
+        surface.cell_data["RGBA"] = np.zeros((surface.n_cells, 4), dtype=np.uint8)
+        plotter.add_mesh(surface, scalars="RGBA", rgba=True, lighting=False)
+        name = "RGBA"
+    else:
+        surface.cell_data["FluxB"] = np.full(surface.n_cells, np.nan)
+        plotter.add_mesh(surface, scalars="FluxB", cmap="jet", clim=[0, 1.8], nan_opacity=0.0,
+                         lighting=False, show_scalar_bar=True,
+                         scalar_bar_args=dict(title="Flux Density (T)", fmt="%.2f", vertical=True,
+                                              position_x=0.92, position_y=0.15, height=0.7, width=0.04,
+                                              color='white'))
+        name = "FluxB"
+
+    if camera_position is not None:
+        plotter.camera_position = camera_position
+
+    _worker_state.update(plotter=plotter, surface=surface, name=name)
+
+def render_frames(task):
+    plotter = _worker_state["plotter"]
+    surface = _worker_state["surface"]
+    name = _worker_state["name"]
+
+    for values, image_path, label in zip(*task):
+        surface.cell_data[name][:] = values
+        surface.Modified()
+        plotter.add_text(label, position="upper_left", font_size=10, color='white', name="frame_info")
+        plotter.screenshot(image_path)
+
+def write_video(image_paths, video_path, fps=10):
+    import imageio
+
+    if video_path.lower().endswith(".gif"):
+        # Plugin pillow của imageio (>= 2.28) nhận duration theo mili giây
+        writer = imageio.get_writer(video_path, mode="I", duration=1000 / fps, loop=0)
+    else:
+        writer = imageio.get_writer(video_path, fps=fps)
+    with writer:
+        for image_path in image_paths:
+            writer.append_data(imageio.imread(image_path))
@@ -9,6 +9,7 @@ def rotate_reluctance_network(reluctance_network, z_indices=(0, 1, 2), n_step=1)
 
     for z in z_idx_clean:
         elements[:, :, z] = np.roll(elements[:, :, z], shift=n_step, axis=1)
+        reluctance_network.material_ids[:, :, z] = np.roll(reluctance_network.material_ids[:, :, z], shift=n_step, axis=1)
         
         for r in range(nr):
             for t in range(nt):
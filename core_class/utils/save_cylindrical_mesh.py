@@ -0,0 +1,12 @@
+import numpy as np
+from storage.models.KeyValueStore import KeyValueStore
+
+def save_cylindrical_mesh(mesh, path):
+    store = KeyValueStore(path)
+    store.save("r_nodes", np.asarray(mesh.r_nodes, dtype=float))
+    store.save("theta_nodes", np.asarray(mesh.theta_nodes, dtype=float))
+    store.save("z_nodes", np.asarray(mesh.z_nodes, dtype=float))
+    store.save("metadata", {"format": "CylindricalMesh",
+                            "version": 1,
+                            "periodic_boundary": bool(mesh.periodic_boundary),
+                            "detail_parameter": mesh.detail_parameter})
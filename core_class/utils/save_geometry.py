@@ -0,0 +1,46 @@
+import numpy as np
+from storage.models.KeyValueStore import KeyValueStore
+
+SEGMENT_FIELDS = ["material",
+                  "material_name",
+                  "magnet_source",
+                  "magnetization_direction",
+                  "winding_vector",
+                  "winding_normal",
+                  "dimension"]
+
+def save_geometry(geometry, path):
+    """
+    Lưu Geometry dưới dạng mảng phẳng: toàn bộ đỉnh/mặt của các segment được
+    nối liền, kèm offset từng segment. Thuộc tính segment (nhỏ) nằm trong metadata.
+    """
+    store = KeyValueStore(path)
+    segments = geometry.geometry
+
+    vertices, faces = [], []
+    vertex_offset, face_offset = [0], [0]
+    has_mesh = []
+    segment_data = []
+
+    for seg in segments:
+        if seg.mesh is None:
+            has_mesh.append(False)
+            vertex_offset.append(vertex_offset[-1])
+            face_offset.append(face_offset[-1])
+        else:
+            has_mesh.append(True)
+            vertices.append(np.asarray(seg.mesh.vertices, dtype=float))
+            faces.append(np.asarray(seg.mesh.faces, dtype=np.int64))
+            vertex_offset.append(vertex_offset[-1] + len(seg.mesh.vertices))
+            face_offset.append(face_offset[-1] + len(seg.mesh.faces))
+
+        segment_data.append({name: getattr(seg, name, None) for name in SEGMENT_FIELDS})
+
+    store.save("vertices", np.concatenate(vertices) if vertices else np.zeros((0, 3)))
+    store.save("faces", np.concatenate(faces) if faces else np.zeros((0, 3), dtype=np.int64))
+    store.save("vertex_offset", np.asarray(vertex_offset, dtype=np.int64))
+    store.save("face_offset", np.asarray(face_offset, dtype=np.int64))
+    store.save("metadata", {"format": "Geometry",
+                            "version": 1,
+                            "has_mesh": has_mesh,
+                            "segments": segment_data})
@@ -0,0 +1,102 @@
+import os
+import shutil
+import numpy as np
+from storage.models.KeyValueStore import KeyValueStore
+from core_class.utils.save_cylindrical_mesh import save_cylindrical_mesh
+from core_class.utils.save_geometry import save_geometry
+
+# Dữ liệu riêng của từng phần tử, lưu thành mảng (nr, nt, nz, ...)
+ELEMENT_FIELDS = ["material_id",
+                  "dimension",
+                  "dimension_ratio",
+                  "coordinate",
+                  "segment_magnet_source",
+                  "magnetization_direction",
+                  "magnet_source",
+                  "segment_winding_vector",
+                  "winding_normal",
+                  "element_winding_vector",
+                  "length",
+                  "section_area",
+                  "length_ratio",
+                  "winding_source",
+                  "magnetic_source",
+                  "vacuum_reluctance",
+                  "minimum_reluctance",
+                  "reluctance",
+                  "flux_direct",
+                  "flux_density_direct",
+                  "flux_density_average",
+                  "relative_permeability",
+                  "d_relative_permeability_d_B",
+                  "own_magnetic_potential"]
+
+def save_reluctance_network(reluctance_network, path, include_geometry=True, include_mesh=True):
+    """
+    Lưu ReluctanceNetwork dưới dạng mảng phẳng theo từng trường của phần tử,
+    kèm metadata nhỏ. Không pickle đồ thị đối tượng Element.
+    include_geometry / include_mesh = False khi lưu bên trong motor (geometry và
+    mesh đã thuộc về motor, load_reluctance_network lấy lại từ motor).
+    """
+    store = KeyValueStore(path)
+    elements = reluctance_network.elements
+    shape = elements.shape
+    element_list = [elements[index] for index in np.ndindex(shape)]
+
+    none_fields = []
+    for name in ELEMENT_FIELDS:
+        values = stack_element_field(element_list, name, shape)
+        if values is None:
+            none_fields.append(name)
+            store.delete(name)
+            continue
+        store.save(name, values)
+
+    material_names = sorted({str(element.material) for element in element_list})
+    material_code = np.array([material_names.index(str(element.material)) for element in element_list],
+                             dtype=np.int32).reshape(shape)
+    store.save("material_code", material_code)
+
+    store.save("magnetic_potential", np.asarray(reluctance_network.magnetic_potential.data))
+    store.save("material_ids", np.asarray(reluctance_network.material_ids))
+
+    element_winding_current = element_list[0].winding_current
+    store.save("metadata", {"format": "ReluctanceNetwork",
+                            "version": 1,
+                            "shape": shape,
+                            "symmetry_factor": reluctance_network.symmetry_factor,
+                            "periodic_boundary": reluctance_network.magnetic_potential.periodic_boundary,
+                            "material_names": material_names,
+                            "none_fields": none_fields,
+                            "winding_current": reluctance_network.winding_current,
+                            "element_winding_current": element_winding_current})
+
+    store.save("material_database", reluctance_network.material_database)
+    if include_mesh:
+        save_cylindrical_mesh(reluctance_network.mesh, os.path.join(path, "mesh"))
+    elif os.path.isdir(os.path.join(path, "mesh")):
+        shutil.rmtree(os.path.join(path, "mesh"))
+    if include_geometry and reluctance_network.geometry is not None:
+        save_geometry(reluctance_network.geometry, os.path.join(path, "geometry"))
+    save_history(reluctance_network, store)
+
+def stack_element_field(element_list, name, shape):
+    """
+    Gom một trường của các phần tử thành mảng shape + shape_của_trường.
+    Phần tử có giá trị None được điền NaN; trả về None nếu mọi giá trị là None.
+    """
+    values = [getattr(element, name) for element in element_list]
+    if all(value is None for value in values):
+        return None
+    template = np.asarray(next(value for value in values if value is not None))
+    values = [np.full(template.shape, np.nan) if value is None else value for value in values]
+    return np.asarray(values).reshape(tuple(shape) + template.shape)
+
+def save_history(reluctance_network, store):
+    history = reluctance_network.solution_history
+    if history is None or len(history) == 0:
+        store.delete("history")
+        return
+
+    history.flush()
+    store.save("history", np.asarray(history.data[:history.n_frames]))
@@ -1,9 +1,8 @@
-from material.core.lookup_BH_curve import lookup_BH_curve
+from material.core.lookup_BH_curve_uniform import lookup_BH_curve_uniform
 
 def set_element_reluctance_at_zero(element):
-    material_database = element.material_database
-    permeability_at_zero = lookup_BH_curve(B_input= 0.0,
-                                           material_database= material_database).mu_r
-    
     if element.material == "iron":
-        element.reluctance = element.vacuum_reluctance * (1/permeability_at_zero)
\ No newline at end of file
+        iron = element.material_database.get_material(element.material_id)
+        permeability_at_zero = lookup_BH_curve_uniform(B_input= 0.0,
+                                                       iron= iron).mu_r
+        element.reluctance = element.vacuum_reluctance * (1/permeability_at_zero)
@@ -1,35 +1,76 @@
 import numpy as np
 import pyvista as pv
-from pyvistaqt import BackgroundPlotter
-from PyQt5.QtCore import QTimer
-import ctypes
-
-try:
-    ctypes.windll.shcore.SetProcessDpiAwareness(1)
-except Exception:
-    try:
-        ctypes.windll.user32.SetProcessDPIAware()
-    except Exception:
-        pass
-
-def show_reluctance_network(reluctance_network, use_symmetry_factor=True):
-    # Lấy danh sách lịch sử ElementLite
-    history = reluctance_network.list_elements_lite
-    if not history:
-        print("[Error] No ElementLite history found.")
+from system.core.set_dpi_awareness import set_dpi_awareness
+from core_class.utils.create_viewer_surface import create_viewer_surface
+from core_class.utils.find_viewer_face_data import find_viewer_face_data
+from core_class.utils.find_viewer_frame_data import find_viewer_frame_data, VIEWER_COLORS
+from core_class.utils.create_lod_level import create_lod_level
+from core_class.models.SolutionHistory import FIELD_INDEX
+from core_class.utils.find_lod_frame_data import find_lod_frame_data
+
+# Số cell hiển thị từ đó viewer tự bật mức chi tiết thô (LOD)
+LOD_CELL_THRESHOLD = 200000
+# Camera gần hơn tỷ lệ này so với lúc đầu thì chuyển sang lưới đầy đủ
+LOD_ZOOM_RATIO = 0.6
+
+def create_network_lod_level(reluctance_network, lod_block):
+    # Lưới thô chỉ gộp các lớp cùng vật liệu (kể cả chiều nam châm) và |B| gần nhau ở frame đầu
+    frame_data = find_viewer_frame_data(reluctance_network, frames=[0], use_symmetry_factor=False)
+    material_id = reluctance_network.solution_history.data[0][:, FIELD_INDEX["material_id"]].astype(np.int64)
+    return create_lod_level(reluctance_network.mesh,
+                            block=lod_block,
+                            material_id=material_id * len(VIEWER_COLORS) + frame_data.color_id[0],
+                            flux_density=frame_data.flux_density[0])
+
+def show_reluctance_network(reluctance_network,
+                            use_symmetry_factor=True,
+                            level_of_detail=None,
+                            lod_block=(2, 2, 2)):
+    """
+    level_of_detail: None = tự bật khi số cell hiển thị > LOD_CELL_THRESHOLD.
+    Ở chế độ LOD, khi nhìn toàn cảnh viewer vẽ lưới thô (gộp tối đa lod_block cell cùng
+    vật liệu),
+    khi zoom gần hoặc bật nút "Full" thì vẽ lưới đầy đủ; bề mặt và actor của lưới đầy
+    đủ chỉ được dựng lần đầu cần đến. Dữ liệu màu / |B| tính cho từng frame khi vẽ.
+    """
+    # Qt chỉ cần cho viewer tương tác, máy tính toán không màn hình dùng render_reluctance_network
+    from pyvistaqt import BackgroundPlotter
+    from PyQt5.QtCore import QTimer
+
+    # Lịch sử nghiệm dạng mảng (frames, cells, fields)
+    history = reluctance_network.solution_history
+    if history is None or len(history) == 0:
+        print("[Error] No solution history found.")
         return
 
-    mesh_obj = reluctance_network.mesh
-    grid_pv = mesh_obj.to_pyvista_grid()
-    n_cells_sector = grid_pv.n_cells
-    
+    # Số cell hiển thị tính từ lưới, chưa cần dựng bề mặt
+    symmetry_factor = int(getattr(reluctance_network, "symmetry_factor", 1))
+    n_sector = symmetry_factor if use_symmetry_factor and symmetry_factor > 1 else 1
+    if level_of_detail is None:
+        level_of_detail = reluctance_network.mesh.total_cells * n_sector > LOD_CELL_THRESHOLD
+    lod_level = create_network_lod_level(reluctance_network, lod_block) if level_of_detail else None
+
+    # Mức 0 = lưới đầy đủ, 1 = lưới thô (nếu có). Bề mặt của một mức chỉ được dựng khi
+    # vẽ mức đó lần đầu: ở chế độ LOD lưới đầy đủ chỉ dựng khi zoom gần / bật "Full"
+    n_levels = 2 if level_of_detail else 1
+    viewer_surfaces = [None] * n_levels
+
+    def get_viewer_surface(level):
+        if viewer_surfaces[level] is None:
+            viewer_surfaces[level] = create_viewer_surface(reluctance_network,
+                                                           use_symmetry_factor=use_symmetry_factor,
+                                                           mesh=lod_level.mesh if level == 1 else None)
+        return viewer_surfaces[level]
+
     # Cấu hình Plotter
+    set_dpi_awareness()
     pl = BackgroundPlotter(title="Reluctance Network Animation", window_size=(1600, 900))
     pl.set_background("#050505")
     pl.add_axes()
 
-    # Định nghĩa màu sắc vật liệu
-    colors = {0: "#444444", 1: "#E0E0E0", 2: "#FF3333", 3: "#FF9900", 4: "#3366FF"}
+    # Bảng màu RGBA theo mã màu vật liệu, dòng cuối (mã -1) cho mặt bị ẩn
+    color_table = np.array([[int(color[k:k + 2], 16) for k in (1, 3, 5)] + [255]
+                            for _, color in sorted(VIEWER_COLORS.items())] + [[0, 0, 0, 0]], dtype=np.uint8)
 
     sargs = dict(
         title="Flux Density (T)", title_font_size=20, label_font_size=16,
@@ -37,6 +78,30 @@ def show_reluctance_network(reluctance_network, use_symmetry_factor=True):
         height=0.7, width=0.04, color='white', shadow=False
     )
 
+    # Dữ liệu mặt gần nhất: tạo actor rồi vẽ cùng một frame không phải tính lại
+    face_data_cache = {}
+
+    def get_face_data(level, frame):
+        # Dữ liệu của đúng một frame, tính khi vẽ frame đó (không tính trước mọi frame)
+        if (level, frame) in face_data_cache:
+            return face_data_cache[(level, frame)]
+        surface = get_viewer_surface(level)
+        data = find_viewer_frame_data(reluctance_network, frames=[frame], use_symmetry_factor=use_symmetry_factor)
+        if level == 1:
+            data = find_lod_frame_data(data,
+                                       cell_map=lod_level.cell_map,
+                                       n_coarse_cells=lod_level.n_coarse_cells,
+                                       n_sector=surface.n_cells // lod_level.n_coarse_cells)
+        face_data = find_viewer_face_data(face_cells=surface.face_cells,
+                                          color_id=data.color_id[0],
+                                          flux_density=data.flux_density[0])
+        face_data_cache.clear()
+        face_data_cache[(level, frame)] = face_data
+        return face_data
+
+    # Mỗi mức chi tiết có hai bề mặt dùng chung hình học (màu vật liệu / FluxB)
+    material_surfaces, flux_surfaces = [None] * n_levels, [None] * n_levels
+
     class ViewerState:
         def __init__(self):
             self.current_frame = 0
@@ -44,84 +109,98 @@ def show_reluctance_network(reluctance_network, use_symmetry_factor=True):
             self.bmap_mode = False
             self.solid_mode = False
             self.is_playing = False
-            self.current_actors = []
-            
+            self.full_mode = False
+            # Mức đang vẽ: 0 = đầy đủ, 1 = thô (nếu có)
+            self.level = n_levels - 1
+            self.initial_distance = None
+
+            # Actor của một mức được tạo khi vẽ mức đó lần đầu, sau đó mỗi frame chỉ cập nhật scalar
+            self.material_actors = [None] * n_levels
+            self.flux_actors = [None] * n_levels
+            self.create_level(self.level)
+
             # Timer cho chế độ Play
             self.timer = QTimer()
             self.timer.timeout.connect(self.next_frame)
 
-        def get_current_data(self):
-            # Lấy mảng ElementLite 3D tại frame hiện tại và làm phẳng
-            elements_lite = history[self.current_frame].flatten(order='F')
-            
-            mat_ids = np.zeros(n_cells_sector, dtype=int)
-            b_values = np.zeros(n_cells_sector, dtype=float)
-
-            for idx, el in enumerate(elements_lite):
-                if el is None: continue
-                # Phân loại vật liệu
-                m_name = el.material.lower()
-                if "iron" in m_name or "steel" in m_name: mat_ids[idx] = 1
-                elif "magnet" in m_name:
-                    z_val = el.magnetization_direction[-1] if el.magnetization_direction is not None else 0
-                    mat_ids[idx] = 2 if z_val >= 0 else 4
-                elif "coil" in m_name or "winding" in m_name: mat_ids[idx] = 3
-                
-                # Lấy FluxB
-                if el.flux_density_average is not None:
-                    b_values[idx] = el.flux_density_average[-1]
-
-            # Xử lý đối xứng nếu có
-            if use_symmetry_factor and hasattr(reluctance_network, 'symmetry_factor'):
-                sym = int(reluctance_network.symmetry_factor)
-                if sym > 1:
-                    mat_ids = np.tile(mat_ids, sym)
-                    b_values = np.tile(b_values, sym)
-            
-            return mat_ids, b_values
+        def create_level(self, level):
+            if self.material_actors[level] is not None:
+                return
+            surface = get_viewer_surface(level)
+            face_data = get_face_data(level, self.current_frame)
+            material_surfaces[level] = surface.surface.copy()
+            material_surfaces[level].cell_data["RGBA"] = color_table[face_data.color_id]
+            flux_surfaces[level] = surface.surface.copy()
+            flux_surfaces[level].cell_data["FluxB"] = face_data.flux_density
 
-        def render(self):
-            for actor in self.current_actors:
-                pl.remove_actor(actor)
-            self.current_actors.clear()
-            
-            if hasattr(pl, 'scalar_bars'):
-                pl.scalar_bars.clear()
-
-            mat_ids, b_values = self.get_current_data()
-            grid_pv.cell_data["MatID"] = mat_ids
-            grid_pv.cell_data["FluxB"] = b_values
-            
-            # Xử lý Symmetry Hình học (chỉ merge một lần đầu hoặc nếu grid thay đổi)
-            non_air_mask = grid_pv.threshold(0.1, scalars="MatID", preference="cell")
-            
+            # Một thanh màu cho cả viewer, gắn với actor FluxB tạo đầu tiên
+            show_scalar_bar = all(actor is None for actor in self.flux_actors)
+            self.material_actors[level] = pl.add_mesh(material_surfaces[level], scalars="RGBA", rgba=True,
+                                                      lighting=False, show_edges=False)
+            self.flux_actors[level] = pl.add_mesh(flux_surfaces[level], scalars="FluxB", cmap="jet", clim=[0, 1.8],
+                                                  nan_opacity=0.0, show_edges=False, lighting=False,
+                                                  scalar_bar_args=sargs, show_scalar_bar=show_scalar_bar)
+
+        def update_style(self):
             opacity_val = 1.0 if self.solid_mode else 0.4
-            
+            # Air rất mờ, vật liệu khác theo chế độ solid
+            color_table[:-1, 3] = int(255 * opacity_val)
+            color_table[0, 3] = int(255 * 0.05)
+            for level in range(n_levels):
+                if self.material_actors[level] is None:
+                    continue
+                self.flux_actors[level].prop.opacity = opacity_val
+                self.material_actors[level].SetVisibility(level == self.level and not self.bmap_mode)
+                self.flux_actors[level].SetVisibility(level == self.level and self.bmap_mode)
+            if pl.scalar_bars:
+                for scalar_bar in pl.scalar_bars.values():
+                    scalar_bar.SetVisibility(self.bmap_mode)
+
+        def render(self):
+            frame = self.current_frame
+            face_data = get_face_data(self.level, frame)
             if self.bmap_mode:
-                if non_air_mask.n_cells > 0:
-                    actor = pl.add_mesh(non_air_mask, scalars="FluxB", cmap="jet", clim=[0, 1.8],
-                                       opacity=opacity_val, show_edges=False, lighting=False,
-                                       scalar_bar_args=sargs, show_scalar_bar=True)
-                    self.current_actors.append(actor)
+                flux_surfaces[self.level].cell_data["FluxB"][:] = face_data.flux_density
+                flux_surfaces[self.level].Modified()
             else:
-                for mid, color in colors.items():
-                    sub = grid_pv.threshold([mid, mid], scalars="MatID", preference="cell")
-                    if sub.n_cells > 0:
-                        op = 0.05 if mid == 0 else opacity_val
-                        actor = pl.add_mesh(sub, color=color, opacity=op, lighting=False,
-                                          show_edges=self.solid_mode, edge_color="#222222")
-                        self.current_actors.append(actor)
-            
+                material_surfaces[self.level].cell_data["RGBA"][:] = color_table[face_data.color_id]
+                material_surfaces[self.level].Modified()
+
             # Hiển thị số Frame hiện tại lên màn hình
-            pl.add_text(f"Frame: {self.current_frame}/{self.total_frames-1}", 
+            pl.add_text(f"Frame: {frame}/{self.total_frames-1}",
                         position="upper_left", font_size=10, color='white', name="frame_info")
+            pl.render()
 
         def toggle_bmap(self, state):
             self.bmap_mode = state
+            self.update_style()
+            self.render()
+
+        def set_level(self, level):
+            if level == self.level:
+                return
+            self.create_level(level)
+            self.level = level
+            self.update_style()
             self.render()
 
+        def update_level(self, *args):
+            # Chọn mức chi tiết theo khoảng cách camera
+            if n_levels == 1:
+                return
+            distance = pl.camera.distance
+            if self.initial_distance is None:
+                self.initial_distance = distance
+            zoomed_in = distance < LOD_ZOOM_RATIO * self.initial_distance
+            self.set_level(0 if (self.full_mode or zoomed_in) else 1)
+
+        def toggle_full(self, state):
+            self.full_mode = state
+            self.update_level()
+
         def toggle_solid(self, state):
             self.solid_mode = state
+            self.update_style()
             self.render()
 
         def next_frame(self):
@@ -140,16 +219,13 @@ def show_reluctance_network(reluctance_network, use_symmetry_factor=True):
                 self.timer.stop()
 
     state = ViewerState()
-    
-    # Thiết lập Symmetry Hình học một lần duy nhất để tối ưu
-    if use_symmetry_factor and hasattr(reluctance_network, 'symmetry_factor'):
-        sym_factor = int(reluctance_network.symmetry_factor)
-        if sym_factor > 1:
-            angle_step = 360.0 / sym_factor
-            segments = [grid_pv.rotate_z(i * angle_step) for i in range(sym_factor)]
-            grid_pv = segments[0].merge(segments[1:]).clean(tolerance=1e-5)
-
+    state.update_style()
     state.render()
+    if n_levels > 1:
+        state.update_level()
+        pl.iren.add_observer("EndInteractionEvent", state.update_level)
+        pl.iren.add_observer("MouseWheelForwardEvent", state.update_level)
+        pl.iren.add_observer("MouseWheelBackwardEvent", state.update_level)
 
     # Hệ thống nút bấm
     btn_size, gap = 80, 10
@@ -174,5 +250,10 @@ def show_reluctance_network(reluctance_network, use_symmetry_factor=True):
     pl.add_checkbox_button_widget(lambda v: state.next_frame(), position=(x_ctrl + (btn_size + gap)*2, y), size=btn_size, color_on='grey', color_off='grey')
     pl.add_text("Next", position=(x_ctrl + (btn_size + gap)*2 + 25, y + 35), font_size=8, color='white')
 
+    if n_levels > 1:
+        x_full = x_ctrl + (btn_size + gap) * 3 + 50
+        pl.add_checkbox_button_widget(state.toggle_full, position=(x_full, y), size=btn_size, color_on='yellow', color_off='grey')
+        pl.add_text("Full", position=(x_full + 28, y + 35), font_size=8, color='white')
+
     pl.show()
     pl.app.exec_()
\ No newline at end of file
@@ -1,19 +1,42 @@
+import numpy as np
 from tqdm import tqdm
+from material.core.lookup_material import lookup_material
 
 def update_reluctance_network(reluctance_network, 
                               magnetic_potential=None,
                               winding_current=None,
                               debug=False):
-    
+    """
+    Cập nhật nguồn từ động (winding_current) và từ thông / mu_r / từ trở (magnetic_potential)
+    của mọi phần tử. Từ thông của mọi phần tử được tính trước với cùng bộ từ trở cũ, sau đó
+    mu_r tra một lần cho cả mạng theo nhóm vật liệu (lookup_material), nên kết quả không phụ
+    thuộc thứ tự duyệt phần tử. winding_current=None giữ nguyên dòng điện đang đặt.
+    """
     reluctance_network.magnetic_potential = magnetic_potential
-    reluctance_network.winding_current = winding_current
+    if winding_current is not None:
+        reluctance_network.winding_current = winding_current
 
     iterator = tqdm(reluctance_network.elements.flat, 
                     total=reluctance_network.elements.size, 
                     desc="Updating Network", 
                     disable=not debug)
 
-    for element in iterator:
-        if element is not None:
-            element.update_element(magnetic_potential=magnetic_potential,
-                                   winding_current=winding_current)
\ No newline at end of file
+    elements = [element for element in iterator if element is not None]
+    for element in elements:
+        if winding_current is not None:
+            element.update_winding(winding_current=winding_current)
+        if magnetic_potential is not None:
+            element.update_flux()
+
+    if magnetic_potential is None or not elements:
+        return
+
+    permeability = lookup_material(B_input=np.stack([element.flux_density_direct for element in elements]),
+                                   material_id=np.array([element.material_id for element in elements]),
+                                   material_database=elements[0].material_database)
+
+    for element, relative_permeability, d_relative_permeability_d_B in zip(elements,
+                                                                          permeability.mu_r,
+                                                                          permeability.dmu_r_dB):
+        element.update_permeability(relative_permeability=relative_permeability,
+                                    d_relative_permeability_d_B=d_relative_permeability_d_B)
@@ -0,0 +1,45 @@
+import numpy as np
+from material.core.lookup_BH_curve import Output
+from material.utils.create_uniform_BH_table import create_uniform_BH_table
+
+def lookup_BH_curve_uniform(B_input,
+                            material_database=None,
+                            iron=None,
+                            invert=False) -> Output:
+    """
+    Tra mu_r và dmu_r/dB của sắt trong một lượt, bằng số học chỉ số trên lưới B đều.
+    B_input có thể là scalar hoặc mảng với shape bất kỳ; kết quả giữ nguyên shape.
+    Bảng tra được dựng một lần và lưu tại iron.uniform_BH_table.
+    """
+    if iron is None:
+        iron = material_database.iron
+
+    table = getattr(iron, "uniform_BH_table", None)
+    if table is None:
+        table = create_uniform_BH_table(iron)
+        iron.uniform_BH_table = table
+
+    is_scalar = np.isscalar(B_input)
+    B_array = np.asarray(B_input, dtype=float)
+
+    B_abs = np.abs(B_array)
+    B_clip = np.clip(B_abs, table.B_min, table.B_max)
+
+    n_intervals = table.slope.size
+    index = np.minimum(((B_clip - table.B_min) * table.inverse_step).astype(np.intp),
+                       n_intervals - 1)
+
+    slope = table.slope[index]
+    mu_r = table.mu_r_nodes[index] + slope * (B_clip - table.B_nodes[index])
+    # Ngoài [B_min, B_max] mu_r bị giữ hằng nên đạo hàm bằng 0 (ma trận tiếp tuyến của Newton)
+    inside = (B_abs >= table.B_min) & (B_abs <= table.B_max)
+    dmu_r_dB = np.where(inside, slope * np.sign(B_array), 0.0)
+
+    if invert:
+        mu_r = 1.0 / (mu_r + 1e-30)
+        dmu_r_dB = -1.0 * (mu_r ** 2) * dmu_r_dB
+
+    if is_scalar:
+        return Output(mu_r=mu_r.item(), dmu_r_dB=dmu_r_dB.item())
+
+    return Output(mu_r=mu_r, dmu_r_dB=dmu_r_dB)
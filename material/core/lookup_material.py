@@ -0,0 +1,36 @@
+import numpy as np
+from material.core.lookup_BH_curve import Output
+from material.core.lookup_BH_curve_uniform import lookup_BH_curve_uniform
+
+def lookup_material(B_input,
+                    material_id,
+                    material_database,
+                    invert=False) -> Output:
+    """
+    Tra mu_r và dmu_r/dB cho nhiều vật liệu cùng lúc.
+    material_id có shape bằng các trục đầu của B_input, ví dụ B (n_cells, 2, 3)
+    với material_id (n_cells,). Mỗi vật liệu được tính trong một lần gọi vector hóa.
+    """
+    B_array = np.asarray(B_input, dtype=float)
+    material_id = np.asarray(material_id, dtype=int)
+    material_id = material_id.reshape(material_id.shape + (1,) * (B_array.ndim - material_id.ndim))
+    material_id = np.broadcast_to(material_id, B_array.shape)
+
+    mu_r = np.empty_like(B_array)
+    dmu_r_dB = np.zeros_like(B_array)
+
+    for mid in np.unique(material_id):
+        mask = (material_id == mid)
+        material = material_database.get_material(mid)
+
+        if material.category == "iron":
+            data = lookup_BH_curve_uniform(B_input=B_array[mask],
+                                           iron=material,
+                                           invert=invert)
+            mu_r[mask] = data.mu_r
+            dmu_r_dB[mask] = data.dmu_r_dB
+        else:
+            value = material.relative_permeance
+            mu_r[mask] = 1.0 / value if invert else value
+
+    return Output(mu_r=mu_r, dmu_r_dB=dmu_r_dB)
@@ -4,24 +4,43 @@ from material.utils.smooth_BH_curve import smooth_BH_curve
 
 PI = math.pi
 
+# Mã vật liệu mặc định, trùng với quy ước material_filter của lookup_BH_curve
+AIR_ID = 0
+MAGNET_ID = 1
+IRON_ID = 2
+
 class Air:
+    category = "air"
+
     def __init__(self, name="default"):
         self.name = name
         self.relative_permeance = 1.
 
 class Magnet:
-    def __init__(self, name: str):
+    category = "magnet"
+
+    def __init__(self, name: str, relative_permeance=None, coercivity=None):
         self.name = name
-        if name == "N30UH":
+        if relative_permeance is not None and coercivity is not None:
+            self.relative_permeance = float(relative_permeance)
+            self.coercivity = float(coercivity)
+        elif name == "N30UH":
             self.relative_permeance = 1.05
             self.coercivity = 852000.0
         else:
             raise ValueError(f"Magnet '{name}' not found")
 
 class Iron:
-    def __init__(self, name: str):
+    category = "iron"
+
+    def __init__(self, name: str, B_H_curve=None):
         self.name = name
-        if name == "M350-50A":
+        if B_H_curve is not None:
+            self.B_H_curve = {
+                "B_data": np.asarray(B_H_curve["B_data"], dtype=float),
+                "H_data": np.asarray(B_H_curve["H_data"], dtype=float)
+            }
+        elif name == "M350-50A":
             self.B_H_curve = {
                 "B_data": np.array([
                     0.0, 0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9,
@@ -36,12 +55,77 @@ class Iron:
             }
         else:
             raise ValueError(f"Iron '{name}' not found")
-        
-        
+
+        # Dữ liệu B-H gốc: B_H_curve được thay bằng đường đã làm trơn khi đăng ký vật liệu
+        self.source_B_H_curve = {name: values.copy() for name, values in self.B_H_curve.items()}
+
+        # Bảng tra trên lưới đều, được tạo khi cần bởi lookup_BH_curve_uniform
+        self.uniform_BH_table = None
+
+
+
+def is_same_material(material, other):
+    """Hai vật liệu có cùng dữ liệu (nhóm, độ từ thẩm, lực kháng từ, đường cong B-H)"""
+    if material is other:
+        return True
+    if material.category != other.category:
+        return False
+    if material.category == "iron":
+        curve = getattr(material, "source_B_H_curve", material.B_H_curve)
+        other_curve = getattr(other, "source_B_H_curve", other.B_H_curve)
+        return all(np.array_equal(curve[name], other_curve[name]) for name in ("B_data", "H_data"))
+    return (material.relative_permeance == other.relative_permeance
+            and getattr(material, "coercivity", None) == getattr(other, "coercivity", None))
 
 class MaterialDataBase:
     def __init__(self, air="default", magnet_type="N30UH", iron_type="M350-50A"):
         self.air = Air(air)
         self.magnet = Magnet(magnet_type)
         self.iron = Iron(iron_type)
-        smooth_BH_curve(iron = self.iron)
\ No newline at end of file
+        smooth_BH_curve(iron = self.iron)
+
+        # Danh sách vật liệu theo mã số nguyên (material id)
+        self.materials = [self.air, self.magnet, self.iron]
+        self.material_keys = {"air": AIR_ID,
+                              "magnet": MAGNET_ID,
+                              "iron": IRON_ID,
+                              self.magnet.name: MAGNET_ID,
+                              self.iron.name: IRON_ID}
+
+    def add_material(self, material, key=None):
+        """
+        Đăng ký thêm một vật liệu (Iron/Magnet/Air) và trả về material id.
+        Vật liệu được tham chiếu qua key (mặc định là material.name). Đăng ký lại một
+        key đã có chỉ hợp lệ khi dữ liệu vật liệu giống hệt (trả về id cũ).
+        """
+        if key is None:
+            key = material.name
+
+        if key in self.material_keys:
+            material_id = self.material_keys[key]
+            if not is_same_material(material, self.materials[material_id]):
+                raise ValueError(f"Material '{key}' is already registered with different data")
+            return material_id
+
+        if material.category == "iron":
+            smooth_BH_curve(iron=material)
+
+        material_id = len(self.materials)
+        self.materials.append(material)
+        self.material_keys[key] = material_id
+        return material_id
+
+    def find_material_id(self, material="air", material_name=None):
+        """
+        Trả về material id từ tên vật liệu cụ thể (material_name) nếu có,
+        ngược lại dùng vật liệu mặc định của nhóm (air/magnet/iron).
+        """
+        if material_name is not None:
+            if material_name not in self.material_keys:
+                raise ValueError(f"Material '{material_name}' not registered")
+            return self.material_keys[material_name]
+
+        return self.material_keys.get(material, AIR_ID)
+
+    def get_material(self, material_id):
+        return self.materials[int(material_id)]
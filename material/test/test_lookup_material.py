@@ -0,0 +1,60 @@
+import sys
+import os
+import numpy as np
+import paths
+
+def test():
+    from material.core.lookup_material import lookup_material
+    from material.core.lookup_BH_curve_uniform import lookup_BH_curve_uniform
+    from material.models.MaterialDataBase import MaterialDataBase, Iron, Magnet, AIR_ID, MAGNET_ID, IRON_ID
+
+    material_database = MaterialDataBase()
+
+    soft_curve = {"B_data": [0.0, 1.0, 2.0], "H_data": [0.0, 50.0, 20000.0]}
+    soft_iron = Iron("soft", B_H_curve=soft_curve)
+    soft_id = material_database.add_material(soft_iron)
+    strong_id = material_database.add_material(Magnet("strong", relative_permeance=1.1, coercivity=9e5))
+
+    assert material_database.add_material(Iron("M350-50A")) == IRON_ID
+    assert material_database.add_material(Iron("soft", B_H_curve=soft_curve)) == soft_id
+    # Cùng tên nhưng khác dữ liệu: không được lặng lẽ dùng lại vật liệu cũ
+    for conflicting in (Iron("soft", B_H_curve={"B_data": [0.0, 1.0, 2.0], "H_data": [0.0, 80.0, 20000.0]}),
+                        Magnet("strong", relative_permeance=1.1, coercivity=8e5),
+                        Magnet("soft", relative_permeance=1.05, coercivity=9e5)):
+        try:
+            material_database.add_material(conflicting)
+            assert False, "conflicting re-registration must raise"
+        except ValueError:
+            pass
+    assert material_database.find_material_id(material="iron") == IRON_ID
+    assert material_database.find_material_id(material="iron", material_name="soft") == soft_id
+    assert material_database.find_material_id(material="coil") == AIR_ID
+
+    material_id = np.array([AIR_ID, MAGNET_ID, IRON_ID, soft_id, strong_id, IRON_ID])
+    B_input = np.random.default_rng(0).uniform(-2.0, 2.0, (material_id.size, 2, 3))
+
+    data_out = lookup_material(B_input=B_input,
+                               material_id=material_id,
+                               material_database=material_database)
+
+    assert data_out.mu_r.shape == B_input.shape
+    assert np.all(data_out.mu_r[0] == 1.0)
+    assert np.all(data_out.mu_r[1] == material_database.magnet.relative_permeance)
+    assert np.all(data_out.mu_r[4] == 1.1)
+    assert np.all(data_out.dmu_r_dB[[0, 1, 4]] == 0.0)
+
+    default_iron = lookup_BH_curve_uniform(B_input=B_input[[2, 5]], iron=material_database.iron)
+    assert np.allclose(data_out.mu_r[[2, 5]], default_iron.mu_r)
+    assert np.allclose(data_out.dmu_r_dB[[2, 5]], default_iron.dmu_r_dB)
+
+    soft = lookup_BH_curve_uniform(B_input=B_input[3], iron=soft_iron)
+    assert np.allclose(data_out.mu_r[3], soft.mu_r)
+
+if __name__ == "__main__":
+    current_file = os.path.abspath(__file__)
+    root_dir = os.path.dirname(os.path.dirname(os.path.dirname(current_file)))
+
+    if root_dir not in sys.path:
+        sys.path.append(root_dir)
+
+    test()
@@ -0,0 +1,44 @@
+import sys
+import os
+import numpy as np
+import paths
+
+def test():
+    from material.core.lookup_BH_curve import lookup_BH_curve
+    from material.core.lookup_BH_curve_uniform import lookup_BH_curve_uniform
+    from material.models.MaterialDataBase import MaterialDataBase
+
+    material_database = MaterialDataBase()
+    B_input = np.linspace(-3.0, 3.0, 2001).reshape(3, 667)
+
+    reference = lookup_BH_curve(B_input=B_input,
+                                material_database=material_database,
+                                return_du_dB=True)
+    data_out = lookup_BH_curve_uniform(B_input=B_input,
+                                       material_database=material_database)
+
+    assert data_out.mu_r.shape == B_input.shape
+    assert data_out.dmu_r_dB.shape == B_input.shape
+    assert np.allclose(data_out.mu_r, reference.mu_r, rtol=1e-3)
+    assert np.allclose(data_out.dmu_r_dB, reference.dmu_r_dB,
+                       atol=1e-2 * np.max(np.abs(reference.dmu_r_dB)))
+
+    scalar_out = lookup_BH_curve_uniform(B_input=0.0, material_database=material_database)
+    assert np.isscalar(scalar_out.mu_r)
+    assert scalar_out.dmu_r_dB == 0.0
+
+    inverted = lookup_BH_curve_uniform(B_input=B_input,
+                                       material_database=material_database,
+                                       invert=True)
+    assert np.allclose(inverted.mu_r * data_out.mu_r, 1.0)
+
+    print(f"Max |mu_r - ref| : {np.max(np.abs(data_out.mu_r - reference.mu_r)):.4e}")
+
+if __name__ == "__main__":
+    current_file = os.path.abspath(__file__)
+    root_dir = os.path.dirname(os.path.dirname(os.path.dirname(current_file)))
+
+    if root_dir not in sys.path:
+        sys.path.append(root_dir)
+
+    test()
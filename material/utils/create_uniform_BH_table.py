@@ -0,0 +1,46 @@
+import numpy as np
+from dataclasses import dataclass
+
+MU0 = 4 * np.pi * 1e-7
+
+@dataclass
+class UniformBHTable:
+    B_min: float
+    B_max: float
+    inverse_step: float        # 1 / dB của lưới đều
+    B_nodes: np.ndarray        # (n+1,) nút B
+    mu_r_nodes: np.ndarray     # (n+1,) mu_r tại các nút
+    slope: np.ndarray          # (n,) dmu_r/dB trên từng khoảng
+
+def create_uniform_BH_table(iron, num_points=None) -> UniformBHTable:
+    """
+    Dựng bảng tra mu_r(B) trên lưới B đều từ iron.B_H_curve.
+    Nếu B_data đã đều (sau smooth_BH_curve) thì lưới giữ nguyên các nút.
+    """
+    B_TABLE = np.asarray(iron.B_H_curve["B_data"], dtype=float)
+    H_TABLE = np.asarray(iron.B_H_curve["H_data"], dtype=float)
+
+    if num_points is None:
+        num_points = len(B_TABLE)
+
+    B_nodes = np.linspace(B_TABLE[0], B_TABLE[-1], num_points)
+    H_nodes = np.interp(B_nodes, B_TABLE, H_TABLE)
+
+    # Cùng quy ước với lookup_BH_curve: tại H ~ 0 dùng mu ở B = 1e-3
+    delta_B = 1e-3
+    H_delta = np.interp(delta_B, B_TABLE, H_TABLE)
+    mu_at_zero = delta_B / (H_delta + 1e-15)
+
+    mu_r_nodes = np.where(np.abs(H_nodes) < 1e-9,
+                          mu_at_zero,
+                          B_nodes / (H_nodes + 1e-15)) / MU0
+
+    step = B_nodes[1] - B_nodes[0]
+    slope = np.diff(mu_r_nodes) / step
+
+    return UniformBHTable(B_min=float(B_nodes[0]),
+                          B_max=float(B_nodes[-1]),
+                          inverse_step=float(1.0 / step),
+                          B_nodes=B_nodes,
+                          mu_r_nodes=mu_r_nodes,
+                          slope=slope)
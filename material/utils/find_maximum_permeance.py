@@ -1,5 +1,4 @@
 import numpy as np
-from scipy.interpolate import interp1d
 from dataclasses import dataclass
 
 MU0 = 4 * np.pi * 1e-7  # H/m
@@ -15,14 +14,21 @@ class MaxPermeanceOutput:
     H_at_max: float    # Giá trị H tại điểm cực đại [A/m]
 
 # --- 2. HÀM ĐÃ SỬA ĐỔI ---
-def find_maximum_permeance(material_database, n_points=5000) -> MaxPermeanceOutput:
+def find_maximum_permeance(material_database=None, n_points=5000, iron=None) -> MaxPermeanceOutput:
     """
     Tìm độ từ thẩm tương đối cực đại (mu_r) của sắt trong material_database.
+    Nếu truyền iron thì dùng trực tiếp vật liệu đó thay cho material_database.iron.
     Trả về object MaxPermeanceOutput chứa (mu_max, B_max, H_max).
     """
+    # scipy.interpolate chỉ cần khi dựng phần tử mới, không cần khi load để giải
+    from scipy.interpolate import interp1d
+
+    if iron is None:
+        iron = material_database.iron
+
     # Lấy dữ liệu BH từ Iron
-    B_TABLE = material_database.iron.B_H_curve["B_data"]
-    H_TABLE = material_database.iron.B_H_curve["H_data"]
+    B_TABLE = iron.B_H_curve["B_data"]
+    H_TABLE = iron.B_H_curve["H_data"]
 
     # Nội suy H(B) để có độ mịn cao hơn bảng dữ liệu gốc
     H_interpolator = interp1d(
@@ -1,7 +1,9 @@
 import numpy as np
-from scipy.interpolate import UnivariateSpline, PchipInterpolator
 
 def smooth_BH_curve(iron, num_points=3000):
+    # scipy.interpolate khá nặng, chỉ cần khi tạo vật liệu mới (không cần khi load)
+    from scipy.interpolate import UnivariateSpline, PchipInterpolator
+
     mu_0 = 4 * np.pi * 1e-7
     
     B_raw = iron.B_H_curve["B_data"]
@@ -67,4 +69,5 @@ def smooth_BH_curve(iron, num_points=3000):
     H_final[0] = 0
 
     iron.B_H_curve["B_data"] = B_final
-    iron.B_H_curve["H_data"] = H_final
\ No newline at end of file
+    iron.B_H_curve["H_data"] = H_final
+    iron.uniform_BH_table = None
\ No newline at end of file
@@ -1,16 +1,26 @@
 from motor_type.utils.for_axial_flux_motor_type_1.find_symmetry_factor import find_symmetry_factor
 from motor_type.utils.for_axial_flux_motor_type_1.find_winding_matrix import find_winding_matrix
-from material.models.MaterialDataBase import MaterialDataBase
-from motor_type.utils.for_axial_flux_motor_type_1.create_geometry import create_geometry
+from material.models.MaterialDataBase import MaterialDataBase, Iron
 from core_class.models.ReluctanceNetwork import ReluctanceNetwork
 from motor_type.utils.for_axial_flux_motor_type_1.rotate_rotor import rotate_rotor
+from motor_type.utils.for_axial_flux_motor_type_1.find_number_of_layer_rotated import find_number_of_layer_rotated
 from motor_type.utils.for_axial_flux_motor_type_1.create_adaptive_mesh import create_adaptive_mesh
-import pyvista as pv
+from motor_type.utils.for_axial_flux_motor_type_1.refine_adaptive_mesh import refine_adaptive_mesh
+from motor_type.utils.for_axial_flux_motor_type_1.find_torque import find_torque
+from motor_type.utils.for_axial_flux_motor_type_1.find_design_sensitivity import find_design_sensitivity
+from motor_type.utils.for_axial_flux_motor_type_1.run_rotor_sweep import run_rotor_sweep
+from motor_type.utils.for_axial_flux_motor_type_1.save_motor import save_motor
+from motor_type.utils.for_axial_flux_motor_type_1.load_motor import load_motor
+from storage.core.lazy_component import load_lazy_component, load_all_lazy_components
+from system.core.set_dpi_awareness import set_dpi_awareness
 import math
 pi = math.pi
 
 # Init Axial Flux Motor : single stator, single rotor, parallel slot, surface mount magnet, surface radial
 class AxialFluxMotorType1:
+    # Lưu qua workspace dưới dạng thư mục mảng thay vì pickle đồ thị Element
+    array_native_storage = True
+
     def __init__(self,
                  # radial_stator_parameter
                  slot_number = 15,
@@ -51,7 +61,9 @@ class AxialFluxMotorType1:
                  # Material
                  air = "default",
                  magnet_type = "N30UH",
-                 iron_type = "M350-50A"
+                 iron_type = "M350-50A",
+                 rotor_iron_type = None,
+                 stator_iron_type = None
                  ):
         
         # --- Gán Radial Stator Parameters ---
@@ -107,9 +119,24 @@ class AxialFluxMotorType1:
         self.material_database = MaterialDataBase(air=air,
                                                   magnet_type= magnet_type,
                                                   iron_type= iron_type)
+
+        # Thép riêng cho rotor / stator (tên hoặc object Iron), None = dùng iron_type
+        self.rotor_iron_type = None
+        self.stator_iron_type = None
+        if rotor_iron_type is not None:
+            rotor_iron = rotor_iron_type if isinstance(rotor_iron_type, Iron) else Iron(rotor_iron_type)
+            self.material_database.add_material(rotor_iron)
+            self.rotor_iron_type = rotor_iron.name
+        if stator_iron_type is not None:
+            stator_iron = stator_iron_type if isinstance(stator_iron_type, Iron) else Iron(stator_iron_type)
+            self.material_database.add_material(stator_iron)
+            self.stator_iron_type = stator_iron.name
+
         self.geometry = None
         self.mesh     = None
         self.reluctance_network = None
+        # Số bước theta rotor đã quay so với lúc tạo reluctance network
+        self.rotor_offset = 0
 
     
     def create_geometry(self,
@@ -120,6 +147,9 @@ class AxialFluxMotorType1:
                         create_tooth = True,
                         create_stator_yoke = True):
         
+        # trimesh / shapely / matplotlib chỉ import khi dựng geometry
+        from motor_type.utils.for_axial_flux_motor_type_1.create_geometry import create_geometry
+
         self.geometry = create_geometry(motor=self,
                                         rotor_angle_offset=rotor_angle_offset,
                                         stator_angle_offset=stator_angle_offset,
@@ -174,17 +204,104 @@ class AxialFluxMotorType1:
         
         return self.mesh
     
-    def create_reluctance_network(self):
+    def refine_adaptive_mesh(self,
+                             target_relative_error = 0.02,
+                             max_refinement = 5,
+                             refine_fraction = 0.5,
+                             max_cells = 200000,
+                             relative_torque_floor = 0.1,
+                             absolute_torque_tolerance = 1e-9,
+                             absolute_flux_linkage_tolerance = 1e-6,
+                             winding_current = None,
+                             solver_parameter = None,
+                             debug = True):
+        """
+        Tự động tinh chỉnh lưới bắt đầu từ self.mesh (lưới thô) cho tới khi mô-men
+        và từ thông móc vòng hội tụ. Kết thúc với self.mesh và self.reluctance_network
+        là lưới/mạng cuối cùng đã giải.
+        """
+        return refine_adaptive_mesh(motor = self,
+                                    target_relative_error = target_relative_error,
+                                    max_refinement = max_refinement,
+                                    refine_fraction = refine_fraction,
+                                    max_cells = max_cells,
+                                    relative_torque_floor = relative_torque_floor,
+                                    absolute_torque_tolerance = absolute_torque_tolerance,
+                                    absolute_flux_linkage_tolerance = absolute_flux_linkage_tolerance,
+                                    winding_current = winding_current,
+                                    solver_parameter = solver_parameter,
+                                    debug = debug)
+
+    def create_reluctance_network(self, segment_ids = None):
+        # segment_ids: phân loại phần tử đã lưu của cùng geometry + lưới (xem create_segment_ids)
         self.reluctance_network = ReluctanceNetwork(motor = self,
                                                     geometry=self.geometry,
-                                                    mesh = self.mesh)
-        
+                                                    mesh = self.mesh,
+                                                    segment_ids = segment_ids)
+        self.rotor_offset = 0
+
         return self.reluctance_network
     
     def rotate_rotor(self,n_step):
         rotate_rotor(motor = self,
                      n_step= n_step)
 
+    def create_sliding_interface_solver(self):
+        # Solver rotor / stator cho các vị trí rotor với độ từ thẩm hiện tại (đóng băng)
+        number_of_layer_rotated = find_number_of_layer_rotated(mesh = self.mesh).number_of_layer_rotated
+        return self.reluctance_network.create_sliding_interface_solver(n_rotor_layer = number_of_layer_rotated,
+                                                                       rotor_offset = getattr(self, "rotor_offset", 0))
+
+    def find_torque(self):
+        return find_torque(motor = self)
+
+    def find_design_sensitivity(self,
+                                parameters,
+                                output = "torque",
+                                phase_weight = (1.0, 0.0, 0.0),
+                                relative_step = 1e-3,
+                                frozen_permeability = False):
+        # Đạo hàm mô-men / từ thông móc vòng theo tham số hình học, tại nghiệm hiện tại
+        return find_design_sensitivity(motor = self,
+                                       parameters = parameters,
+                                       output = output,
+                                       phase_weight = phase_weight,
+                                       relative_step = relative_step,
+                                       frozen_permeability = frozen_permeability)
+
+    def run_rotor_sweep(self,
+                        path,
+                        n_step_shift = 5,
+                        n_position = None,
+                        winding_current = None,
+                        solver_parameter = None,
+                        debug = True):
+        return run_rotor_sweep(motor = self,
+                               path = path,
+                               n_step_shift = n_step_shift,
+                               n_position = n_position,
+                               winding_current = winding_current,
+                               solver_parameter = solver_parameter,
+                               debug = debug)
+
+    def save(self, path):
+        save_motor(motor = self,
+                   path = path)
+
+    @classmethod
+    def load(cls, path, lazy = True):
+        return load_motor(motor_class = cls,
+                          path = path,
+                          lazy = lazy)
+
+    def __getattr__(self, name):
+        # Thành phần chưa load (xem storage.core.lazy_component)
+        return load_lazy_component(self, name)
+
+    def __getstate__(self):
+        load_all_lazy_components(self)
+        return self.__dict__
+
     def show(self, show_geometry=True, show_mesh=True):
         """
         Hiển thị toàn bộ mô hình động cơ (Geometry + Mesh).
@@ -192,7 +309,10 @@ class AxialFluxMotorType1:
         """
         
 
+        import pyvista as pv
+
         # --- 1. KHỞI TẠO SÂN KHẤU CHUNG (PLOTTER) ---
+        set_dpi_awareness()
         pv.set_plot_theme("dark")
         pl = pv.Plotter(window_size=[1400, 1000])
         pl.set_background("#0F0F0F")  # Nền đen tuyền hiện đại
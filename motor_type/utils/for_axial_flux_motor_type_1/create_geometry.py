@@ -35,6 +35,7 @@ def create_geometry(motor,
                                 )
     rotor_yoke_template = Segment(mesh= rotor_yoke_mesh,
                                   material = "iron",
+                                  material_name = motor.rotor_iron_type,
                                   magnet_source= 0.0,
                                   )
     if create_rotor_yoke == True:
@@ -104,7 +105,8 @@ def create_geometry(motor,
     for i in range(int(motor.slot_number)):
         mesh_rotated = rotate_mesh_z(mesh_1, i * 2* pi / motor.slot_number)
         tooth_tip_rotated = Segment(mesh=mesh_rotated,
-                                    material="iron")
+                                    material="iron",
+                                    material_name=motor.stator_iron_type)
         if create_tooth == True:
             geometry.append(tooth_tip_rotated)
             
@@ -137,7 +139,9 @@ def create_geometry(motor,
         mesh2_rotated = rotate_mesh_z(mesh = mesh2,
                                       angle_rad= i * 2*pi / motor.slot_number)
         if create_tooth == True:
-            geometry.append(Segment(mesh=mesh2_rotated,material="iron"))
+            geometry.append(Segment(mesh=mesh2_rotated,
+                                    material="iron",
+                                    material_name=motor.stator_iron_type))
 
     #create_tooth
     z_offset_4 = z_tooth_tip_2 + motor.slot_depth
@@ -152,6 +156,7 @@ def create_geometry(motor,
         if create_tooth == True:
             geometry.append(Segment(mesh=mesh_3_rotated,
                                     material="iron",
+                                    material_name=motor.stator_iron_type,
                                     winding_vector = winding_vector))
         
     # create stator yoke
@@ -161,5 +166,6 @@ def create_geometry(motor,
                                    z_offset=z_offset_4)
     if create_stator_yoke == True:
         geometry.append(Segment(mesh = stator_yoke_mesh,
-                                material="iron"))
+                                material="iron",
+                                material_name=motor.stator_iron_type))
     return Geometry(geometry=geometry)
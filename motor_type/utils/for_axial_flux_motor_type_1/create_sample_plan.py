@@ -0,0 +1,76 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, List
+import itertools
+import numpy as np
+from scipy.stats import qmc
+
+SAMPLE_METHODS = ["latin_hypercube", "full_factorial", "random"]
+
+@dataclass
+class Output:
+    names: List[str] = field(default_factory=list)
+    samples: List[Dict[str, Any]] = field(default_factory=list)    # mỗi phần tử: {tên tham số: giá trị}
+
+def create_sample_plan(parameters,
+                       method="latin_hypercube",
+                       n_sample=10,
+                       n_level=3,
+                       seed=0):
+    """
+    Kế hoạch thí nghiệm cho các tham số motor. parameters: {tên: khoảng}, với khoảng là
+    - list: các mức rời rạc (vd. số rãnh / số cực, loại thép),
+    - dict {"low", "high"}: khoảng liên tục; "integer": True (mặc định khi low, high
+      đều là số nguyên) để làm tròn; "n_level": số mức khi full_factorial.
+    method: 'latin_hypercube' / 'random' lấy n_sample mẫu trên [0, 1)^d rồi ánh xạ
+    vào từng khoảng; 'full_factorial' lấy mọi tổ hợp mức (n_level mức đều cho khoảng liên tục).
+    """
+    if method not in SAMPLE_METHODS:
+        raise ValueError(f"Unknown sample method '{method}', expected one of {SAMPLE_METHODS}")
+
+    names = list(parameters)
+    ranges = [find_parameter_range(name, parameters[name]) for name in names]
+    result = Output(names=names)
+
+    if method == "full_factorial":
+        levels = [find_parameter_level(spec, n_level) for spec in ranges]
+        for combination in itertools.product(*levels):
+            result.samples.append(dict(zip(names, combination)))
+        return result
+
+    if method == "latin_hypercube":
+        unit = qmc.LatinHypercube(d=len(names), seed=seed).random(n=int(n_sample))
+    else:
+        unit = np.random.default_rng(seed).random((int(n_sample), len(names)))
+
+    for row in unit:
+        result.samples.append({name: map_unit_value(spec, u) for name, spec, u in zip(names, ranges, row)})
+    return result
+
+def find_parameter_range(name, spec):
+    if isinstance(spec, (list, tuple)):
+        if len(spec) == 0:
+            raise ValueError(f"Parameter '{name}' has no levels")
+        return {"values": list(spec)}
+    if isinstance(spec, dict) and "low" in spec and "high" in spec:
+        low, high = spec["low"], spec["high"]
+        integer = spec.get("integer", isinstance(low, int) and isinstance(high, int))
+        return {"low": low, "high": high, "integer": bool(integer), "n_level": spec.get("n_level")}
+    raise ValueError(f"Parameter '{name}' must be a list of levels or a dict with 'low' and 'high'")
+
+def find_parameter_level(spec, n_level):
+    if "values" in spec:
+        return spec["values"]
+    levels = np.linspace(spec["low"], spec["high"], int(spec["n_level"] or n_level))
+    if spec["integer"]:
+        return list(dict.fromkeys(int(round(value)) for value in levels))
+    return [float(value) for value in levels]
+
+def map_unit_value(spec, u):
+    # u trong [0, 1): mức rời rạc theo ô đều, khoảng liên tục theo tỉ lệ
+    if "values" in spec:
+        values = spec["values"]
+        return values[min(int(u * len(values)), len(values) - 1)]
+    if spec["integer"]:
+        # Mỗi số nguyên trong [low, high] có xác suất như nhau
+        return int(spec["low"] + min(int(u * (spec["high"] - spec["low"] + 1)), spec["high"] - spec["low"]))
+    return float(spec["low"] + u * (spec["high"] - spec["low"]))
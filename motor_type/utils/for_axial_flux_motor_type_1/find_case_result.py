@@ -0,0 +1,25 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict
+from core_class.utils.find_flux_density_field import find_flux_density_field
+from core_class.utils.find_flux_linkage import find_flux_linkage
+from motor_type.utils.for_axial_flux_motor_type_1.find_torque import find_torque
+
+@dataclass
+class Output:
+    info: Dict[str, Any] = field(default_factory=dict)      # dữ liệu nhỏ dạng JSON
+    arrays: Dict[str, Any] = field(default_factory=dict)    # mảng ghi vào StreamingResultWriter
+
+def find_case_result(motor):
+    """Kết quả cần lưu của motor sau khi giải một case (vị trí rotor + dòng điện)"""
+    reluctance_network = motor.reluctance_network
+    flux_density_field = find_flux_density_field(reluctance_network).flux_density_field
+    torque = find_torque(motor, flux_density_field=flux_density_field).torque
+    flux_linkage = find_flux_linkage(reluctance_network).flux_linkage
+
+    return Output(info={"rotor_offset": int(getattr(motor, "rotor_offset", 0)),
+                        "torque": float(torque)},
+                  arrays={"magnetic_potential": reluctance_network.magnetic_potential.data,
+                          "flux_density_field": flux_density_field,
+                          "material_ids": reluctance_network.material_ids,
+                          "flux_linkage": flux_linkage,
+                          "torque": torque})
@@ -0,0 +1,109 @@
+import copy
+from dataclasses import dataclass, field
+from typing import Any, List
+import numpy as np
+from core_class.utils.save_reluctance_network import stack_element_field
+from core_class.utils.find_flux_linkage_gradient import find_flux_linkage_gradient
+from solver.core.find_adjoint_sensitivity import find_adjoint_sensitivity
+from motor_type.utils.for_axial_flux_motor_type_1.find_torque_gradient import find_torque_gradient
+
+OUTPUTS = ["torque", "flux_linkage"]
+
+@dataclass
+class Output:
+    value: float
+    parameters: List[str] = field(default_factory=list)
+    gradient: np.ndarray = None         # dQ / d(tham số), theo thứ tự parameters
+    step: np.ndarray = None             # bước sai phân của từng tham số
+    sensitivity: Any = None             # kết quả find_adjoint_sensitivity tại thiết kế hiện tại
+
+def find_design_sensitivity(motor,
+                            parameters,
+                            output="torque",
+                            phase_weight=(1.0, 0.0, 0.0),
+                            relative_step=1e-3,
+                            frozen_permeability=False,
+                            ordering="nested_dissection"):
+    """
+    Đạo hàm của mô-men (output='torque') hoặc phase_weight . flux_linkage
+    (output='flux_linkage') theo các tham số hình học của motor (vd. 'airgap',
+    'magnet_length', 'slot_width'), tại nghiệm phi tuyến hiện tại của motor.reluctance_network.
+
+    Một lần giải liên hợp (find_adjoint_sensitivity) cho dQ theo R_vac, A, F của mọi
+    nhánh. Với mỗi tham số chỉ dựng lại geometry / lưới (cùng detail_parameter) / mạng
+    tại p + h và p - h để lấy thay đổi của R_vac, A, F, không giải lại:
+        dQ/dp ~ (sum dQ/dR_vac dR_vac + dQ/dA dA + dQ/dF dF + dQ_trực_tiếp) / 2h
+    với dQ_trực_tiếp là thay đổi của Q khi giữ từ thông liên kết (trọng số mô-men, cuộn dây).
+    Nghiệm phải hội tụ chặt và tự nhất quán (method='newton' của solve_magnetic_equation),
+    xem find_adjoint_sensitivity.
+    """
+    if output not in OUTPUTS:
+        raise ValueError(f"Unknown output '{output}', expected one of {OUTPUTS}")
+
+    reluctance_network = motor.reluctance_network
+    shape = reluctance_network.elements.shape
+    objective = find_design_objective(motor, output=output, phase_weight=phase_weight)
+    sensitivity = find_adjoint_sensitivity(reluctance_network,
+                                           objective,
+                                           frozen_permeability=frozen_permeability,
+                                           ordering=ordering)
+    base_field = find_branch_field(reluctance_network)
+
+    gradient = np.zeros(len(parameters))
+    step = np.zeros(len(parameters))
+    for index, name in enumerate(parameters):
+        value = float(getattr(motor, name))
+        h = relative_step * abs(value) if value != 0 else relative_step
+        # Sai phân trung tâm của R_vac, A, F và của Q khi giữ từ thông liên kết: sai số O(h^2)
+        change = 0.0
+        for sign in (1.0, -1.0):
+            perturbed = create_perturbed_motor(motor, name, value + sign * h)
+            if perturbed.reluctance_network.elements.shape != shape:
+                raise ValueError(f"Mesh shape changed when perturbing '{name}'")
+
+            perturbed_field = find_branch_field(perturbed.reluctance_network)
+            for key, branch_gradient in (("vacuum_reluctance", sensitivity.vacuum_reluctance_gradient),
+                                         ("section_area", sensitivity.section_area_gradient),
+                                         ("magnetic_source", sensitivity.magnetic_source_gradient)):
+                delta = perturbed_field[key] - base_field[key]
+                change += sign * float(np.sum(np.where(np.isfinite(delta), delta, 0.0) * branch_gradient))
+
+            perturbed_objective = find_design_objective(perturbed, output=output, phase_weight=phase_weight)
+            change += sign * (perturbed_objective(sensitivity.link_flux).value - sensitivity.value)
+
+        gradient[index] = change / (2 * h)
+        step[index] = h
+
+    return Output(value=sensitivity.value,
+                  parameters=list(parameters),
+                  gradient=gradient,
+                  step=step,
+                  sensitivity=sensitivity)
+
+def find_design_objective(motor, output="torque", phase_weight=(1.0, 0.0, 0.0)):
+    # objective(link_flux) cho find_adjoint_sensitivity
+    if output == "torque":
+        return lambda link_flux: find_torque_gradient(motor, link_flux)
+    return lambda link_flux: find_flux_linkage_gradient(motor.reluctance_network, link_flux, phase_weight)
+
+def find_branch_field(reluctance_network):
+    elements = reluctance_network.elements
+    shape = elements.shape
+    element_list = [elements[index] for index in np.ndindex(shape)]
+    return {key: stack_element_field(element_list, key, shape)
+            for key in ("vacuum_reluctance", "section_area", "magnetic_source")}
+
+def create_perturbed_motor(motor, name, value):
+    """Bản sao nông của motor với tham số name = value, dựng lại geometry, lưới, mạng cùng vị trí rotor và dòng điện"""
+    perturbed = copy.copy(motor)
+    setattr(perturbed, name, value)
+    perturbed.create_geometry()
+    perturbed.create_adaptive_mesh(*motor.mesh.detail_parameter)
+
+    reluctance_network = perturbed.create_reluctance_network()
+    rotor_offset = getattr(motor, "rotor_offset", 0)
+    if rotor_offset:
+        perturbed.rotate_rotor(rotor_offset)
+    reluctance_network.update_reluctance_network(magnetic_potential=reluctance_network.magnetic_potential,
+                                                 winding_current=motor.reluctance_network.winding_current)
+    return perturbed
@@ -0,0 +1,17 @@
+from dataclasses import dataclass
+
+@dataclass
+class Output:
+    number_of_layer_rotated: int
+
+def find_number_of_layer_rotated(mesh):
+    """
+    Số lớp z (tính từ lớp z đầu tiên) quay cùng rotor: khí phía trong, gông rotor và nam châm,
+    không gồm lớp nào của khe hở. n_z_* trong detail_parameter là số nút của mỗi vùng
+    (n_z_* - 1 lớp, vùng có 0 nút không có lớp). Mặt trượt rotor / stator là mặt trên
+    của nam châm, nằm giữa lớp number_of_layer_rotated - 1 và lớp number_of_layer_rotated.
+    """
+    n_z_in_air, n_z_rotor_yoke, n_z_magnet = mesh.detail_parameter[6:9]
+    number_of_layer_rotated = sum(max(int(n_z) - 1, 0) for n_z in (n_z_in_air, n_z_rotor_yoke, n_z_magnet))
+
+    return Output(number_of_layer_rotated=number_of_layer_rotated)
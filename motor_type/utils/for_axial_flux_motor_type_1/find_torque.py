@@ -0,0 +1,57 @@
+from dataclasses import dataclass
+import numpy as np
+from core_class.utils.find_flux_density_field import find_flux_density_field
+
+MU0 = 4 * np.pi * 1e-7
+
+@dataclass
+class Output:
+    torque: float
+    torque_layer: np.ndarray   # Mô-men trên từng lớp z của khe hở không khí
+
+@dataclass
+class TorqueWeight:
+    airgap_layers: np.ndarray   # chỉ số các lớp z nằm trong khe hở không khí
+    weight: np.ndarray          # (nr, nt): r * dS * số sector / mu0, torque_layer = sum(weight * B_z * B_t)
+
+def find_torque_weight(motor):
+    mesh = motor.mesh
+
+    z_airgap_begin = motor.rotor_length + motor.magnet_length
+    z_airgap_end = z_airgap_begin + motor.airgap
+
+    z_center = (mesh.z_nodes[:-1] + mesh.z_nodes[1:]) / 2
+    airgap_layers = np.where((z_center > z_airgap_begin) & (z_center < z_airgap_end))[0]
+    if airgap_layers.size == 0:
+        raise ValueError("No element layer inside the airgap, refine n_z_airgap")
+
+    r_nodes = mesh.r_nodes
+    r_center = (r_nodes[:-1] + r_nodes[1:]) / 2
+    d_theta = np.diff(mesh.theta_nodes)
+    face_area = 0.5 * np.outer(r_nodes[1:] ** 2 - r_nodes[:-1] ** 2, d_theta)
+
+    theta_span = mesh.theta_nodes[-1] - mesh.theta_nodes[0]
+    weight = r_center[:, None] * face_area * round(2 * np.pi / theta_span) / MU0
+    return TorqueWeight(airgap_layers=airgap_layers, weight=weight)
+
+def find_torque(motor, flux_density_field=None):
+    """
+    Mô-men điện từ theo tensor ứng suất Maxwell trên các mặt z trong khe hở không khí:
+        T = (1/mu0) * sum( r * B_z * B_t * dS ),  dS = (r2^2 - r1^2)/2 * dtheta
+    Lấy trung bình trên các lớp phần tử nằm trong khe hở, nhân với số sector.
+    """
+    reluctance_network = motor.reluctance_network
+
+    if flux_density_field is None:
+        flux_density_field = find_flux_density_field(reluctance_network).flux_density_field
+
+    stress_weight = find_torque_weight(motor)
+    airgap_layers = stress_weight.airgap_layers
+
+    B_t = flux_density_field[:, :, airgap_layers, 1]
+    B_z = flux_density_field[:, :, airgap_layers, 2]
+
+    torque_layer = np.sum(stress_weight.weight[:, :, None] * B_z * B_t, axis=(0, 1))
+
+    return Output(torque=float(np.mean(torque_layer)),
+                  torque_layer=torque_layer)
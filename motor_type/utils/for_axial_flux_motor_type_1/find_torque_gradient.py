@@ -0,0 +1,45 @@
+from dataclasses import dataclass, field
+from typing import List
+import numpy as np
+from core_class.utils.save_reluctance_network import stack_element_field
+from solver.utils.find_cell_flux import find_cell_flux, gather_cell_value
+from motor_type.utils.for_axial_flux_motor_type_1.find_torque import find_torque_weight
+
+@dataclass
+class Output:
+    value: float
+    flux_gradient: List[np.ndarray] = field(default_factory=list)  # dT / d(từ thông liên kết), theo find_link_flux
+
+def find_torque_gradient(motor, link_flux):
+    """
+    Mô-men của find_torque tính từ từ thông liên kết (find_link_flux) và đạo hàm
+    của nó theo từ thông trên từng liên kết: B của mỗi ô là tổng từ thông hai mặt
+    chia tổng tiết diện hai mặt (như find_flux_density).
+    """
+    reluctance_network = motor.reluctance_network
+    elements = reluctance_network.elements
+    shape = elements.shape
+    periodic_boundary = bool(reluctance_network.magnetic_potential.periodic_boundary)
+
+    element_list = [elements[index] for index in np.ndindex(shape)]
+    section_area = stack_element_field(element_list, "section_area", shape)
+    area_sum = section_area[..., 0, :] + section_area[..., 1, :]
+
+    cell_flux = find_cell_flux(link_flux, shape, periodic_boundary).cell_flux
+    B_t = cell_flux[1] / area_sum[..., 1]
+    B_z = cell_flux[2] / area_sum[..., 2]
+
+    stress_weight = find_torque_weight(motor)
+    layers = stress_weight.airgap_layers
+    weight = stress_weight.weight[:, :, None] / layers.size
+    value = float(np.sum(weight * B_z[:, :, layers] * B_t[:, :, layers]))
+
+    d_B_t = np.zeros(shape)
+    d_B_z = np.zeros(shape)
+    d_B_t[:, :, layers] = weight * B_z[:, :, layers]
+    d_B_z[:, :, layers] = weight * B_t[:, :, layers]
+
+    flux_gradient = [np.zeros_like(link_flux[0]),
+                     gather_cell_value(d_B_t / area_sum[..., 1], 1, periodic_boundary),
+                     gather_cell_value(d_B_z / area_sum[..., 2], 2, periodic_boundary)]
+    return Output(value=value, flux_gradient=flux_gradient)
@@ -0,0 +1,50 @@
+import os
+from storage.models.KeyValueStore import KeyValueStore
+from core_class.utils.load_geometry import load_geometry
+from core_class.utils.load_cylindrical_mesh import load_cylindrical_mesh
+from core_class.utils.load_reluctance_network import load_reluctance_network
+from storage.core.lazy_component import set_lazy_component
+
+def load_motor(motor_class, path, lazy=True):
+    """
+    Dựng lại motor từ thư mục lưu bởi save_motor. Motor được khôi phục từ trạng thái
+    đã lưu (không gọi constructor, không dựng lại MaterialDataBase); với lazy=True,
+    geometry, mesh và reluctance_network (cùng elements / lịch sử bên trong) chỉ
+    được đọc khi truy cập lần đầu.
+    """
+    store = KeyValueStore(path)
+    metadata = store.load("metadata")
+    if metadata is None or metadata.get("format") != motor_class.__name__:
+        raise ValueError(f"No {motor_class.__name__} stored at '{path}'")
+
+    if "attributes" in metadata:
+        motor = motor_class.__new__(motor_class)
+        motor.__dict__.update(metadata["attributes"])
+        motor.geometry = None
+        motor.mesh = None
+        motor.reluctance_network = None
+    else:
+        # Thư mục lưu trước khi có attributes: dựng lại bằng constructor
+        parameters = dict(metadata["parameters"])
+        winding_matrix = parameters.pop("winding_matrix", None)
+        motor = motor_class(**parameters)
+        motor.winding_matrix = winding_matrix
+        motor.rotor_iron_type = metadata["rotor_iron_type"]
+        motor.stator_iron_type = metadata["stator_iron_type"]
+        motor.rotor_offset = metadata.get("rotor_offset", 0)
+    motor.material_database = store.load("material_database")
+
+    loaders = {"geometry": lambda: load_geometry(os.path.join(path, "geometry")),
+               "mesh": lambda: load_cylindrical_mesh(os.path.join(path, "mesh")),
+               "reluctance_network": lambda: load_reluctance_network(os.path.join(path, "reluctance_network"),
+                                                                     motor=motor,
+                                                                     lazy=lazy)}
+    for name, loader in loaders.items():
+        if name not in metadata["components"]:
+            continue
+        if lazy:
+            set_lazy_component(motor, name, loader)
+        else:
+            setattr(motor, name, loader())
+
+    return motor
@@ -0,0 +1,216 @@
+from dataclasses import dataclass, field
+from typing import Any, List
+import numpy as np
+from core_class.models.CylindricalMesh import CylindricalMesh
+from core_class.utils.find_flux_density_field import find_flux_density_field
+from core_class.utils.find_flux_discontinuity import find_flux_discontinuity
+from core_class.utils.find_flux_linkage import find_flux_linkage
+from motor_type.utils.for_axial_flux_motor_type_1.find_torque import find_torque
+
+
+# Hệ số chia theta lớn nhất trong một lần tinh chỉnh
+MAX_THETA_FACTOR = 4
+
+@dataclass
+class Output:
+    mesh: Any
+    converged: bool
+    n_cells_history: List[int] = field(default_factory=list)
+    torque_history: List[float] = field(default_factory=list)
+    flux_linkage_history: List[np.ndarray] = field(default_factory=list)
+
+@dataclass
+class ConvergenceCheck:
+    torque_error: float
+    flux_linkage_error: float
+    converged: bool
+
+
+def refine_adaptive_mesh(motor,
+                         target_relative_error=0.02,
+                         max_refinement=5,
+                         refine_fraction=0.5,
+                         max_cells=200000,
+                         relative_torque_floor=0.1,
+                         absolute_torque_tolerance=1e-9,
+                         absolute_flux_linkage_tolerance=1e-6,
+                         winding_current=None,
+                         solver_parameter=None,
+                         debug=True):
+    """
+    Tinh chỉnh lưới tự động: giải trên lưới hiện tại (motor.mesh), ước lượng sai số
+    từ bước nhảy B giữa các phần tử kề nhau, chèn thêm đường nút r/theta/z tại vùng
+    sai số lớn rồi giải lại. Dừng khi mô-men và từ thông móc vòng thay đổi ít hơn
+    target_relative_error giữa hai lần tinh chỉnh liên tiếp.
+
+    - refine_fraction: tỷ lệ tổng sai số (đánh dấu Dörfler) cần được tinh chỉnh.
+    - relative_torque_floor: sai số mô-men cho phép không nhỏ hơn
+      target_relative_error * relative_torque_floor * max |mô-men| của các lần giải,
+      để tiêu chí vẫn dùng được khi mô-men gần 0 ở vị trí rotor đang xét.
+    - absolute_torque_tolerance (N.m): sai số mô-men luôn được chấp nhận, cho trường hợp
+      mô-men bằng 0 ở mọi mức lưới (không có dòng điện, vị trí đối xứng) khi thang tương
+      đối chỉ còn nhiễu làm tròn ~1e-15.
+    - Theta không được chèn nút cục bộ vì rotate_rotor dịch theo số bước đều: sai số
+      quyết định hệ số chia đều m của theta (xem find_theta_factor).
+    """
+    if motor.mesh is None:
+        motor.create_adaptive_mesh()
+
+    if solver_parameter is None:
+        solver_parameter = {}
+
+    result = Output(mesh=motor.mesh, converged=False)
+
+    for level in range(max_refinement + 1):
+        mesh = motor.mesh
+        if debug:
+            print(f"[INFO] Refinement level {level}: {mesh.total_cells} cells")
+
+        reluctance_network = motor.create_reluctance_network()
+        reluctance_network.update_reluctance_network(magnetic_potential=reluctance_network.magnetic_potential,
+                                                     winding_current=winding_current)
+        reluctance_network.solve_magnetic_equation(**solver_parameter)
+
+        flux_density_field = find_flux_density_field(reluctance_network).flux_density_field
+        torque = find_torque(motor, flux_density_field=flux_density_field).torque
+        flux_linkage = find_flux_linkage(reluctance_network).flux_linkage
+
+        result.mesh = mesh
+        result.n_cells_history.append(mesh.total_cells)
+        result.torque_history.append(torque)
+        result.flux_linkage_history.append(flux_linkage)
+
+        if level > 0:
+            check = check_refinement_convergence(result.torque_history,
+                                                 result.flux_linkage_history,
+                                                 target_relative_error=target_relative_error,
+                                                 relative_torque_floor=relative_torque_floor,
+                                                 absolute_torque_tolerance=absolute_torque_tolerance,
+                                                 absolute_flux_linkage_tolerance=absolute_flux_linkage_tolerance)
+            if debug:
+                print(f"[INFO] Torque = {torque:.5g} (change {check.torque_error:.3g}), "
+                      f"flux linkage change {check.flux_linkage_error:.3g}")
+            if check.converged:
+                result.converged = True
+                break
+
+        if level == max_refinement:
+            break
+
+        indicator = find_flux_discontinuity(reluctance_network, flux_density_field=flux_density_field)
+        refined_mesh = create_refined_mesh(motor=motor,
+                                           indicator=indicator,
+                                           refine_fraction=refine_fraction)
+
+        if refined_mesh.total_cells > max_cells:
+            if debug:
+                print(f"[WARNING] Refined mesh exceeds max_cells ({refined_mesh.total_cells} > {max_cells}), stop.")
+            break
+        if refined_mesh.total_cells == mesh.total_cells:
+            break
+
+        motor.mesh = refined_mesh
+
+    return result
+
+
+def check_refinement_convergence(torque_history,
+                                 flux_linkage_history,
+                                 target_relative_error=0.02,
+                                 relative_torque_floor=0.1,
+                                 absolute_torque_tolerance=1e-9,
+                                 absolute_flux_linkage_tolerance=1e-6):
+    """So sánh hai lần giải cuối của refine_adaptive_mesh (cần ít nhất hai lần)"""
+    torque = torque_history[-1]
+    flux_linkage = np.asarray(flux_linkage_history[-1])
+    torque_error = abs(torque - torque_history[-2])
+    flux_linkage_error = float(np.max(np.abs(flux_linkage - np.asarray(flux_linkage_history[-2]))))
+
+    torque_scale = max(abs(torque), relative_torque_floor * np.max(np.abs(torque_history)))
+    torque_ok = torque_error <= max(target_relative_error * torque_scale, absolute_torque_tolerance)
+    flux_linkage_ok = flux_linkage_error <= max(target_relative_error * np.max(np.abs(flux_linkage)),
+                                                absolute_flux_linkage_tolerance)
+    return ConvergenceCheck(torque_error=float(torque_error),
+                            flux_linkage_error=flux_linkage_error,
+                            converged=bool(torque_ok and flux_linkage_ok))
+
+
+def create_refined_mesh(motor, indicator, refine_fraction=0.5):
+    mesh = motor.mesh
+
+    # Đánh dấu Dörfler: tập đường nút nhỏ nhất chứa refine_fraction tổng sai số
+    all_indicator = np.concatenate([indicator.indicator_r,
+                                    indicator.indicator_t,
+                                    indicator.indicator_z])
+    if all_indicator.size == 0 or np.sum(all_indicator) <= 0:
+        return mesh
+
+    sorted_indicator = np.sort(all_indicator)[::-1]
+    cumulative = np.cumsum(sorted_indicator)
+    n_marked = int(np.searchsorted(cumulative, refine_fraction * cumulative[-1])) + 1
+    threshold = sorted_indicator[min(n_marked, sorted_indicator.size) - 1]
+
+    r_nodes = refine_nodes(mesh.r_nodes, indicator.indicator_r >= threshold)
+    z_nodes = refine_nodes(mesh.z_nodes, indicator.indicator_z >= threshold)
+
+    theta_nodes = mesh.theta_nodes
+    theta_factor = find_theta_factor(indicator.indicator_t, threshold)
+    if theta_factor > 1:
+        theta_nodes = np.linspace(theta_nodes[0], theta_nodes[-1], theta_factor * (len(theta_nodes) - 1) + 1)
+
+    return CylindricalMesh(r_nodes=r_nodes,
+                           theta_nodes=theta_nodes,
+                           z_nodes=z_nodes,
+                           periodic_boundary=mesh.periodic_boundary,
+                           detail_parameter=find_refined_detail_parameter(motor=motor,
+                                                                          theta_nodes=theta_nodes,
+                                                                          z_nodes=z_nodes))
+
+
+def find_theta_factor(indicator_t, threshold, max_theta_factor=MAX_THETA_FACTOR):
+    """
+    Hệ số chia đều theta m theo sai số: bước nhảy B qua mặt theta tỉ lệ với dtheta nên
+    chỉ số sai số của một đường nút giảm ~ 1 / m^2 khi chia mỗi ô thành m. m là số nhỏ
+    nhất đưa đường nút theta lớn nhất xuống dưới ngưỡng Dörfler (1 = giữ nguyên khi
+    không đường nút theta nào bị đánh dấu), tối đa max_theta_factor.
+    """
+    if indicator_t.size == 0 or threshold <= 0 or np.max(indicator_t) < threshold:
+        return 1
+    factor = int(np.floor(np.sqrt(np.max(indicator_t) / threshold))) + 1
+    return int(min(max(factor, 2), max_theta_factor))
+
+
+def refine_nodes(nodes, marked_line):
+    """
+    Chia đôi hai phần tử kề mỗi đường nút bên trong được đánh dấu.
+    marked_line[i] tương ứng nút nodes[i + 1].
+    """
+    marked_cell = np.zeros(len(nodes) - 1, dtype=bool)
+    marked_cell[:-1] |= marked_line
+    marked_cell[1:] |= marked_line
+
+    midpoints = (nodes[:-1] + nodes[1:])[marked_cell] / 2
+    return np.sort(np.concatenate([nodes, midpoints]))
+
+
+def find_refined_detail_parameter(motor, theta_nodes, z_nodes):
+    """
+    Cập nhật detail_parameter theo lưới mới. rotate_rotor dùng số nút của ba vùng
+    z phía rotor (in_air, rotor_yoke, magnet) để biết các lớp cần quay.
+    """
+    detail_parameter = list(motor.mesh.detail_parameter)
+    detail_parameter[5] = len(theta_nodes)
+
+    z_bounds = [-motor.rotor_length,
+                0.0,
+                motor.rotor_length,
+                motor.rotor_length + motor.magnet_length]
+    z_center = (z_nodes[:-1] + z_nodes[1:]) / 2
+
+    for k in range(3):
+        if detail_parameter[6 + k] <= 0:
+            continue
+        n_cells = np.count_nonzero((z_center > z_bounds[k]) & (z_center < z_bounds[k + 1]))
+        detail_parameter[6 + k] = int(n_cells) + 1
+
+    return detail_parameter
@@ -0,0 +1,89 @@
+from dataclasses import dataclass, field
+from typing import Any, List
+import json
+import hashlib
+import numpy as np
+from storage.models.TableResultWriter import TableResultWriter
+from surrogate.models.SurrogateModel import SurrogateModel
+from surrogate.utils.load_result_table import load_result_table
+from surrogate.utils.find_operating_point_table import find_operating_point_table
+from motor_type.utils.for_axial_flux_motor_type_1.create_sample_plan import create_sample_plan
+from motor_type.utils.for_axial_flux_motor_type_1.run_design_study import (load_study_file, find_design_list,
+                                                                          find_study_columns, create_design,
+                                                                          solve_design_list, Output as StudyOutput)
+
+@dataclass
+class Output:
+    model: Any
+    inputs: List[str] = field(default_factory=list)
+    new_designs: List[str] = field(default_factory=list)        # design_id đã giải thêm
+    max_uncertainty: List[float] = field(default_factory=list)  # max độ bất định tương đối trên ứng viên, mỗi vòng
+    converged: bool = False
+
+def refine_surrogate(path,
+                     outputs=None,
+                     n_candidate=500,
+                     n_new=4,
+                     max_round=3,
+                     uncertainty_tolerance=0.05,
+                     n_workers=1,
+                     seed=0,
+                     debug=True):
+    """
+    Huấn luyện SurrogateModel từ bảng kết quả của study file (chạy phần DOE còn thiếu
+    trước), rồi lặp: lấy n_candidate thiết kế ngẫu nhiên trong khoảng tham số của study,
+    dự đoán độ bất định (std / độ lệch chuẩn output khi huấn luyện, max theo output và
+    theo dòng điện của study), giải thêm n_new thiết kế bất định nhất và huấn luyện lại.
+    Dừng khi độ bất định lớn nhất < uncertainty_tolerance hoặc sau max_round vòng.
+    Thiết kế thêm có design_id 'a<hash tham số>' và được ghi chung bảng CSV của study.
+    outputs: None = average_torque, torque_peak_to_peak, flux_linkage_peak_k.
+    """
+    study = load_study_file(path)
+    names, design_list, n_phase = find_design_list(study)
+    writer = TableResultWriter(study["output_path"], find_study_columns(names, n_phase))
+    study_result = StudyOutput(path=study["output_path"], n_design=len(design_list))
+    solve_design_list(design_list, study, writer, study_result, n_workers=n_workers, debug=debug)
+
+    inputs = list(names)
+    currents = [np.zeros(n_phase) if current is None else np.ravel(current) for current in study["winding_currents"]]
+    if any(current is not None for current in study["winding_currents"]):
+        inputs += [f"winding_current_{phase + 1}" for phase in range(n_phase)]
+
+    result = Output(model=None, inputs=inputs)
+    for round_index in range(max_round + 1):
+        table = find_operating_point_table(load_result_table(study["output_path"]).rows, inputs)
+        model_outputs = outputs or [name for name in table.outputs if name != "torque_ripple"]
+        result.model = SurrogateModel(inputs, model_outputs, seed=seed).fit(table.rows)
+        if round_index == max_round:
+            break
+
+        candidates = create_sample_plan(study["parameters"], method="random", n_sample=n_candidate,
+                                        seed=seed + round_index + 1).samples
+        points = [dict(candidate, **{f"winding_current_{phase + 1}": float(value)
+                                     for phase, value in enumerate(current)})
+                  for candidate in candidates for current in currents]
+        uncertainty = result.model.find_relative_uncertainty(points).reshape(len(candidates), len(currents)).max(axis=1)
+        result.max_uncertainty.append(float(uncertainty.max()))
+        if debug:
+            print(f"[INFO] Surrogate round {round_index}: {len(table.rows)} operating points, "
+                  f"max relative uncertainty {uncertainty.max():.3g}")
+        if uncertainty.max() < uncertainty_tolerance:
+            result.converged = True
+            break
+
+        new_designs = []
+        for index in np.argsort(uncertainty)[::-1]:
+            design_id = find_design_id(candidates[index])
+            if design_id not in result.new_designs and design_id not in [design["design_id"] for design in new_designs]:
+                new_designs.append(create_design(design_id, candidates[index], study))
+            if len(new_designs) >= n_new:
+                break
+        result.new_designs.extend(design["design_id"] for design in new_designs)
+        solve_design_list(new_designs, study, writer, study_result, n_workers=n_workers, debug=debug)
+
+    return result
+
+def find_design_id(parameters):
+    # design_id theo nội dung tham số: chạy lại chọn cùng thiết kế thì dùng lại kết quả đã giải
+    content = json.dumps(parameters, sort_keys=True)
+    return "a" + hashlib.sha256(content.encode()).hexdigest()[:10]
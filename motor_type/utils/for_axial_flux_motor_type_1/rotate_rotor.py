@@ -1,14 +1,11 @@
 import numpy as np
+from motor_type.utils.for_axial_flux_motor_type_1.find_number_of_layer_rotated import find_number_of_layer_rotated
 
 def rotate_rotor(motor,n_step):
-    mesh_detail_parameter = motor.mesh.detail_parameter
-    n_z_in_air = mesh_detail_parameter[6]
-    n_z_rotor_yoke = mesh_detail_parameter[7]
-    n_z_magnet = mesh_detail_parameter[8]
-
-    number_of_layer_rotated = n_z_in_air + n_z_rotor_yoke + n_z_magnet - 3 
+    number_of_layer_rotated = find_number_of_layer_rotated(mesh=motor.mesh).number_of_layer_rotated
     z_indices_rotate = np.arange(number_of_layer_rotated)
     
     reluctance_network = motor.reluctance_network
     reluctance_network.rotate(z_indices = z_indices_rotate,
-                              n_step = n_step)
\ No newline at end of file
+                              n_step = n_step)
+    motor.rotor_offset = getattr(motor, "rotor_offset", 0) + n_step
@@ -0,0 +1,206 @@
+from dataclasses import dataclass, field
+from typing import List
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import os
+import json
+import hashlib
+from tqdm import tqdm
+from storage.models.KeyValueStore import KeyValueStore
+from storage.models.StreamingResultWriter import StreamingResultWriter
+from motor_type.utils.for_axial_flux_motor_type_1.solve_case import solve_case
+
+# Giá trị mặc định của các khóa trong case file (JSON)
+CASE_DEFAULTS = {"name": "case",
+                 "motor": {},                   # tham số AxialFluxMotorType1
+                 "mesh": {},                    # tham số create_adaptive_mesh
+                 "solver": {},                  # tham số solve_magnetic_equation
+                 "rotor_offsets": None,         # list bước theta tuyệt đối; None = dùng n_step_shift / n_position
+                 "n_step_shift": 5,
+                 "n_position": None,            # None = một vòng theta của lưới
+                 "winding_currents": [None],    # list dòng điện pha; None = không có dòng
+                 "network_path": None,          # motor đã dựng (cache); None = <name>/network
+                 "classification_path": None,   # phân loại phần tử theo khóa geometry (cache, tùy chọn)
+                 "output_path": None,           # StreamingResultWriter; None = <name>/results
+                 "solve_cache": None,           # thư mục SolveCache dùng chung giữa các job (tùy chọn)
+                 "solve_cache_max_bytes": 2 * 1024 ** 3}
+
+# Tham số motor không đổi hình dạng geometry / lưới (vật liệu, dây quấn)
+NON_GEOMETRIC_PARAMETERS = {"air", "magnet_type", "iron_type", "rotor_iron_type", "stator_iron_type",
+                            "phase", "turns", "throw", "parallel_path", "winding_layer",
+                            "winding_type", "winding_matrix"}
+
+@dataclass
+class Output:
+    path: str
+    network_path: str
+    network_rebuilt: bool = False
+    solved_cases: List[str] = field(default_factory=list)
+    skipped_cases: List[str] = field(default_factory=list)
+
+def load_case_file(path):
+    """
+    Đọc case file JSON và điền giá trị mặc định. Đường dẫn tương đối trong file
+    được tính theo thư mục chứa case file, mặc định là results/<name>/... cạnh nó.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        case = dict(CASE_DEFAULTS, **json.load(f))
+
+    unknown = set(case) - set(CASE_DEFAULTS)
+    if unknown:
+        raise ValueError(f"Unknown keys in case file '{path}': {sorted(unknown)}")
+
+    base_dir = os.path.dirname(os.path.abspath(path))
+    default_dir = os.path.join("results", case["name"])
+    case["network_path"] = case["network_path"] or os.path.join(default_dir, "network")
+    case["output_path"] = case["output_path"] or os.path.join(default_dir, "results")
+    for name in ("network_path", "output_path", "solve_cache", "classification_path"):
+        if case[name] is not None:
+            case[name] = os.path.join(base_dir, case[name])
+    return case
+
+def find_case_key(case):
+    """Khóa của motor + lưới: motor đã lưu chỉ được dùng lại khi khóa trùng"""
+    content = json.dumps({"motor": case["motor"], "mesh": case["mesh"]}, sort_keys=True)
+    return hashlib.sha256(content.encode()).hexdigest()
+
+def find_geometry_key(case):
+    """Khóa chỉ gồm tham số hình học + lưới: phân loại phần tử chỉ phụ thuộc vào khóa này"""
+    motor = {name: value for name, value in case["motor"].items() if name not in NON_GEOMETRIC_PARAMETERS}
+    content = json.dumps({"motor": motor, "mesh": case["mesh"]}, sort_keys=True)
+    return hashlib.sha256(content.encode()).hexdigest()
+
+def prepare_motor(case, rebuild=False, debug=True):
+    """
+    Load motor đã dựng tại network_path nếu cùng tham số motor / lưới,
+    nếu không thì dựng geometry, lưới, mạng từ trở và lưu lại cho các job sau.
+    Nếu có classification_path, phân loại phần tử (bước giao khối với geometry) được
+    lưu theo find_geometry_key: motor chỉ khác vật liệu / dây quấn dựng lại mạng từ
+    phân loại đã có.
+    Trả về (motor, rebuilt).
+    """
+    from motor_type.models.AxialFluxMotorType1 import AxialFluxMotorType1
+
+    store = KeyValueStore(case["network_path"])
+    key = find_case_key(case)
+    if not rebuild and store.load("case_key") == key:
+        if debug:
+            print(f"[INFO] Loading cached network from '{case['network_path']}'")
+        return AxialFluxMotorType1.load(case["network_path"]), False
+
+    if debug:
+        print("[INFO] Building motor geometry, mesh and reluctance network...")
+    motor = AxialFluxMotorType1(**case["motor"])
+    motor.create_geometry()
+    motor.create_adaptive_mesh(**case["mesh"])
+
+    classification_store = None
+    segment_ids = None
+    if case.get("classification_path") is not None:
+        classification_store = KeyValueStore(case["classification_path"])
+        geometry_key = find_geometry_key(case)
+        if not rebuild and classification_store.load("geometry_key") == geometry_key:
+            segment_ids = classification_store.load("segment_ids")
+            if debug:
+                print(f"[INFO] Reusing element classification from '{case['classification_path']}'")
+
+    motor.create_reluctance_network(segment_ids=segment_ids)
+    if classification_store is not None and segment_ids is None:
+        classification_store.delete("geometry_key")
+        classification_store.save("segment_ids", motor.reluctance_network.create_segment_ids())
+        classification_store.save("geometry_key", geometry_key)
+    motor.reluctance_network.update_reluctance_network(magnetic_potential=motor.reluctance_network.magnetic_potential)
+
+    store.delete("case_key")
+    motor.save(case["network_path"])
+    store.save("case_key", key)
+    return motor, True
+
+def find_case_list(case, motor):
+    """Danh sách (case_id, rotor_offset, winding_current) theo thứ tự giải"""
+    rotor_offsets = case["rotor_offsets"]
+    if rotor_offsets is None:
+        n_step_shift = int(case["n_step_shift"])
+        n_position = case["n_position"]
+        if n_position is None:
+            n_position = (motor.mesh.detail_parameter[5] - 1) // n_step_shift
+        rotor_offsets = [position * n_step_shift for position in range(int(n_position))]
+
+    case_list = []
+    for current_index, winding_current in enumerate(case["winding_currents"]):
+        for rotor_offset in rotor_offsets:
+            case_list.append((f"{int(rotor_offset)}:{current_index}", int(rotor_offset), winding_current))
+    return case_list
+
+# Motor riêng của mỗi process worker, load một lần trong initializer
+_worker_motor = None
+_worker_solver_parameter = None
+
+def _init_worker(network_path, solver_parameter, solve_cache, solve_cache_max_bytes):
+    global _worker_motor, _worker_solver_parameter
+    from motor_type.models.AxialFluxMotorType1 import AxialFluxMotorType1
+
+    _worker_motor = AxialFluxMotorType1.load(network_path, lazy=False)
+    _worker_solver_parameter = solver_parameter
+    if solve_cache is not None:
+        _worker_motor.reluctance_network.set_solve_cache(path=solve_cache, max_bytes=solve_cache_max_bytes)
+
+def _run_worker_case(task):
+    case_id, rotor_offset, winding_current = task
+    case_result = solve_case(_worker_motor,
+                             rotor_offset=rotor_offset,
+                             winding_current=winding_current,
+                             solver_parameter=_worker_solver_parameter)
+    return case_id, case_result
+
+def run_case_file(path,
+                  n_workers=1,
+                  rebuild=False,
+                  debug=True):
+    """
+    Chạy toàn bộ các case trong case file: dựng hoặc load motor, giải mọi cặp
+    (vị trí rotor, dòng điện) rồi ghi vào StreamingResultWriter tại output_path.
+    Case id là '<rotor_offset>:<chỉ số dòng điện>'. Chạy lại sẽ bỏ qua các case đã xong.
+    n_workers > 1: mỗi process load motor riêng từ network_path, process chính ghi kết quả.
+    """
+    case = load_case_file(path)
+    motor, rebuilt = prepare_motor(case, rebuild=rebuild, debug=debug)
+    result = Output(path=case["output_path"], network_path=case["network_path"], network_rebuilt=rebuilt)
+    solver_parameter = dict(case["solver"], debug=False)
+
+    with StreamingResultWriter(case["output_path"]) as writer:
+        tasks = []
+        for task in find_case_list(case, motor):
+            if writer.is_completed(task[0]):
+                result.skipped_cases.append(task[0])
+            else:
+                tasks.append(task)
+
+        progress = tqdm(total=len(tasks), desc=f"Case '{case['name']}'", disable=not debug)
+
+        def write_case(case_id, case_result):
+            info = dict(case_result.info, case_id=case_id)
+            writer.write(case_id, info=info, **case_result.arrays)
+            result.solved_cases.append(case_id)
+            progress.update(1)
+
+        if n_workers is None or n_workers <= 1 or len(tasks) <= 1:
+            if case["solve_cache"] is not None:
+                motor.reluctance_network.set_solve_cache(path=case["solve_cache"],
+                                                         max_bytes=case["solve_cache_max_bytes"])
+            for case_id, rotor_offset, winding_current in tasks:
+                write_case(case_id, solve_case(motor,
+                                               rotor_offset=rotor_offset,
+                                               winding_current=winding_current,
+                                               solver_parameter=solver_parameter))
+        else:
+            with ProcessPoolExecutor(max_workers=min(int(n_workers), len(tasks)),
+                                     initializer=_init_worker,
+                                     initargs=(case["network_path"], solver_parameter,
+                                               case["solve_cache"], case["solve_cache_max_bytes"])) as executor:
+                futures = [executor.submit(_run_worker_case, task) for task in tasks]
+                for future in as_completed(futures):
+                    write_case(*future.result())
+
+        progress.close()
+
+    return result
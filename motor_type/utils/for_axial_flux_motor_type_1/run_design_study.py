@@ -0,0 +1,156 @@
+from dataclasses import dataclass, field
+from typing import List
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import os
+import json
+import inspect
+from tqdm import tqdm
+from storage.models.TableResultWriter import TableResultWriter
+from motor_type.utils.for_axial_flux_motor_type_1.create_sample_plan import create_sample_plan
+from motor_type.utils.for_axial_flux_motor_type_1.run_case_file import find_case_key
+from motor_type.utils.for_axial_flux_motor_type_1.solve_design import solve_design
+
+# Giá trị mặc định của các khóa trong study file (JSON)
+STUDY_DEFAULTS = {"name": "study",
+                  "motor": {},                  # tham số AxialFluxMotorType1 cố định
+                  "parameters": {},             # tham số thay đổi, xem create_sample_plan
+                  "method": "latin_hypercube",
+                  "n_sample": 10,
+                  "n_level": 3,
+                  "seed": 0,
+                  "mesh": {},                   # tham số create_adaptive_mesh
+                  "solver": {},                 # tham số solve_magnetic_equation
+                  "rotor_offsets": [0],         # bước theta tuyệt đối
+                  "winding_currents": [None],   # list dòng điện pha; None = không có dòng
+                  "cache_path": None,           # mạng từ trở đã dựng theo khóa; None = <name>/networks
+                  "output_path": None,          # bảng CSV; None = <name>/results.csv
+                  "solve_cache": None,          # thư mục SolveCache dùng chung (tùy chọn)
+                  "solve_cache_max_bytes": 2 * 1024 ** 3}
+
+@dataclass
+class Output:
+    path: str
+    n_design: int = 0
+    solved_cases: List[str] = field(default_factory=list)
+    failed_cases: List[str] = field(default_factory=list)
+    skipped_cases: List[str] = field(default_factory=list)
+
+def load_study_file(path):
+    """
+    Đọc study file JSON và điền giá trị mặc định. Đường dẫn tương đối được tính
+    theo thư mục chứa study file, mặc định là results/<name>/... cạnh nó.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        study = dict(STUDY_DEFAULTS, **json.load(f))
+
+    unknown = set(study) - set(STUDY_DEFAULTS)
+    if unknown:
+        raise ValueError(f"Unknown keys in study file '{path}': {sorted(unknown)}")
+
+    base_dir = os.path.dirname(os.path.abspath(path))
+    default_dir = os.path.join("results", study["name"])
+    study["cache_path"] = study["cache_path"] or os.path.join(default_dir, "networks")
+    study["output_path"] = study["output_path"] or os.path.join(default_dir, "results.csv")
+    for name in ("cache_path", "output_path", "solve_cache"):
+        if study[name] is not None:
+            study[name] = os.path.join(base_dir, study[name])
+    return study
+
+def find_design_list(study):
+    """
+    Danh sách thiết kế theo kế hoạch mẫu. Với cùng study file (cùng seed) kế hoạch
+    không đổi, nên design_id / case_id ổn định giữa các lần chạy lại.
+    """
+    from motor_type.models.AxialFluxMotorType1 import AxialFluxMotorType1
+
+    motor_parameters = inspect.signature(AxialFluxMotorType1.__init__).parameters
+    unknown = (set(study["parameters"]) | set(study["motor"])) - set(motor_parameters)
+    if unknown:
+        raise ValueError(f"Unknown AxialFluxMotorType1 parameters: {sorted(unknown)}")
+
+    plan = create_sample_plan(study["parameters"],
+                              method=study["method"],
+                              n_sample=study["n_sample"],
+                              n_level=study["n_level"],
+                              seed=study["seed"])
+
+    design_list = [create_design(f"d{index:04d}", parameters, study) for index, parameters in enumerate(plan.samples)]
+
+    default_phase = motor_parameters["phase"].default
+    n_phase = max(int(design["parameters"].get("phase", study["motor"].get("phase", default_phase)))
+                  for design in design_list) if design_list else default_phase
+    return plan.names, design_list, n_phase
+
+def create_design(design_id, parameters, study):
+    """Thiết kế với mọi cặp (vị trí rotor, dòng điện) của study, case_id '<design_id>/<rotor_offset>:<chỉ số dòng>'"""
+    cases = []
+    for current_index, winding_current in enumerate(study["winding_currents"]):
+        for rotor_offset in study["rotor_offsets"]:
+            cases.append((f"{design_id}/{int(rotor_offset)}:{current_index}", int(rotor_offset),
+                          current_index, winding_current))
+    return {"design_id": design_id, "parameters": parameters, "cases": cases}
+
+def find_study_columns(names, n_phase):
+    # Cột của bảng kết quả: định danh, tham số thiết kế, đầu vào case, kết quả, thời gian
+    winding_current = [f"winding_current_{phase + 1}" for phase in range(n_phase)]
+    flux_linkage = [f"flux_linkage_{phase + 1}" for phase in range(n_phase)]
+    return (["case_id", "design_id", "status", "error"] + list(names)
+            + ["rotor_offset"] + winding_current
+            + ["torque"] + flux_linkage
+            + ["n_cells", "network_cached", "build_time", "solve_time"])
+
+def _run_design_group(group, study):
+    # Các thiết kế cùng khóa mạng chạy tuần tự trong một worker (dựng mạng một lần)
+    return [row for design in group for row in solve_design(design, study)]
+
+def run_design_study(path,
+                     n_workers=1,
+                     debug=True):
+    """
+    Chạy một design of experiments: lấy mẫu tham số AxialFluxMotorType1, với mỗi
+    thiết kế dựng geometry -> lưới -> mạng từ trở (cache theo khóa motor + lưới) rồi
+    giải mọi cặp (vị trí rotor, dòng điện), ghi mỗi case một dòng vào bảng CSV
+    output_path. Chạy lại sẽ bỏ qua các case đã có trong bảng.
+    n_workers > 1: các nhóm thiết kế chia cho process pool, process chính ghi bảng.
+    """
+    study = load_study_file(path)
+    names, design_list, n_phase = find_design_list(study)
+    writer = TableResultWriter(study["output_path"], find_study_columns(names, n_phase))
+    result = Output(path=study["output_path"], n_design=len(design_list))
+
+    solve_design_list(design_list, study, writer, result, n_workers=n_workers, debug=debug)
+    return result
+
+def solve_design_list(design_list, study, writer, result, n_workers=1, debug=True):
+    """
+    Giải các case chưa có trong bảng của design_list và ghi vào writer (TableResultWriter),
+    cập nhật solved_cases / failed_cases / skipped_cases của result.
+    """
+    groups = {}
+    for design in design_list:
+        remaining = [task for task in design["cases"] if not writer.is_completed(task[0])]
+        result.skipped_cases.extend(task[0] for task in design["cases"] if writer.is_completed(task[0]))
+        if remaining:
+            key = find_case_key({"motor": dict(study["motor"], **design["parameters"]), "mesh": study["mesh"]})
+            groups.setdefault(key, []).append(dict(design, cases=remaining))
+    groups = list(groups.values())
+
+    progress = tqdm(total=sum(len(design["cases"]) for group in groups for design in group),
+                    desc=f"Study '{study['name']}'", disable=not debug)
+
+    def write_rows(rows):
+        for row in rows:
+            writer.write(row)
+            (result.solved_cases if row["status"] == "ok" else result.failed_cases).append(row["case_id"])
+            progress.update(1)
+
+    if n_workers is None or n_workers <= 1 or len(groups) <= 1:
+        for group in groups:
+            write_rows(_run_design_group(group, study))
+    else:
+        with ProcessPoolExecutor(max_workers=min(int(n_workers), len(groups))) as executor:
+            futures = [executor.submit(_run_design_group, group, study) for group in groups]
+            for future in as_completed(futures):
+                write_rows(future.result())
+
+    progress.close()
@@ -0,0 +1,60 @@
+from dataclasses import dataclass, field
+from typing import List
+from tqdm import tqdm
+from storage.models.StreamingResultWriter import StreamingResultWriter
+from motor_type.utils.for_axial_flux_motor_type_1.find_case_result import find_case_result
+
+@dataclass
+class Output:
+    path: str
+    solved_cases: List[str] = field(default_factory=list)
+    skipped_cases: List[str] = field(default_factory=list)
+
+def run_rotor_sweep(motor,
+                    path,
+                    n_step_shift=5,
+                    n_position=None,
+                    winding_current=None,
+                    solver_parameter=None,
+                    debug=True):
+    """
+    Giải lần lượt các vị trí rotor, cách nhau n_step_shift bước theta.
+    Kết quả mỗi vị trí được ghi ngay vào file append-only tại path (luồng nền).
+    Chạy lại với cùng path sẽ bỏ qua các vị trí đã xong và tiếp tục từ vị trí
+    chưa xong đầu tiên. solve_magnetic_equation luôn bắt đầu từ thế bằng 0 nên
+    không khởi tạo từ nghiệm đã lưu, kết quả không phụ thuộc lần chạy bị dừng.
+    Case id là offset rotor tuyệt đối (motor.rotor_offset, tính theo bước theta).
+    """
+    if solver_parameter is None:
+        solver_parameter = {}
+    if n_position is None:
+        n_theta = motor.mesh.detail_parameter[5] - 1
+        n_position = n_theta // n_step_shift
+
+    reluctance_network = motor.reluctance_network
+    result = Output(path=path)
+
+    with StreamingResultWriter(path) as writer:
+        start_offset = getattr(motor, "rotor_offset", 0)
+
+        for position in tqdm(range(int(n_position)), desc="Rotor sweep", disable=not debug):
+            target_offset = start_offset + position * n_step_shift
+            case_id = str(target_offset)
+
+            if writer.is_completed(case_id):
+                result.skipped_cases.append(case_id)
+                continue
+
+            motor.rotate_rotor(n_step=target_offset - motor.rotor_offset)
+
+            if winding_current is not None:
+                reluctance_network.update_reluctance_network(magnetic_potential=reluctance_network.magnetic_potential,
+                                                             winding_current=winding_current)
+
+            reluctance_network.solve_magnetic_equation(**solver_parameter)
+
+            case_result = find_case_result(motor)
+            writer.write(case_id, info=case_result.info, **case_result.arrays)
+            result.solved_cases.append(case_id)
+
+    return result
@@ -0,0 +1,49 @@
+import inspect
+import os
+from storage.models.KeyValueStore import KeyValueStore
+from core_class.utils.save_geometry import save_geometry
+from core_class.utils.save_cylindrical_mesh import save_cylindrical_mesh
+from core_class.utils.save_reluctance_network import save_reluctance_network
+
+# Tham số vật liệu được khôi phục từ material_database thay vì truyền lại constructor
+MATERIAL_PARAMETERS = ["air", "magnet_type", "iron_type", "rotor_iron_type", "stator_iron_type"]
+# Thành phần lưu riêng, không nằm trong trạng thái (attributes) của motor
+COMPONENT_NAMES = ["geometry", "mesh", "reluctance_network", "material_database", "lazy_components"]
+
+def save_motor(motor, path):
+    """
+    Lưu motor thành các thành phần độc lập trong thư mục path:
+        parameters, attributes (metadata), material_database, geometry/, mesh/, reluctance_network/
+    attributes là toàn bộ trạng thái còn lại của motor, để load_motor dựng lại motor
+    mà không gọi constructor.
+    """
+    store = KeyValueStore(path)
+
+    parameter_names = [name for name in inspect.signature(type(motor).__init__).parameters
+                       if name != "self" and name not in MATERIAL_PARAMETERS]
+    parameters = {name: getattr(motor, name) for name in parameter_names if hasattr(motor, name)}
+    attributes = {name: value for name, value in vars(motor).items() if name not in COMPONENT_NAMES}
+
+    components = []
+    if motor.geometry is not None:
+        save_geometry(motor.geometry, os.path.join(path, "geometry"))
+        components.append("geometry")
+    if motor.mesh is not None:
+        save_cylindrical_mesh(motor.mesh, os.path.join(path, "mesh"))
+        components.append("mesh")
+    if motor.reluctance_network is not None:
+        save_reluctance_network(motor.reluctance_network,
+                                os.path.join(path, "reluctance_network"),
+                                include_geometry=False,
+                                include_mesh=motor.reluctance_network.mesh is not motor.mesh)
+        components.append("reluctance_network")
+
+    store.save("material_database", motor.material_database)
+    store.save("metadata", {"format": type(motor).__name__,
+                            "version": 1,
+                            "parameters": parameters,
+                            "attributes": attributes,
+                            "rotor_iron_type": motor.rotor_iron_type,
+                            "stator_iron_type": motor.stator_iron_type,
+                            "rotor_offset": motor.rotor_offset,
+                            "components": components})
@@ -0,0 +1,26 @@
+import numpy as np
+from motor_type.utils.for_axial_flux_motor_type_1.find_case_result import find_case_result
+
+def solve_case(motor,
+               rotor_offset=0,
+               winding_current=None,
+               solver_parameter=None):
+    """
+    Giải một case độc lập: quay rotor tới rotor_offset (bước theta tuyệt đối),
+    đặt dòng điện pha (None = không có dòng) rồi giải. Kết quả không phụ thuộc
+    vào case giải trước đó nên các case có thể chia cho nhiều worker.
+    Trả về find_case_result.Output.
+    """
+    reluctance_network = motor.reluctance_network
+    motor.rotate_rotor(n_step=int(rotor_offset) - getattr(motor, "rotor_offset", 0))
+
+    if winding_current is None:
+        winding_current = np.zeros(motor.phase)
+    reluctance_network.update_reluctance_network(magnetic_potential=reluctance_network.magnetic_potential,
+                                                 winding_current=np.asarray(winding_current, dtype=float))
+
+    reluctance_network.solve_magnetic_equation(**(solver_parameter or {}))
+
+    case_result = find_case_result(motor)
+    case_result.info["winding_current"] = [float(value) for value in winding_current]
+    return case_result
@@ -0,0 +1,67 @@
+import os
+import time
+import numpy as np
+from motor_type.utils.for_axial_flux_motor_type_1.run_case_file import prepare_motor, find_case_key, find_geometry_key
+from motor_type.utils.for_axial_flux_motor_type_1.solve_case import solve_case
+
+def solve_design(design, study, debug=False):
+    """
+    Dựng (hoặc load từ cache mạng) motor của một thiết kế rồi giải các case của nó.
+    design: {"design_id", "parameters": tham số thay đổi, "cases": [(case_id, rotor_offset,
+    chỉ số dòng điện, dòng điện pha), ...]}. Mạng từ trở được lưu tại <cache_path>/<khóa motor
+    + lưới>, thiết kế trùng khóa dùng lại không dựng lại. Phân loại phần tử được lưu tại
+    <cache_path>/classification/<khóa geometry + lưới>: thiết kế chỉ khác vật liệu / dây quấn
+    (loại thép, số vòng, nam châm) dựng lại mạng mà không phải giao lưới với geometry.
+    Lỗi khi dựng / giải không làm dừng cả study: dòng tương ứng có status 'failed'.
+    Trả về list dòng (dict) cho TableResultWriter.
+    """
+    case = {"motor": dict(study["motor"], **design["parameters"]),
+            "mesh": study["mesh"]}
+    case["network_path"] = os.path.join(study["cache_path"], find_case_key(case))
+    case["classification_path"] = os.path.join(study["cache_path"], "classification", find_geometry_key(case))
+
+    base_row = dict(design["parameters"], design_id=design["design_id"])
+    rows = []
+
+    start = time.perf_counter()
+    try:
+        motor, rebuilt = prepare_motor(case, debug=debug)
+    except Exception as error:
+        for case_id, rotor_offset, current_index, winding_current in design["cases"]:
+            rows.append(dict(base_row, case_id=case_id, status="failed", error=format_error(error),
+                             rotor_offset=rotor_offset, **find_phase_columns("winding_current", winding_current)))
+        return rows
+    build_time = time.perf_counter() - start
+
+    if study["solve_cache"] is not None:
+        motor.reluctance_network.set_solve_cache(path=study["solve_cache"], max_bytes=study["solve_cache_max_bytes"])
+
+    solver_parameter = dict(study["solver"], debug=False)
+    for case_id, rotor_offset, current_index, winding_current in design["cases"]:
+        row = dict(base_row, case_id=case_id, rotor_offset=rotor_offset,
+                   n_cells=int(np.prod(motor.reluctance_network.elements.shape)),
+                   network_cached=not rebuilt, build_time=build_time,
+                   **find_phase_columns("winding_current", winding_current))
+        start = time.perf_counter()
+        try:
+            case_result = solve_case(motor,
+                                     rotor_offset=rotor_offset,
+                                     winding_current=winding_current,
+                                     solver_parameter=solver_parameter)
+            row.update(status="ok",
+                       torque=case_result.info["torque"],
+                       **find_phase_columns("flux_linkage", case_result.arrays["flux_linkage"]))
+        except Exception as error:
+            row.update(status="failed", error=format_error(error))
+        row["solve_time"] = time.perf_counter() - start
+        rows.append(row)
+    return rows
+
+def find_phase_columns(name, values):
+    # Giá trị từng pha -> cột <name>_1, <name>_2, ...
+    if values is None:
+        return {}
+    return {f"{name}_{phase + 1}": float(value) for phase, value in enumerate(np.ravel(values))}
+
+def format_error(error):
+    return f"{type(error).__name__}: {error}"
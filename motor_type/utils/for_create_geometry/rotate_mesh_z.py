@@ -1,3 +1,4 @@
+import hashlib
 import numpy as np
 import trimesh
 import matplotlib.pyplot as plt
@@ -12,8 +13,24 @@ def rotate_mesh_z(mesh, angle_rad):
     mesh_returned = mesh.copy()
     matrix = trimesh.transformations.rotation_matrix(angle_rad, [0, 0, 1])
     mesh_returned.apply_transform(matrix)
+
+    # Ghi lại mesh gốc và phép biến đổi để Geometry.show dùng chung một polydata.
+    # Chỉ ghi vào mesh trả về: mesh chưa có template được nhận diện theo nội dung,
+    # nên các lần xoay cùng một mesh vẫn dùng chung template
+    template = mesh.metadata.get("render_template")
+    transform = mesh.metadata.get("render_transform", np.eye(4))
+    if template is None:
+        template = find_render_template(mesh)
+        transform = np.eye(4)
+    mesh_returned.metadata["render_template"] = template
+    mesh_returned.metadata["render_transform"] = matrix @ transform
     return mesh_returned
 
+def find_render_template(mesh):
+    content = hashlib.sha1(np.ascontiguousarray(mesh.vertices, dtype=np.float64).tobytes())
+    content.update(np.ascontiguousarray(mesh.faces, dtype=np.int64).tobytes())
+    return content.hexdigest()
+
 # --- 2. HÀM VẼ SO SÁNH ---
 def plot_comparison(mesh_before, mesh_after, title="Rotation Comparison"):
     fig = plt.figure(figsize=(10, 8))
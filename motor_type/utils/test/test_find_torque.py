@@ -0,0 +1,49 @@
+import sys
+import os
+from types import SimpleNamespace
+import numpy as np
+import paths
+
+MU0 = 4 * np.pi * 1e-7
+
+def test():
+    from motor_type.utils.for_axial_flux_motor_type_1.find_torque import find_torque
+
+    # Lớp z: gông rotor, nam châm, 2 lớp khe hở, stator
+    mesh = SimpleNamespace(r_nodes=np.array([0.02, 0.03, 0.05]),
+                           theta_nodes=np.linspace(0.0, np.pi / 4, 5),
+                           z_nodes=np.array([0.0, 5e-3, 9e-3, 9.25e-3, 9.5e-3, 15e-3]))
+    motor = SimpleNamespace(mesh=mesh, rotor_length=5e-3, magnet_length=4e-3, airgap=0.5e-3,
+                            reluctance_network=None)
+
+    B = np.full((2, 4, 5, 3), 7.0)
+    B[:, :, 2:4, 1] = [0.1, 0.3]
+    B[:, :, 2:4, 2] = 0.8
+    result = find_torque(motor, flux_density_field=B)
+
+    # T = n_sector / mu0 * sum(r * B_z * B_t * dS), cùng B trên mỗi lớp: sum(r dS) theo giải tích
+    r = mesh.r_nodes
+    moment = np.sum((r[:-1] + r[1:]) / 2 * (r[1:] ** 2 - r[:-1] ** 2) / 2) * (np.pi / 4)
+    expected = 8 / MU0 * moment * 0.8 * np.array([0.1, 0.3])
+    assert np.allclose(result.torque_layer, expected)
+    assert np.isclose(result.torque, np.mean(expected))
+
+    # Đổi chiều B_t đổi dấu mô-men
+    B[..., 1] *= -1
+    assert np.isclose(find_torque(motor, flux_density_field=B).torque, -np.mean(expected))
+
+    mesh.z_nodes = np.array([0.0, 5e-3, 9e-3, 15e-3])
+    try:
+        find_torque(motor, flux_density_field=B[:, :, :3])
+        assert False, "a mesh without airgap layers must be rejected"
+    except ValueError:
+        pass
+
+if __name__ == "__main__":
+    current_file = os.path.abspath(__file__)
+    root_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(current_file))))
+
+    if root_dir not in sys.path:
+        sys.path.append(root_dir)
+
+    test()
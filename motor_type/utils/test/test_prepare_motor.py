@@ -0,0 +1,69 @@
+import sys
+import os
+import tempfile
+import numpy as np
+import trimesh
+import paths
+
+MESH = dict(n_r_in=2, n_r_1=2, n_r_2=3, n_r_3=2, n_r_out=2, n_theta=13,
+            n_z_in_air=2, n_z_rotor_yoke=2, n_z_magnet=2, n_z_airgap=2,
+            n_z_tooth_tip_1=2, n_z_tooth_tip_2=2, n_z_tooth_body=3, n_z_stator_yoke=2, n_z_out_air=2)
+
+def create_case(root, name, **motor):
+    return {"motor": dict(magnet_length=4e-3, airgap=0.5e-3, **motor),
+            "mesh": MESH,
+            "network_path": os.path.join(root, name),
+            "classification_path": os.path.join(root, "classification")}
+
+def fail_intersection(*args, **kwargs):
+    raise AssertionError("classification must be reused")
+
+def check_same_elements(network, reference):
+    assert np.array_equal(network.material_ids, reference.material_ids)
+    for name in ("magnetic_source", "minimum_reluctance", "dimension_ratio", "segment_winding_vector"):
+        values = np.array([getattr(element, name) for element in network.elements.ravel(order='F')])
+        expected = np.array([getattr(element, name) for element in reference.elements.ravel(order='F')])
+        assert np.allclose(values, expected), name
+
+def test():
+    from motor_type.models.AxialFluxMotorType1 import AxialFluxMotorType1
+    from motor_type.utils.for_axial_flux_motor_type_1.run_case_file import prepare_motor, find_case_key, find_geometry_key
+
+    with tempfile.TemporaryDirectory() as root:
+        base = create_case(root, "base", turns=50)
+        more_turns = create_case(root, "more_turns", turns=80)
+        longer_airgap = create_case(root, "longer_airgap", turns=50)
+        longer_airgap["motor"]["airgap"] = 0.6e-3
+
+        # Số vòng dây không đổi geometry: cùng khóa geometry, khác khóa motor
+        assert find_case_key(base) != find_case_key(more_turns)
+        assert find_geometry_key(base) == find_geometry_key(more_turns)
+        assert find_geometry_key(base) != find_geometry_key(longer_airgap)
+
+        prepare_motor(base, debug=False)
+        classification = np.load(os.path.join(root, "classification", "segment_ids.npy"))
+        assert classification.min() == -1 and classification.max() >= 0
+
+        # Dựng từ phân loại đã lưu (không giao khối với geometry) phải giống dựng đầy đủ
+        intersection = trimesh.boolean.intersection
+        trimesh.boolean.intersection = fail_intersection
+        try:
+            motor, rebuilt = prepare_motor(more_turns, debug=False)
+        finally:
+            trimesh.boolean.intersection = intersection
+        assert rebuilt
+        reference = AxialFluxMotorType1(magnet_length=4e-3, airgap=0.5e-3, turns=80)
+        reference.create_geometry()
+        reference.create_adaptive_mesh(**MESH)
+        reference.create_reluctance_network()
+        check_same_elements(motor.reluctance_network, reference.reluctance_network)
+        assert np.array_equal(reference.reluctance_network.create_segment_ids(), classification)
+
+if __name__ == "__main__":
+    current_file = os.path.abspath(__file__)
+    root_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(current_file))))
+
+    if root_dir not in sys.path:
+        sys.path.append(root_dir)
+
+    test()
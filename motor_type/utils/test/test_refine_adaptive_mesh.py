@@ -0,0 +1,82 @@
+import sys
+import os
+from types import SimpleNamespace
+import numpy as np
+import paths
+
+MESH = dict(n_r_in=2, n_r_1=2, n_r_2=3, n_r_3=2, n_r_out=2, n_theta=13,
+            n_z_in_air=2, n_z_rotor_yoke=2, n_z_magnet=2, n_z_airgap=2,
+            n_z_tooth_tip_1=2, n_z_tooth_tip_2=2, n_z_tooth_body=3, n_z_stator_yoke=2, n_z_out_air=2)
+
+def check_convergence():
+    from motor_type.utils.for_axial_flux_motor_type_1.refine_adaptive_mesh import check_refinement_convergence
+
+    flux_linkage = [np.array([1e-2, -5e-3]), np.array([1.01e-2, -5e-3])]
+
+    # Mô-men thay đổi 0.5% < 2%: hội tụ; 5%: chưa
+    assert check_refinement_convergence([4.0, 4.02], flux_linkage).converged
+    check = check_refinement_convergence([4.0, 4.2], flux_linkage)
+    assert not check.converged and np.isclose(check.torque_error, 0.2)
+
+    # Từ thông móc vòng thay đổi 10%: chưa hội tụ dù mô-men không đổi
+    assert not check_refinement_convergence([4.0, 4.0], [flux_linkage[0], 1.1 * flux_linkage[0]]).converged
+
+    # Không có dòng điện: mô-men chỉ là nhiễu làm tròn, dưới ngưỡng tuyệt đối
+    assert check_refinement_convergence([0.0, 8.9e-16], flux_linkage).converged
+
+    # Mô-men qua 0 ở vị trí đang xét: so với 10% mô-men lớn nhất đã gặp
+    assert check_refinement_convergence([1.0, 0.02, 0.021], flux_linkage).converged
+    assert not check_refinement_convergence([1.0, 0.02, 0.05], flux_linkage).converged
+
+def check_theta_factor():
+    from motor_type.utils.for_axial_flux_motor_type_1.refine_adaptive_mesh import find_theta_factor
+
+    assert find_theta_factor(np.array([0.5, 0.9]), threshold=1.0) == 1
+    # Chỉ số ~ 1 / m^2: m nhỏ nhất đưa max xuống dưới ngưỡng, tối thiểu 2, tối đa 4
+    assert find_theta_factor(np.array([0.1, 1.0]), threshold=1.0) == 2
+    assert find_theta_factor(np.array([0.1, 5.0]), threshold=1.0) == 3
+    assert find_theta_factor(np.array([100.0]), threshold=1.0) == 4
+    assert find_theta_factor(np.array([100.0]), threshold=1.0, max_theta_factor=8) == 8
+
+def check_refined_mesh():
+    from motor_type.models.AxialFluxMotorType1 import AxialFluxMotorType1
+    from motor_type.utils.for_axial_flux_motor_type_1.refine_adaptive_mesh import create_refined_mesh
+
+    motor = AxialFluxMotorType1(magnet_length=4e-3, airgap=0.5e-3)
+    motor.create_geometry()
+    mesh = motor.create_adaptive_mesh(**MESH)
+    n_r, n_t, n_z = len(mesh.r_nodes), len(mesh.theta_nodes), len(mesh.z_nodes)
+
+    # Một đường nút r chiếm gần hết sai số: chia đôi hai ô kề nó, theta / z giữ nguyên
+    indicator = SimpleNamespace(indicator_r=np.where(np.arange(n_r - 2) == 1, 1.0, 1e-6),
+                                indicator_t=np.full(n_t - 1, 1e-6),
+                                indicator_z=np.full(n_z - 2, 1e-6))
+    refined = create_refined_mesh(motor, indicator)
+    assert len(refined.r_nodes) == n_r + 2
+    assert np.all(np.isin(mesh.r_nodes, refined.r_nodes))
+    assert np.array_equal(refined.theta_nodes, mesh.theta_nodes)
+    assert np.array_equal(refined.z_nodes, mesh.z_nodes)
+
+    # Sai số trải đều r / z (ngưỡng Dörfler = 1), một đường theta gấp 6 lần ngưỡng:
+    # chia đều theta thành 3, giữ các nút cũ
+    indicator = SimpleNamespace(indicator_r=np.ones(n_r - 2),
+                                indicator_t=np.where(np.arange(n_t - 1) == 4, 6.0, 1e-6),
+                                indicator_z=np.ones(n_z - 2))
+    refined = create_refined_mesh(motor, indicator)
+    assert len(refined.theta_nodes) == 3 * (n_t - 1) + 1
+    assert np.allclose(np.diff(refined.theta_nodes), np.diff(mesh.theta_nodes)[0] / 3)
+    assert refined.detail_parameter[5] == len(refined.theta_nodes)
+
+def test():
+    check_convergence()
+    check_theta_factor()
+    check_refined_mesh()
+
+if __name__ == "__main__":
+    current_file = os.path.abspath(__file__)
+    root_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(current_file))))
+
+    if root_dir not in sys.path:
+        sys.path.append(root_dir)
+
+    test()
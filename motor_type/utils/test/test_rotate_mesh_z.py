@@ -0,0 +1,35 @@
+import sys
+import os
+import numpy as np
+import trimesh
+import paths
+
+def test():
+    from motor_type.utils.for_create_geometry.rotate_mesh_z import rotate_mesh_z
+
+    mesh = trimesh.creation.box(extents=(1.0, 2.0, 3.0))
+    metadata = dict(mesh.metadata)
+    first = rotate_mesh_z(mesh, np.pi / 6)
+    second = rotate_mesh_z(mesh, np.pi / 3)
+
+    # Mesh đầu vào không bị sửa, các bản xoay của cùng một mesh dùng chung template
+    assert mesh.metadata == metadata
+    assert first.metadata["render_template"] == second.metadata["render_template"]
+    for rotated in (first, second):
+        vertices = trimesh.transform_points(mesh.vertices, rotated.metadata["render_transform"])
+        assert np.allclose(vertices, rotated.vertices)
+
+    # Xoay tiếp một bản đã xoay: vẫn template cũ, biến đổi được cộng dồn
+    third = rotate_mesh_z(first, np.pi / 6)
+    assert third.metadata["render_template"] == first.metadata["render_template"]
+    assert np.allclose(third.metadata["render_transform"], second.metadata["render_transform"])
+    assert rotate_mesh_z(trimesh.creation.box(extents=(1.0, 2.0, 4.0)), 0.0).metadata["render_template"] != first.metadata["render_template"]
+
+if __name__ == "__main__":
+    current_file = os.path.abspath(__file__)
+    root_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(current_file))))
+
+    if root_dir not in sys.path:
+        sys.path.append(root_dir)
+
+    test()
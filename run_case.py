@@ -0,0 +1,26 @@
+import argparse
+from motor_type.utils.for_axial_flux_motor_type_1.run_case_file import run_case_file
+
+def main(argv=None):
+    """
+    Chạy một case file không cần sửa code, ví dụ:
+        python run_case.py scenarios/case_example.json --workers 4
+    """
+    parser = argparse.ArgumentParser(description="Batch solve / rotor sweep of an axial flux motor from a JSON case file.")
+    parser.add_argument("case_file", help="JSON case file (motor, mesh, solver, rotor_offsets, winding_currents, ...)")
+    parser.add_argument("-j", "--workers", type=int, default=1, help="number of worker processes (default: 1)")
+    parser.add_argument("--rebuild", action="store_true", help="rebuild the network even if a cached one matches")
+    parser.add_argument("-q", "--quiet", action="store_true", help="no progress output")
+    args = parser.parse_args(argv)
+
+    result = run_case_file(path=args.case_file,
+                           n_workers=args.workers,
+                           rebuild=args.rebuild,
+                           debug=not args.quiet)
+
+    print(f"Solved {len(result.solved_cases)} case(s), skipped {len(result.skipped_cases)} completed case(s). "
+          f"Results: {result.path}")
+    return result
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+import argparse
+from motor_type.utils.for_axial_flux_motor_type_1.run_design_study import run_design_study
+from motor_type.utils.for_axial_flux_motor_type_1.refine_surrogate import refine_surrogate
+
+def main(argv=None):
+    """
+    Chạy một design of experiments từ study file, ví dụ:
+        python run_design_study.py scenarios/design_study_example.json --workers 4
+    Với --surrogate: huấn luyện SurrogateModel từ bảng kết quả, giải thêm thiết kế ở vùng
+    bất định cao (refine_surrogate) rồi lưu model vào thư mục đã cho.
+    """
+    parser = argparse.ArgumentParser(description="Design of experiments over axial flux motor parameters from a JSON study file.")
+    parser.add_argument("study_file", help="JSON study file (motor, parameters, method, mesh, solver, ...)")
+    parser.add_argument("-j", "--workers", type=int, default=1, help="number of worker processes (default: 1)")
+    parser.add_argument("-q", "--quiet", action="store_true", help="no progress output")
+    parser.add_argument("--surrogate", default=None, help="train a surrogate model and save it to this directory")
+    parser.add_argument("--refine-rounds", type=int, default=3, help="surrogate refinement rounds (default: 3)")
+    parser.add_argument("--n-new", type=int, default=4, help="new designs solved per refinement round (default: 4)")
+    args = parser.parse_args(argv)
+
+    if args.surrogate is not None:
+        result = refine_surrogate(path=args.study_file,
+                                  n_new=args.n_new,
+                                  max_round=args.refine_rounds,
+                                  n_workers=args.workers,
+                                  debug=not args.quiet)
+        result.model.save(args.surrogate)
+        print(f"Surrogate of {result.model.outputs} on {result.inputs}: {len(result.new_designs)} refinement design(s), "
+              f"converged: {result.converged}. Model: {args.surrogate}")
+        return result
+
+    result = run_design_study(path=args.study_file,
+                              n_workers=args.workers,
+                              debug=not args.quiet)
+
+    print(f"{result.n_design} design(s): solved {len(result.solved_cases)} case(s), "
+          f"failed {len(result.failed_cases)}, skipped {len(result.skipped_cases)} completed case(s). "
+          f"Results: {result.path}")
+    return result
+
+if __name__ == "__main__":
+    main()
@@ -2,7 +2,6 @@ import paths
 from system.core import libraries_require
 from motor_type.models.AxialFluxMotorType1 import AxialFluxMotorType1
 from storage.core import workspace 
-from tqdm import tqdm
 
 re_create_motor = False
 re_solve = True
@@ -11,7 +10,7 @@ if re_create_motor == False:
     print("loading aft")
     aft = workspace.load("aft1")
     print("load aft successfully")
-    aft.reluctance_network.list_elements_lite = None
+    aft.reluctance_network.solution_history = None
 else:
     aft = AxialFluxMotorType1(magnet_length=4.0 * 1e-3,
                               airgap=0.5 * 1e-3)
@@ -21,13 +20,11 @@ else:
     aft.reluctance_network.update_reluctance_network(magnetic_potential=aft.reluctance_network.magnetic_potential)
 
 if re_solve == True:
-    n_theta = aft.mesh.detail_parameter[5] - 1 
     n_step_shift = 5
-    n_step_solve = n_theta // n_step_shift
 
-    for i in tqdm(range(int(n_step_solve)), desc="Solving & Rotating"):
-        aft.reluctance_network.solve_magnetic_equation()
-        aft.rotate_rotor(n_step=n_step_shift)
+    # Kết quả từng vị trí được ghi ngay; chạy lại sẽ tiếp tục từ vị trí chưa xong
+    aft.run_rotor_sweep(path="results/test1_sweep",
+                        n_step_shift=n_step_shift)
 
     workspace.save(aft1=aft)
 else:
@@ -0,0 +1,34 @@
+from dataclasses import dataclass
+from typing import Any
+from solver.models.ReluctanceStencilOperator import ReluctanceStencilOperator
+from solver.utils.find_face_conductance import find_face_conductance
+from solver.utils.create_stencil_source import create_stencil_source
+
+@dataclass
+class Output:
+    G: Any      # ReluctanceStencilOperator
+    J: Any
+    Ja: Any
+
+def create_magnetic_potential_operator(reluctance_network,
+                                       first_time=False,
+                                       load_factor=1.0):
+    """
+    Cùng phương trình G P = J như create_magnetic_potential_equation nhưng G là
+    LinearOperator matrix-free, J được tính bằng phép toán mảng trên các mặt.
+    Dùng với solver lặp (solve_linear_equation) khi ma trận thưa quá lớn.
+    """
+    if first_time:
+        reluctance_network.set_reluctance_at_zero()
+        reluctance_network.magnetic_potential.data *= 0
+        reluctance_network.update_reluctance_network(magnetic_potential=reluctance_network.magnetic_potential)
+
+    shape = reluctance_network.elements.shape
+    face = find_face_conductance(reluctance_network, load_factor=load_factor)
+
+    J = create_stencil_source(face.source_flux, shape, periodic_boundary=face.periodic_boundary).source
+
+    G = ReluctanceStencilOperator(conductance=face.conductance,
+                                  shape=shape,
+                                  periodic_boundary=face.periodic_boundary)
+    return Output(G=G, J=J.ravel(order='F')[:-1], Ja=None)
@@ -0,0 +1,119 @@
+from dataclasses import dataclass, field
+from typing import Any, List
+import numpy as np
+from core_class.utils.save_reluctance_network import stack_element_field
+from solver.core.solve_linear_equation import solve_linear_equation, find_linear_solver_ordering
+from solver.utils.create_stencil_matrix import create_stencil_matrix
+from solver.utils.find_face_conductance import find_face_conductance, find_link_pair
+from solver.utils.find_link_flux import (find_link_flux, find_link_potential_difference,
+                                        scatter_link_value, spread_link_difference)
+
+@dataclass
+class Output:
+    value: float
+    link_flux: List[np.ndarray] = field(default_factory=list)
+    incremental_conductance: List[np.ndarray] = field(default_factory=list)    # d phi / d(P_a - P_b) trên từng liên kết
+    adjoint: np.ndarray = None                          # lambda (nr, nt, nz): G_inc lambda = dQ/dP
+    # Đạo hàm của Q theo tham số nhánh của từng ô, (nr, nt, nz, 2, 3) như element.reluctance
+    reluctance_gradient: np.ndarray = None              # cộng thêm vào từ trở nhánh (quy luật mu_r(B) giữ nguyên)
+    vacuum_reluctance_gradient: np.ndarray = None       # theo element.vacuum_reluctance
+    section_area_gradient: np.ndarray = None            # theo element.section_area (qua B = phi / A trong mu_r)
+    magnetic_source_gradient: np.ndarray = None         # theo element.magnetic_source
+    objective: Any = None                               # kết quả của objective tại nghiệm hiện tại
+    relative_residual: float = None                     # ||D^T phi|| / ||D^T phi_nguồn||, residual KCL của nghiệm
+
+def find_adjoint_sensitivity(reluctance_network,
+                             objective,
+                             frozen_permeability=False,
+                             ordering="nested_dissection"):
+    """
+    Độ nhạy của đại lượng Q (mô-men, từ thông móc vòng, ...) theo tham số nhánh của
+    mọi ô tại nghiệm phi tuyến đã hội tụ, bằng một lần giải hệ liên hợp.
+    objective(link_flux) trả về đối tượng có value và flux_gradient (dQ / d phi trên
+    từng liên kết, quy ước find_link_flux), vd. find_torque_gradient, find_flux_linkage_gradient.
+
+    Trên mỗi liên kết phi * (R_a + R_b) = (P_a - P_b) + (F_a + F_b), với R = R_vac / mu_r(phi / A)
+    của từng nhánh. Vi phân:
+        d phi = c_inc * (d(P_a - P_b) + dF - phi * dR),  c_inc = 1 / (r + phi * dr/dphi)
+    nên với G_inc = D^T c_inc D (ma trận tiếp tuyến) và G_inc lambda = D^T (c_inc dQ/dphi):
+        dQ/dF = (dQ/dphi - D lambda) * c_inc,   dQ/dR = -dQ/dF * phi
+    cho cả hai nhánh của liên kết. frozen_permeability=True: bỏ dmu_r/dB (c_inc = c).
+    Dùng element.d_relative_permeability_d_B như lookup_BH_curve_uniform trả về: với |B| ngoài
+    bảng B-H (mu_r bị kẹp) độ dốc vẫn khác 0 nên độ nhạy ở vùng đó chỉ là gần đúng.
+    Tuyến tính hóa chỉ đúng khi nghiệm thỏa KCL và từ trở tự nhất quán với từ thông, tức là
+    đã giải bằng solve_magnetic_equation(method='newton') tới residual nhỏ. Các phương pháp
+    lặp khác có thể dừng ở residual lớn khi thép bão hòa; xem relative_residual.
+    """
+    magnetic_potential = reluctance_network.magnetic_potential
+    potential = np.asarray(magnetic_potential.data, dtype=float)
+    shape = potential.shape
+    periodic_boundary = bool(magnetic_potential.periodic_boundary)
+
+    elements = reluctance_network.elements
+    element_list = [elements[index] for index in np.ndindex(shape)]
+    reluctance = stack_element_field(element_list, "reluctance", shape)
+    section_area = stack_element_field(element_list, "section_area", shape)
+    relative_permeability = np.nan_to_num(stack_element_field(element_list, "relative_permeability", shape), nan=1.0)
+    d_relative_permeability = np.zeros(shape + (2, 3))
+    if not frozen_permeability:
+        d_relative_permeability = np.nan_to_num(stack_element_field(element_list, "d_relative_permeability_d_B", shape))
+
+    # dR/dphi của từng nhánh: R = R_vac / mu_r(phi / A)
+    d_reluctance = -reluctance * d_relative_permeability / (relative_permeability * section_area)
+
+    face = find_face_conductance(reluctance_network)
+    link = find_link_flux(potential, face.conductance, face.source_flux, periodic_boundary)
+    objective_result = objective(link.flux)
+
+    result = Output(value=objective_result.value,
+                    link_flux=link.flux,
+                    reluctance_gradient=np.zeros(shape + (2, 3)),
+                    vacuum_reluctance_gradient=np.zeros(shape + (2, 3)),
+                    section_area_gradient=np.zeros(shape + (2, 3)),
+                    magnetic_source_gradient=np.zeros(shape + (2, 3)),
+                    objective=objective_result)
+
+    net_flux = np.zeros(shape)
+    source = np.zeros(shape)
+    for axis in range(3):
+        net_flux += spread_link_difference(link.flux[axis], axis, shape, periodic_boundary)
+        source += spread_link_difference(face.source_flux[axis], axis, shape, periodic_boundary)
+    result.relative_residual = float(np.linalg.norm(net_flux.ravel(order='F')[:-1])
+                                     / (np.linalg.norm(source.ravel(order='F')[:-1]) + 1e-12))
+
+    # dQ/dP = D^T (c_inc dQ/dphi), bỏ ô tham chiếu
+    potential_gradient = np.zeros(shape)
+    for axis in range(3):
+        lower, upper = find_link_pair(d_reluctance, axis, periodic_boundary)
+        incremental_conductance = 1.0 / (1.0 / face.conductance[axis] + link.flux[axis] * (lower + upper))
+        result.incremental_conductance.append(incremental_conductance)
+        potential_gradient += spread_link_difference(incremental_conductance * objective_result.flux_gradient[axis],
+                                                     axis, shape, periodic_boundary)
+
+    G = create_stencil_matrix(result.incremental_conductance, shape, periodic_boundary).matrix[:-1, :-1]
+    permutation = find_linear_solver_ordering(reluctance_network, ordering=ordering)
+    adjoint = solve_linear_equation(G, potential_gradient.ravel(order='F')[:-1], permutation)
+    result.adjoint = np.append(adjoint, 0.0).reshape(shape, order='F')
+
+    for axis in range(3):
+        source_gradient = ((objective_result.flux_gradient[axis]
+                            - find_link_potential_difference(result.adjoint, axis, periodic_boundary))
+                           * result.incremental_conductance[axis])
+        reluctance_gradient = -source_gradient * link.flux[axis]
+        flux = link.flux[axis]
+
+        # Nhánh [1, axis] của ô dưới và [0, axis] của ô trên của mỗi liên kết
+        for side, cells in ((1, "lower"), (0, "upper")):
+            result.magnetic_source_gradient[..., side, axis] = scatter_link_value(source_gradient, axis, shape,
+                                                                                  periodic_boundary, cells)
+            result.reluctance_gradient[..., side, axis] = scatter_link_value(reluctance_gradient, axis, shape,
+                                                                             periodic_boundary, cells)
+            cell_flux = scatter_link_value(flux, axis, shape, periodic_boundary, cells)
+            branch = (..., side, axis)
+            # R = R_vac / mu_r: dR/dR_vac = 1 / mu_r, dR/dA = -dR/dphi * phi / A (R_vac giữ nguyên)
+            result.vacuum_reluctance_gradient[branch] = (result.reluctance_gradient[branch]
+                                                         / relative_permeability[branch])
+            result.section_area_gradient[branch] = (-result.reluctance_gradient[branch] * d_reluctance[branch]
+                                                    * cell_flux / section_area[branch])
+
+    return result
@@ -0,0 +1,80 @@
+import numpy as np
+import scipy.sparse as sp
+from scipy.sparse.linalg import splu, spsolve, cg, LinearOperator
+from solver.utils.find_fill_reducing_ordering import find_fill_reducing_ordering
+from solver.models.GeometricMultigrid import GeometricMultigrid
+
+# Các cách đánh số ẩn cho phân rã LU
+ORDERINGS = ["nested_dissection", "colamd"]
+
+# Tiền điều kiện của conjugate gradient khi G là matrix-free
+PRECONDITIONERS = ["multigrid", "jacobi"]
+
+# Sai số tương đối và số vòng lặp tối đa (theo số ẩn) của solver lặp cho G matrix-free
+ITERATIVE_RELATIVE_TOLERANCE = 1e-10
+ITERATIVE_MAX_ITERATION_FACTOR = 10
+
+def find_linear_solver_ordering(reluctance_network, ordering="nested_dissection"):
+    """
+    Hoán vị giảm fill-in cho ma trận G của mạng, tính một lần cho mỗi lưới và
+    lưu trên mesh (lưới mới sau refine sẽ tự tính lại). None nếu ordering='colamd'.
+    """
+    if ordering == "colamd" or ordering is None:
+        return None
+    if ordering not in ORDERINGS:
+        raise ValueError(f"Unknown ordering '{ordering}', expected one of {ORDERINGS}")
+
+    magnetic_potential = reluctance_network.magnetic_potential
+    key = (ordering, magnetic_potential.data.shape, bool(magnetic_potential.periodic_boundary))
+
+    mesh = reluctance_network.mesh
+    cache = getattr(mesh, "linear_solver_ordering", None)
+    if cache is None:
+        cache = {}
+        mesh.linear_solver_ordering = cache
+    if key not in cache:
+        cache[key] = find_fill_reducing_ordering(shape=magnetic_potential.data.shape,
+                                                 periodic_boundary=magnetic_potential.periodic_boundary).permutation
+    return cache[key]
+
+def solve_linear_equation(G, b, permutation=None, preconditioner="multigrid"):
+    """
+    Giải G x = b.
+    - G là LinearOperator (matrix-free): conjugate gradient, tiền điều kiện là một
+      chu trình W của GeometricMultigrid ('multigrid') hoặc đường chéo ('jacobi').
+    - permutation=None: spsolve (SuperLU tự đánh số theo COLAMD).
+    - permutation: phân rã LU của ma trận đã hoán vị đối xứng P G P^T, giữ nguyên
+      thứ tự đã cho (G đối xứng, chéo trội nên không cần pivot).
+    """
+    if isinstance(G, LinearOperator):
+        return solve_iterative_equation(G, b, preconditioner=preconditioner)
+
+    if permutation is None:
+        return spsolve(G, b)
+
+    G_permuted = sp.csr_matrix(G)[permutation][:, permutation].tocsc()
+    lu = splu(G_permuted,
+              permc_spec="NATURAL",
+              diag_pivot_thresh=0.0,
+              options={"SymmetricMode": True})
+
+    x = np.empty_like(np.asarray(b, dtype=float))
+    x[permutation] = lu.solve(np.asarray(b, dtype=float)[permutation])
+    return x
+
+def find_preconditioner(G, preconditioner="multigrid"):
+    if preconditioner not in PRECONDITIONERS:
+        raise ValueError(f"Unknown preconditioner '{preconditioner}', expected one of {PRECONDITIONERS}")
+    if preconditioner == "multigrid":
+        return GeometricMultigrid.from_operator(G).aslinearoperator()
+    inverse_diagonal = 1.0 / G.diagonal()
+    return LinearOperator(G.shape, matvec=lambda x: inverse_diagonal * x, dtype=float)
+
+def solve_iterative_equation(G, b, preconditioner="multigrid"):
+    x, info = cg(G, b,
+                 rtol=ITERATIVE_RELATIVE_TOLERANCE,
+                 maxiter=ITERATIVE_MAX_ITERATION_FACTOR * G.shape[0],
+                 M=find_preconditioner(G, preconditioner))
+    if info > 0:
+        print(f"[WARNING] Conjugate gradient did not converge in {info} iterations.")
+    return x
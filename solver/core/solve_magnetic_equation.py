@@ -1,15 +1,24 @@
+import time
 import numpy as np
-import matplotlib.pyplot as plt
 import scipy.sparse as sp
-from scipy.sparse.linalg import spsolve
+from solver.core.create_magnetic_potential_operator import create_magnetic_potential_operator
+from solver.core.solve_linear_equation import solve_linear_equation, find_linear_solver_ordering
 from dataclasses import dataclass
-from typing import Any, List
+from typing import Any, Callable, List, Optional
+from solver.models.SolverStatistics import SolverStatistics, IterationStatistics
+
+# Ngưỡng thay đổi tương đối của mu_r để tính một ô thép là "đã thay đổi"
+PERMEABILITY_CHANGE_TOLERANCE = 1e-3
 
 @dataclass
 class SolverResult:
     potential: np.ndarray
     residual_history: List[float]
     figure: Any
+    statistics: Optional[SolverStatistics] = None
+
+def find_iron_permeability(iron_elements):
+    return np.array([element.relative_permeability for element in iron_elements], dtype=float)
 
 def solve_magnetic_equation(reluctance_network, 
                             method="conjugate_gradient",
@@ -17,18 +26,79 @@ def solve_magnetic_equation(reluctance_network,
                             max_relative_residual=1e-4, 
                             adaptive_damping_factor=(1.0, 0.1),
                             load_step=5, 
-                            debug=True):
+                            debug=True,
+                            callback: Optional[Callable[[IterationStatistics], None]] = None,
+                            ordering="nested_dissection",
+                            matrix_free=False,
+                            preconditioner="multigrid"):
+    """
+    callback: gọi sau mỗi vòng lặp với IterationStatistics của vòng đó.
+    ordering: đánh số ẩn khi phân rã LU, 'nested_dissection' (hoán vị theo lưới,
+    tính một lần cho mỗi lưới) hoặc 'colamd' (mặc định của spsolve).
+    matrix_free: G là LinearOperator tính từ độ dẫn mặt, giải bằng conjugate
+    gradient thay vì phân rã LU (không dựng ma trận thưa, ordering bị bỏ qua).
+    preconditioner: tiền điều kiện của conjugate gradient khi matrix_free,
+    'multigrid' (GeometricMultigrid trên lưới (nr, nt, nz)) hoặc 'jacobi'.
+    Thời gian và bộ đếm của cả lần giải nằm ở SolverResult.statistics.
+    method='newton': solve_magnetic_equation_newton (từ thông liên kết tự nhất quán với
+    đường cong B-H, ma trận tiếp tuyến), adaptive_damping_factor / matrix_free bị bỏ qua.
+    Các phương pháp còn lại cập nhật mu_r theo từ thông tính với từ trở của vòng trước,
+    khi thép bão hòa sâu có thể dừng ở residual lớn (xem residual_history).
+    Thay đổi hành vi: update_reluctance_network tính từ thông của mọi phần tử với cùng bộ
+    từ trở cũ rồi tra mu_r một lần cho cả mạng (trước đây cập nhật lần lượt từng phần tử,
+    phần tử sau thấy từ trở mới của phần tử trước). Residual_history của các phương pháp
+    này giống trước cho tới vùng bão hòa sâu, ở đó chúng chạm ngưỡng phân kỳ sớm hơn vài
+    vòng lặp; kết quả của method='newton' không đổi.
+    """
+    if method == "newton":
+        # Import muộn: solve_magnetic_equation_newton dùng SolverResult của module này
+        from solver.core.solve_magnetic_equation_newton import solve_magnetic_equation_newton
+        return solve_magnetic_equation_newton(reluctance_network,
+                                              max_iteration=max_iteration[0] if isinstance(max_iteration, tuple) else max_iteration,
+                                              max_relative_residual=max_relative_residual,
+                                              load_step=load_step,
+                                              debug=debug,
+                                              callback=callback,
+                                              ordering=ordering)
+
+    solve_start = time.perf_counter()
+    statistics = SolverStatistics(method=method)
 
     # Reset reluctance network 
     reluctance_network.magnetic_potential.data *= 0 
     reluctance_network.update_reluctance_network(magnetic_potential=reluctance_network.magnetic_potential)
 
+    iron_elements = [element for element in reluctance_network.elements.flat
+                     if element is not None and element.material == "iron"]
+    iron_permeability = find_iron_permeability(iron_elements)
+    permutation = None if matrix_free else find_linear_solver_ordering(reluctance_network, ordering=ordering)
+    statistics.setup_time = time.perf_counter() - solve_start
+
+    def finish_iteration(iteration_statistics, iteration_start):
+        iteration_statistics.bookkeeping_time = max(0.0, time.perf_counter() - iteration_start
+                                                    - iteration_statistics.assembly_time
+                                                    - iteration_statistics.linear_solve_time
+                                                    - iteration_statistics.update_time)
+        statistics.add_iteration(iteration_statistics)
+        if callback is not None:
+            callback(iteration_statistics)
+
     if isinstance(max_iteration, tuple):
         max_iteration = max_iteration[0]
 
     magnetic_potential_shape = reluctance_network.magnetic_potential.data.shape
+
+    def take_step(potential, direction, damping):
+        # fixed_point_iteration: direction cùng shape với thế từ, còn lại là vector ẩn (bỏ nút cuối = 0)
+        if method == "fixed_point_iteration":
+            return potential + damping * direction
+        active_update = potential.flatten(order='F')[:-1] + damping * direction
+        return np.append(active_update, 0.0).reshape(magnetic_potential_shape, order='F')
+
     current_magnetic_potential = reluctance_network.magnetic_potential.data.copy()
     checkpoint_potential = None
+    checkpoint_direction = None
+    checkpoint_reluctance = []
     
     load_factors = np.linspace(0, 1, load_step + 1)[1:]
     residual_history = []
@@ -47,6 +117,9 @@ def solve_magnetic_equation(reluctance_network,
         prev_z = None
         prev_res = None
         divergence_count = 0
+        # Residual đầu bước tải mới luôn lớn hơn residual cuối bước trước (J đã tăng),
+        # nên chỉ so sánh phân kỳ với các residual của bước tải hiện tại
+        load_step_start = len(residual_history)
         
         for j in range(max_iteration):
             if j == 0 and i > 0:
@@ -56,29 +129,51 @@ def solve_magnetic_equation(reluctance_network,
                 current_damping = adaptive_damping_factor[0]
             elif j == 1:
                 current_damping = adaptive_damping_factor[1]
-            
-            comp = reluctance_network.create_magnetic_potential_equation(
-                first_time=(i == 0 and j == 0),
-                load_factor=current_load,
-                debug=False
-            )
+
+            iteration_start = time.perf_counter()
+            iteration_statistics = IterationStatistics(load_step=i,
+                                                       iteration=j,
+                                                       residual=np.nan,
+                                                       damping=current_damping,
+                                                       accepted=True)
+
+            if matrix_free:
+                comp = create_magnetic_potential_operator(reluctance_network,
+                                                          first_time=(i == 0 and j == 0),
+                                                          load_factor=current_load)
+            else:
+                comp = reluctance_network.create_magnetic_potential_equation(
+                    first_time=(i == 0 and j == 0),
+                    load_factor=current_load,
+                    debug=False
+                )
+            iteration_statistics.assembly_time = time.perf_counter() - iteration_start
             
             G, J = comp.G, comp.J
             P_active = current_magnetic_potential.flatten(order='F')[:-1]
 
             if method == "fixed_point_iteration":
-                p_sol = spsolve(G, J)
+                t = time.perf_counter()
+                p_sol = solve_linear_equation(G, J, permutation, preconditioner)
+                iteration_statistics.linear_solve_time += time.perf_counter() - t
+                iteration_statistics.n_factorization += int(not matrix_free)
                 p_full = np.append(p_sol, 0.0).reshape(magnetic_potential_shape, order='F')
                 res_val = np.linalg.norm(p_full - current_magnetic_potential) / (np.linalg.norm(p_full) + 1e-12)
                 direction = p_full - current_magnetic_potential
             elif method in ["direct_optimization", "steepest_descent", "preconditioned_steepest_descent"]:
                 res = J - G.dot(P_active)
                 res_val = np.linalg.norm(res) / (np.linalg.norm(J) + 1e-12)
-                direction = spsolve(G, res)
+                t = time.perf_counter()
+                direction = solve_linear_equation(G, res, permutation, preconditioner)
+                iteration_statistics.linear_solve_time += time.perf_counter() - t
+                iteration_statistics.n_factorization += int(not matrix_free)
             elif method == "conjugate_gradient":
                 res = J - G.dot(P_active)
                 res_val = np.linalg.norm(res) / (np.linalg.norm(J) + 1e-12)
-                z = spsolve(G, res)
+                t = time.perf_counter()
+                z = solve_linear_equation(G, res, permutation, preconditioner)
+                iteration_statistics.linear_solve_time += time.perf_counter() - t
+                iteration_statistics.n_factorization += int(not matrix_free)
                 
                 if prev_direction is None:
                     direction = z
@@ -87,20 +182,30 @@ def solve_magnetic_equation(reluctance_network,
                     beta = max(0, beta)
                     direction = z + beta * prev_direction
 
-            if len(residual_history) > 0 and res_val > residual_history[-1]:
-                if divergence_count == 0:
-                    checkpoint_potential = current_magnetic_potential.copy()
-                
+            iteration_statistics.residual = float(res_val)
+
+            if len(residual_history) > load_step_start and res_val > residual_history[-1]:
+                # Bước vừa đi làm residual tăng: quay lại điểm đã chấp nhận gần nhất
+                # và đi lại hướng cũ với hệ số tắt dần giảm một nửa
+                iteration_statistics.accepted = False
                 divergence_count += 1
                 current_damping *= 0.5
                 prev_direction = None
-                
+
+                # Từ trở thép cập nhật từ từ trở cũ, nên khôi phục cả từ trở của điểm đã chấp nhận
+                for element, reluctance in zip(iron_elements, checkpoint_reluctance):
+                    element.reluctance = reluctance.copy()
                 if divergence_count >= 3:
                     current_magnetic_potential = checkpoint_potential.copy()
-                    reluctance_network.magnetic_potential.data = current_magnetic_potential
-                    reluctance_network.update_reluctance_network(magnetic_potential=reluctance_network.magnetic_potential)
+                else:
+                    current_magnetic_potential = take_step(checkpoint_potential, checkpoint_direction, current_damping)
+                reluctance_network.magnetic_potential.data = current_magnetic_potential
+                t = time.perf_counter()
+                reluctance_network.update_reluctance_network(magnetic_potential=reluctance_network.magnetic_potential)
+                iteration_statistics.update_time += time.perf_counter() - t
+                finish_iteration(iteration_statistics, iteration_start)
+                if divergence_count >= 3:
                     break
-                
                 continue
             else:
                 divergence_count = 0
@@ -112,41 +217,59 @@ def solve_magnetic_equation(reluctance_network,
                 prev_res = res.copy()
                 prev_direction = direction
 
-            if method == "fixed_point_iteration":
-                next_p = current_magnetic_potential + current_damping * direction
-            else:
-                p_delta = direction if method != "conjugate_gradient" else direction
-                active_update = P_active + current_damping * p_delta
-                next_p = np.append(active_update, 0.0).reshape(magnetic_potential_shape, order='F')
+            checkpoint_potential = current_magnetic_potential.copy()
+            checkpoint_reluctance = [element.reluctance.copy() for element in iron_elements]
+            checkpoint_direction = direction
+            next_p = take_step(current_magnetic_potential, direction, current_damping)
 
             current_magnetic_potential = next_p
             reluctance_network.magnetic_potential.data = current_magnetic_potential
+            t = time.perf_counter()
             reluctance_network.update_reluctance_network(magnetic_potential=reluctance_network.magnetic_potential)
+            iteration_statistics.update_time += time.perf_counter() - t
+
+            new_iron_permeability = find_iron_permeability(iron_elements)
+            if len(iron_elements) > 0:
+                changed = np.abs(new_iron_permeability - iron_permeability) > PERMEABILITY_CHANGE_TOLERANCE * np.abs(iron_permeability)
+                iteration_statistics.n_permeability_changed = int(np.count_nonzero(changed.reshape(len(iron_elements), -1).any(axis=1)))
+            iron_permeability = new_iron_permeability
+            finish_iteration(iteration_statistics, iteration_start)
 
             if res_val < max_relative_residual:
                 break
 
-    fig, ax = plt.subplots(figsize=(10, 6))
+    finalize_start = time.perf_counter()
+    fig = None
     if len(residual_history) > 2:
         residual_history[0] = 2 * residual_history[1] - residual_history[2]
 
     if debug: 
-        ax.plot(residual_history, label=f"Method: {method}", marker='o', markersize=3)
-        for idx in load_step_indices:
-            ax.axvline(x=idx, color='r', linestyle='--', alpha=0.5)
-        ax.set_yscale('log')
-        ax.set_xlabel("Total Cumulative Iterations")
-        ax.set_ylabel("Relative Residual (Log scale)")
-        ax.set_title(f"Convergence History: {method}")
-        ax.grid(True, which="both", alpha=0.3)
-        ax.legend()
-        plt.show()
-        pass
-    else:
-        plt.close(fig)
-
-    reluctance_network.add_elements_lite()
+        fig = plot_residual_history(residual_history, load_step_indices, method)
+
+    reluctance_network.add_solution_history()
+
+    statistics.finalize_time = time.perf_counter() - finalize_start
+    statistics.total_time = time.perf_counter() - solve_start
+    if debug:
+        print(statistics.summary())
 
     return SolverResult(potential=current_magnetic_potential, 
                         residual_history=residual_history, 
-                        figure=fig)
\ No newline at end of file
+                        figure=fig,
+                        statistics=statistics)
+
+def plot_residual_history(residual_history, load_step_indices, method):
+    # matplotlib chỉ import khi vẽ, worker không màn hình không cần
+    import matplotlib.pyplot as plt
+    fig, ax = plt.subplots(figsize=(10, 6))
+    ax.plot(residual_history, label=f"Method: {method}", marker='o', markersize=3)
+    for idx in load_step_indices:
+        ax.axvline(x=idx, color='r', linestyle='--', alpha=0.5)
+    ax.set_yscale('log')
+    ax.set_xlabel("Total Cumulative Iterations")
+    ax.set_ylabel("Relative Residual (Log scale)")
+    ax.set_title(f"Convergence History: {method}")
+    ax.grid(True, which="both", alpha=0.3)
+    ax.legend()
+    plt.show()
+    return fig
@@ -0,0 +1,50 @@
+import numpy as np
+from solver.core.solve_magnetic_equation import solve_magnetic_equation, SolverResult
+from core_class.utils.find_solve_key import find_solve_key
+from core_class.utils.find_flux_density_field import find_flux_density_field
+from core_class.utils.save_reluctance_network import stack_element_field
+
+# Trạng thái phần tử sau khi giải, khôi phục trực tiếp khi trúng cache
+STATE_FIELDS = ["flux_direct",
+                "flux_density_direct",
+                "flux_density_average",
+                "relative_permeability",
+                "d_relative_permeability_d_B",
+                "reluctance",
+                "own_magnetic_potential"]
+
+def solve_magnetic_equation_cached(reluctance_network, solve_cache, **solver_parameter):
+    """
+    Giải qua cache: nếu đầu vào (find_solve_key) đã từng được giải thì lấy thế từ
+    và trạng thái phần tử đã lưu, không lặp lại solver.
+    solve_magnetic_equation luôn bắt đầu từ thế bằng 0 nên nghiệm chỉ phụ thuộc đầu vào.
+    """
+    key = find_solve_key(reluctance_network, solver_parameter=solver_parameter).key
+    entry = solve_cache.load(key)
+    elements = reluctance_network.elements
+    element_list = [elements[index] for index in np.ndindex(elements.shape)]
+
+    if entry is not None:
+        reluctance_network.magnetic_potential.data = np.asfortranarray(entry["potential"])
+        for name in STATE_FIELDS:
+            values = entry.get(name)
+            for element, value in zip(element_list, values if values is not None else []):
+                setattr(element, name, value.item() if value.ndim == 0 else value.copy())
+        reluctance_network.add_solution_history()
+        return SolverResult(potential=reluctance_network.magnetic_potential.data,
+                            residual_history=list(entry["residual_history"]),
+                            figure=None)
+
+    result = solve_magnetic_equation(reluctance_network=reluctance_network, **solver_parameter)
+
+    state = {}
+    for name in STATE_FIELDS:
+        values = stack_element_field(element_list, name, (len(element_list),))
+        if values is not None:
+            state[name] = values
+    solve_cache.save(key,
+                     potential=result.potential,
+                     residual_history=np.asarray(result.residual_history, dtype=float),
+                     flux_density_field=find_flux_density_field(reluctance_network).flux_density_field,
+                     **state)
+    return result
@@ -0,0 +1,132 @@
+import time
+import numpy as np
+from core_class.utils.save_reluctance_network import stack_element_field
+from solver.core.solve_linear_equation import solve_linear_equation, find_linear_solver_ordering
+from solver.core.solve_magnetic_equation import SolverResult, PERMEABILITY_CHANGE_TOLERANCE, plot_residual_history
+from solver.models.SolverStatistics import SolverStatistics, IterationStatistics
+from solver.utils.create_stencil_matrix import create_stencil_matrix
+from solver.utils.find_consistent_link_flux import find_consistent_link_flux
+from solver.utils.find_link_flux import spread_link_difference
+
+# Bước line search nhỏ nhất trước khi chấp nhận bước Newton dù residual không giảm
+MINIMUM_STEP = 1.0 / 1024
+
+def solve_magnetic_equation_newton(reluctance_network,
+                                   max_iteration=50,
+                                   max_relative_residual=1e-4,
+                                   load_step=1,
+                                   debug=True,
+                                   callback=None,
+                                   ordering="nested_dissection"):
+    """
+    Newton cho phương trình KCL D^T phi(P) = 0, với phi(P) từ thông liên kết tự nhất quán
+    với đường cong B-H (find_consistent_link_flux). Ma trận Jacobi là G_inc = D^T c_inc D,
+    cùng ma trận tiếp tuyến với find_adjoint_sensitivity, nên đạo hàm liên hợp khớp với sai
+    phân của nghiệm phi tuyến. Line search chia đôi bước đến khi residual giảm.
+    Residual tương đối ||D^T phi|| / ||D^T phi_nguồn|| bằng ||J - G P|| / ||J|| của các
+    phương pháp khác tại trạng thái tự nhất quán.
+    Kết thúc: ghi từ trở / mu_r tự nhất quán vào các phần tử rồi update_reluctance_network.
+    """
+    solve_start = time.perf_counter()
+    statistics = SolverStatistics(method="newton")
+
+    reluctance_network.magnetic_potential.data *= 0
+    reluctance_network.update_reluctance_network(magnetic_potential=reluctance_network.magnetic_potential)
+
+    elements = reluctance_network.elements
+    shape = elements.shape
+    element_list = [elements[index] for index in np.ndindex(shape)]
+    periodic_boundary = bool(reluctance_network.magnetic_potential.periodic_boundary)
+    branch_data = dict(vacuum_reluctance=stack_element_field(element_list, "vacuum_reluctance", shape),
+                       minimum_reluctance=stack_element_field(element_list, "minimum_reluctance", shape),
+                       section_area=stack_element_field(element_list, "section_area", shape),
+                       magnetic_source=stack_element_field(element_list, "magnetic_source", shape),
+                       material_id=stack_element_field(element_list, "material_id", shape).astype(int),
+                       material_database=element_list[0].material_database,
+                       periodic_boundary=periodic_boundary)
+    permutation = find_linear_solver_ordering(reluctance_network, ordering=ordering)
+    statistics.setup_time = time.perf_counter() - solve_start
+
+    def find_state(potential, load_factor):
+        link = find_consistent_link_flux(potential, load_factor=load_factor, **branch_data)
+        source = sum(spread_link_difference(link.source_flux[axis], axis, shape, periodic_boundary)
+                     for axis in range(3))
+        residual = link.net_flux.ravel(order='F')[:-1]
+        return link, residual, np.linalg.norm(residual) / (np.linalg.norm(source.ravel(order='F')[:-1]) + 1e-12)
+
+    potential = np.zeros(shape)
+    residual_history = []
+    load_step_indices = []
+
+    for i, load_factor in enumerate(np.linspace(0, 1, load_step + 1)[1:]):
+        if i > 0:
+            load_step_indices.append(len(residual_history))
+        link, residual, res_val = find_state(potential, load_factor)
+
+        for j in range(max_iteration):
+            residual_history.append(res_val)
+            if res_val < max_relative_residual:
+                break
+
+            iteration_start = time.perf_counter()
+            iteration_statistics = IterationStatistics(load_step=i,
+                                                       iteration=j,
+                                                       residual=float(res_val),
+                                                       damping=1.0,
+                                                       accepted=True)
+
+            t = time.perf_counter()
+            G = create_stencil_matrix(link.incremental_conductance, shape, periodic_boundary).matrix[:-1, :-1]
+            iteration_statistics.assembly_time = time.perf_counter() - t
+
+            t = time.perf_counter()
+            direction = solve_linear_equation(G, -residual, permutation)
+            iteration_statistics.linear_solve_time = time.perf_counter() - t
+            iteration_statistics.n_factorization = 1
+
+            t = time.perf_counter()
+            active_potential = potential.ravel(order='F')[:-1]
+            step = 1.0
+            while True:
+                next_potential = np.append(active_potential + step * direction, 0.0).reshape(shape, order='F')
+                next_link, next_residual, next_res_val = find_state(next_potential, load_factor)
+                if next_res_val < (1 - 1e-4 * step) * res_val or step <= MINIMUM_STEP:
+                    break
+                step *= 0.5
+            iteration_statistics.update_time = time.perf_counter() - t
+            iteration_statistics.damping = step
+            iteration_statistics.accepted = bool(next_res_val < res_val)
+
+            changed = np.abs(next_link.relative_permeability - link.relative_permeability) > PERMEABILITY_CHANGE_TOLERANCE * link.relative_permeability
+            iteration_statistics.n_permeability_changed = int(np.count_nonzero(changed.reshape(-1, 6).any(axis=1)))
+            potential, link, residual, res_val = next_potential, next_link, next_residual, next_res_val
+
+            iteration_statistics.bookkeeping_time = max(0.0, time.perf_counter() - iteration_start
+                                                        - iteration_statistics.assembly_time
+                                                        - iteration_statistics.linear_solve_time
+                                                        - iteration_statistics.update_time)
+            statistics.add_iteration(iteration_statistics)
+            if callback is not None:
+                callback(iteration_statistics)
+
+    finalize_start = time.perf_counter()
+    # Trạng thái tự nhất quán: flux_direct tính lại từ các từ trở này cho đúng phi của liên kết
+    for index, element in zip(np.ndindex(shape), element_list):
+        element.reluctance = link.reluctance[index].copy()
+        element.relative_permeability = link.relative_permeability[index].copy()
+        element.d_relative_permeability_d_B = link.d_relative_permeability_d_B[index].copy()
+    reluctance_network.magnetic_potential.data = np.asfortranarray(potential)
+    reluctance_network.update_reluctance_network(magnetic_potential=reluctance_network.magnetic_potential)
+
+    fig = plot_residual_history(residual_history, load_step_indices, "newton") if debug else None
+    reluctance_network.add_solution_history()
+
+    statistics.finalize_time = time.perf_counter() - finalize_start
+    statistics.total_time = time.perf_counter() - solve_start
+    if debug:
+        print(statistics.summary())
+
+    return SolverResult(potential=reluctance_network.magnetic_potential.data,
+                        residual_history=residual_history,
+                        figure=fig,
+                        statistics=statistics)
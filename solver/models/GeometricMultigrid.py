@@ -0,0 +1,156 @@
+import numpy as np
+from scipy.sparse.linalg import LinearOperator, splu
+from solver.models.ReluctanceStencilOperator import ReluctanceStencilOperator
+from solver.utils.create_coarse_level import create_coarse_level
+
+# Dừng gộp khi lưới thô có không quá số ô này (giải trực tiếp bằng LU)
+COARSEST_SIZE = 400
+MAX_LEVEL = 12
+# Chỉ gộp theo hướng có độ dẫn đặc trưng >= tỉ lệ này so với hướng mạnh nhất
+STRONG_COUPLING_RATIO = 0.5
+# Không gộp qua một mặt (r hoặc z) có độ dẫn < tỉ lệ này so với mặt kề bên cùng hướng
+WEAK_LINK_RATIO = 0.1
+JACOBI_WEIGHT = 0.8
+N_SMOOTH = 2
+# Số lần ghé mức thô trong một chu trình: 1 = chu trình V, 2 = chu trình W
+N_COARSE_VISIT = 2
+
+class MultigridLevel:
+    def __init__(self, operator):
+        self.operator = operator                    # ReluctanceStencilOperator của mức này
+        self.inverse_diagonal = 1.0 / operator.diagonal()
+        self.cell_map = None                        # ô mịn -> ô thô của mức kế tiếp (None ở mức thô nhất)
+        self.n_coarse_cell = 0
+        self.coarsen_axes = ()
+
+class GeometricMultigrid:
+    """
+    Tiền điều kiện multigrid hình học cho G của mạng từ trở trên lưới tích
+    (nr, nt, nz): mỗi mức thô gộp từng cặp ô liền kề theo các hướng có liên kết
+    mạnh (semi-coarsening, hướng liên kết yếu được giữ nguyên tới khi các hướng
+    mạnh đã thô đi), độ dẫn mặt thô là tổng độ dẫn song song qua mặt gộp
+    (create_coarse_level, = P^T G P), theta tuần hoàn. Theo r và z, cặp ô không được gộp
+    qua một mặt yếu hơn hẳn các mặt kề bên (find_blocked_links, vd. khe hở hoặc một lớp
+    không khí mỏng giữa hai lớp sắt), lớp đó đứng riêng ở mọi mức. Chu trình W với làm trơn
+    Jacobi có trọng số, mức thô nhất giải bằng LU. Đối xứng xác định dương nên
+    dùng được làm M cho conjugate gradient.
+
+    Nội suy hằng trên từng cặp ô làm mức thô "cứng" hơn G thật, nên chu trình V
+    không độc lập với lưới (CG, rtol 1e-10, mạng động cơ 0.7k / 12k / 51k ô:
+    26 / 48 / 77 vòng, ở 51k ô chậm bằng Jacobi). Chu trình W với 2 lần làm trơn
+    giảm còn 17 / 34 / 44 vòng (51k ô: 1.3 s so với 2.3 s của Jacobi); số vòng
+    vẫn tăng chậm theo số ô, nhanh hơn khi độ từ thẩm tương phản mạnh (lưới thử
+    8k / 64k / 216k ô: 16 / 20 / 21 vòng khi đồng nhất, 26 / 32 / 44 vòng khi sắt
+    mu_r = 1000 xen không khí).
+    """
+
+    def __init__(self, conductance, shape, periodic_boundary=True,
+                 coarsest_size=COARSEST_SIZE,
+                 max_level=MAX_LEVEL,
+                 n_smooth=N_SMOOTH,
+                 n_coarse_visit=N_COARSE_VISIT):
+        self.periodic_boundary = periodic_boundary
+        self.n_smooth = n_smooth
+        self.n_coarse_visit = n_coarse_visit
+        self.levels = []
+
+        shape = tuple(int(n) for n in shape)
+        while True:
+            operator = ReluctanceStencilOperator(conductance=conductance,
+                                                 shape=shape,
+                                                 periodic_boundary=periodic_boundary)
+            level = MultigridLevel(operator)
+            self.levels.append(level)
+
+            coarsen_axes = self.find_coarsen_axes(conductance, shape)
+            if np.prod(shape) <= coarsest_size or len(self.levels) >= max_level or not coarsen_axes:
+                break
+
+            coarse = create_coarse_level(conductance, shape, coarsen_axes,
+                                         periodic_boundary=periodic_boundary,
+                                         blocked_links=self.find_blocked_links(conductance, coarsen_axes))
+            if tuple(coarse.shape) == tuple(shape):
+                break
+            level.cell_map = coarse.cell_map
+            level.n_coarse_cell = int(np.prod(coarse.shape))
+            level.coarsen_axes = coarsen_axes
+            conductance, shape = coarse.conductance, coarse.shape
+
+        self.coarsest_lu = splu(self.levels[-1].operator.to_sparse())
+
+    @classmethod
+    def from_operator(cls, operator, **kwargs):
+        return cls(conductance=operator.conductance,
+                   shape=operator.grid_shape,
+                   periodic_boundary=operator.periodic_boundary,
+                   **kwargs)
+
+    def find_coarsen_axes(self, conductance, shape):
+        """Các hướng được gộp ở mức tiếp theo: đủ ô để gộp và liên kết đủ mạnh"""
+        strength = [float(np.median(c)) if c.size > 0 else 0.0 for c in conductance]
+        strongest = max(strength)
+        axes = []
+        for axis, n in enumerate(shape):
+            # Theta tuần hoàn cần ít nhất 2 ô thô để liên kết vòng còn nghĩa
+            minimum = 4 if axis == 1 and self.periodic_boundary else 2
+            if n >= minimum and strength[axis] >= STRONG_COUPLING_RATIO * strongest:
+                axes.append(axis)
+        return tuple(axes)
+
+    def find_blocked_links(self, conductance, coarsen_axes):
+        """
+        Các mặt không được gộp qua, theo từng hướng không tuần hoàn trong coarsen_axes:
+        độ dẫn đặc trưng (trung vị trên mặt phẳng) < WEAK_LINK_RATIO * mặt kề bên mạnh hơn.
+        """
+        blocked_links = {}
+        for axis in coarsen_axes:
+            c = conductance[axis]
+            if (axis == 1 and self.periodic_boundary) or c.shape[axis] < 2:
+                continue
+            other_axes = tuple(other for other in range(3) if other != axis)
+            strength = np.median(c, axis=other_axes)
+            neighbour = np.maximum(np.append(strength[1:], 0.0), np.insert(strength[:-1], 0, 0.0))
+            blocked_links[axis] = strength < WEAK_LINK_RATIO * neighbour
+        return blocked_links
+
+    @property
+    def shape(self):
+        return self.levels[0].operator.shape
+
+    @property
+    def n_level(self):
+        return len(self.levels)
+
+    def restrict(self, level, r):
+        # Tổng phần dư của các ô mịn trong mỗi ô thô (ô tham chiếu có phần dư 0)
+        coarse = np.bincount(level.cell_map, weights=np.append(r, 0.0), minlength=level.n_coarse_cell)
+        return coarse[:-1]
+
+    def prolong(self, level, x_coarse):
+        # Hiệu chỉnh hằng trên mỗi ô thô
+        return np.append(x_coarse, 0.0)[level.cell_map][:-1]
+
+    def smooth(self, level, x, b):
+        for _ in range(self.n_smooth):
+            x = x + JACOBI_WEIGHT * level.inverse_diagonal * (b - level.operator.matvec(x))
+        return x
+
+    def cycle(self, b, index=0):
+        level = self.levels[index]
+        if index == len(self.levels) - 1:
+            return self.coarsest_lu.solve(b)
+
+        x = self.smooth(level, np.zeros_like(b), b)
+        # Mức kế tiếp là mức thô nhất (giải đúng): ghé thêm lần nữa không đổi gì
+        n_visit = 1 if index == len(self.levels) - 2 else self.n_coarse_visit
+        for _ in range(n_visit):
+            r = b - level.operator.matvec(x)
+            x = x + self.prolong(level, self.cycle(self.restrict(level, r), index + 1))
+        return self.smooth(level, x, b)
+
+    def solve(self, b):
+        """Một chu trình (W mặc định) cho G x = b"""
+        return self.cycle(np.asarray(b, dtype=float).ravel())
+
+    def aslinearoperator(self):
+        return LinearOperator(self.shape, matvec=self.solve, dtype=float)
@@ -0,0 +1,75 @@
+import numpy as np
+from scipy.sparse.linalg import LinearOperator
+from solver.utils.create_stencil_matrix import create_stencil_matrix
+
+class ReluctanceStencilOperator(LinearOperator):
+    """
+    Ma trận G của mạng từ trở dạng matrix-free: mỗi ô chỉ nối với 6 ô lân cận
+    trên lưới logic (nr, nt, nz) nên G x được tính trực tiếp từ các mảng độ dẫn
+    mặt (find_face_conductance) bằng phép dịch mảng, không dựng ma trận thưa.
+    Ẩn theo thứ tự F, bỏ ô cuối cùng (điểm tham chiếu thế = 0), như
+    create_magnetic_potential_equation.
+    """
+
+    def __init__(self, conductance, shape, periodic_boundary=True):
+        self.grid_shape = tuple(shape)
+        self.conductance = conductance
+        self.periodic_boundary = periodic_boundary
+        n_unknown = int(np.prod(self.grid_shape)) - 1
+        super().__init__(dtype=np.float64, shape=(n_unknown, n_unknown))
+        self.diagonal_data = self._find_diagonal()
+
+    def _is_periodic(self, axis):
+        return axis == 1 and self.periodic_boundary
+
+    def _lower_upper(self, axis):
+        # Lát cắt (ô dưới, ô trên) của các liên kết không tuần hoàn theo axis
+        lower = [slice(None)] * 3
+        upper = [slice(None)] * 3
+        lower[axis] = slice(0, self.grid_shape[axis] - 1)
+        upper[axis] = slice(1, None)
+        return tuple(lower), tuple(upper)
+
+    def _find_diagonal(self):
+        diagonal = np.zeros(self.grid_shape)
+        for axis, conductance in enumerate(self.conductance):
+            if self._is_periodic(axis):
+                diagonal += conductance + np.roll(conductance, 1, axis=axis)
+            else:
+                lower, upper = self._lower_upper(axis)
+                diagonal[lower] += conductance
+                diagonal[upper] += conductance
+        return diagonal.ravel(order='F')[:-1]
+
+    def diagonal(self):
+        return self.diagonal_data
+
+    def _matvec(self, x):
+        x = np.asarray(x, dtype=float).ravel()
+        potential = np.append(x, 0.0).reshape(self.grid_shape, order='F')
+        y = np.zeros(self.grid_shape)
+
+        for axis, conductance in enumerate(self.conductance):
+            if self._is_periodic(axis):
+                # flux[j] chảy từ ô j+1 sang ô j (tuần hoàn)
+                flux = conductance * (potential - np.roll(potential, -1, axis=axis))
+                y += flux - np.roll(flux, 1, axis=axis)
+            else:
+                lower, upper = self._lower_upper(axis)
+                flux = conductance * (potential[lower] - potential[upper])
+                y[lower] += flux
+                y[upper] -= flux
+
+        return y.ravel(order='F')[:-1]
+
+    def to_sparse(self):
+        """Ma trận thưa (csc) tương ứng, dùng cho lưới nhỏ (vd. mức thô nhất của multigrid)"""
+        G = create_stencil_matrix(self.conductance, self.grid_shape, self.periodic_boundary).matrix
+        return G[:-1, :-1]
+
+    def _rmatvec(self, x):
+        # G đối xứng
+        return self._matvec(x)
+
+    def _adjoint(self):
+        return self
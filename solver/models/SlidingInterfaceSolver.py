@@ -0,0 +1,225 @@
+import numpy as np
+from scipy.linalg import lu_factor, lu_solve
+from scipy.sparse.linalg import splu, cg, LinearOperator
+from solver.core.solve_linear_equation import ITERATIVE_RELATIVE_TOLERANCE, ITERATIVE_MAX_ITERATION_FACTOR
+from solver.utils.create_stencil_matrix import create_stencil_matrix
+from solver.utils.create_stencil_source import create_stencil_source
+from solver.utils.find_sliding_interface import find_sliding_interface
+
+# Số ẩn mặt trượt (nr * nt) lớn nhất cho cách dựng đặc: hai bù Schur n x n, hệ mặt trượt
+# 2n x 2n và ma trận trung gian G_ii^-1 G_ig (số ẩn trong x n) đều là mảng đặc, tại n = 2000
+# riêng ba ma trận đầu đã ~ 200 MB
+MAX_DENSE_INTERFACE = 2000
+
+class SlidingInterfaceSolver:
+    """
+    Giải G P = J theo phân rã miền rotor / stator quanh mặt trượt z (find_sliding_interface).
+    Khi rotor quay, mạng bên trong mỗi miền không đổi (rotor chỉ dịch theo theta),
+    chỉ các liên kết qua mặt trượt thay đổi. Vì vậy:
+    - phần trong của rotor (trừ lớp sát mặt trượt) và của stator (trừ lớp sát mặt
+      trượt và ô tham chiếu) được phân rã LU một lần, trong hệ toạ độ của chính miền đó;
+    - hệ mặt trượt 2*nr*nt ẩn: bù Schur rotor đã hoán vị theo bước quay + bù Schur
+      stator + liên kết qua mặt, chỉ phần liên kết đổi theo vị trí rotor.
+    Từ trở giữ nguyên như lúc dựng (tuyến tính hoặc đóng băng độ từ thẩm).
+    dense=True (mặc định khi nr*nt <= MAX_DENSE_INTERFACE): bù Schur là ma trận đặc tính
+    một lần, hệ mặt trượt phân rã LU đặc mỗi vị trí, mỗi lần giải chỉ còn thế tiến / lùi.
+    dense=False: không dựng bù Schur, hệ mặt trượt là LinearOperator (mỗi phép nhân giải
+    phần trong hai miền bằng LU thưa đã có) giải bằng conjugate gradient với tiền điều
+    kiện đường chéo; bộ nhớ tuyến tính theo số ô nhưng mỗi lần giải tốn nhiều lần thế.
+    rotor_offset: vị trí rotor (bước theta tuyệt đối, như motor.rotor_offset) khi dựng.
+    """
+
+    def __init__(self, interface, rotor_offset=0, dense=None):
+        self.shape = tuple(interface.shape)
+        self.n_rotor_layer = interface.n_rotor_layer
+        self.periodic_boundary = interface.periodic_boundary
+        self.rotor_offset = int(rotor_offset)
+
+        nr, nt, nz = self.shape
+        m = self.n_rotor_layer
+        self.n_interface = nr * nt
+        self.rotor_shape = (nr, nt, m)
+        self.stator_shape = (nr, nt, nz - m)
+
+        # Dữ liệu rotor lưu trong hệ toạ độ rotor (vị trí rotor_offset = 0)
+        def to_rotor_frame(array):
+            return np.roll(array, -self.rotor_offset, axis=1)
+
+        rotor_conductance = [to_rotor_frame(c) for c in interface.rotor_conductance]
+        self.rotor_reluctance = to_rotor_frame(interface.rotor_reluctance)
+        self.rotor_source = to_rotor_frame(interface.rotor_source)
+        self.rotor_J = create_stencil_source([to_rotor_frame(f) for f in interface.rotor_source_flux],
+                                             self.rotor_shape,
+                                             self.periodic_boundary).source
+        self.stator_reluctance = interface.stator_reluctance
+        self.stator_source = interface.stator_source
+        self.stator_J = create_stencil_source(interface.stator_source_flux,
+                                              self.stator_shape,
+                                              self.periodic_boundary).source
+
+        n = self.n_interface
+        self.dense = n <= MAX_DENSE_INTERFACE if dense is None else bool(dense)
+
+        # Rotor: ẩn theo thứ tự F, lớp sát mặt trượt (z = m - 1) là n ẩn cuối
+        G = create_stencil_matrix(rotor_conductance, self.rotor_shape, self.periodic_boundary).matrix
+        n_inner = G.shape[0] - n
+        self.rotor_inner_lu = splu(G[:n_inner, :n_inner].tocsc()) if n_inner > 0 else None
+        self.rotor_coupling = G[:n_inner, n_inner:].tocsc()
+        self.rotor_interface_matrix = G[n_inner:, n_inner:].tocsc()
+
+        # Stator: lớp sát mặt trượt (z = m) là n ẩn đầu, bỏ ô tham chiếu (ô cuối)
+        G = create_stencil_matrix(interface.stator_conductance, self.stator_shape, self.periodic_boundary).matrix
+        G = G[:-1, :-1]
+        self.stator_inner_lu = splu(G[n:, n:].tocsc())
+        self.stator_coupling = G[n:, :n].tocsc()
+        self.stator_interface_matrix = G[:n, :n].tocsc()
+
+        self.rotor_schur = None
+        self.stator_schur = None
+        if self.dense:
+            self.rotor_schur = self.find_schur_complement(self.rotor_interface_matrix, self.rotor_coupling,
+                                                          self.rotor_inner_lu)
+            self.stator_schur = self.find_schur_complement(self.stator_interface_matrix, self.stator_coupling,
+                                                           self.stator_inner_lu)
+
+        self.interface_step = None
+        self.interface_lu = None
+        self.interface_operator = None
+        self.interface_preconditioner = None
+
+    @classmethod
+    def from_reluctance_network(cls, reluctance_network, n_rotor_layer, rotor_offset=0, load_factor=1.0, dense=None):
+        interface = find_sliding_interface(reluctance_network, n_rotor_layer=n_rotor_layer, load_factor=load_factor)
+        return cls(interface, rotor_offset=rotor_offset, dense=dense)
+
+    @staticmethod
+    def find_schur_complement(G_interface, G_coupling, inner_lu):
+        # S = G_gg - G_gi G_ii^-1 G_ig (ma trận đặc)
+        schur = G_interface.toarray()
+        if inner_lu is not None:
+            schur -= G_coupling.T @ inner_lu.solve(G_coupling.toarray())
+        return schur
+
+    @staticmethod
+    def apply_schur_complement(x, G_interface, G_coupling, inner_lu):
+        # S x = G_gg x - G_gi G_ii^-1 G_ig x, không dựng S
+        y = G_interface @ x
+        if inner_lu is not None:
+            y -= G_coupling.T @ inner_lu.solve(G_coupling @ x)
+        return y
+
+    def find_step(self, rotor_offset):
+        # Bước quay so với hệ toạ độ rotor, trong [0, nt)
+        return int(rotor_offset) % self.shape[1]
+
+    def find_interface_permutation(self, step):
+        # permutation[ẩn mặt trượt theo hệ stator] = ẩn tương ứng theo hệ rotor
+        nr, nt, _ = self.shape
+        index = np.arange(self.n_interface).reshape((nr, nt), order='F')
+        return np.roll(index, step, axis=1).ravel(order='F')
+
+    def set_rotor_offset(self, rotor_offset):
+        """Dựng và phân rã hệ mặt trượt cho vị trí rotor_offset (bỏ qua nếu đã có)"""
+        step = self.find_step(rotor_offset)
+        if step == self.interface_step:
+            return
+
+        permutation = self.find_interface_permutation(step)
+        r = np.roll(self.rotor_reluctance, step, axis=1) + self.stator_reluctance
+        conductance = (1.0 / r).ravel(order='F')
+
+        if self.dense:
+            coupling = np.diag(conductance)
+            K = np.block([[self.rotor_schur[np.ix_(permutation, permutation)] + coupling, -coupling],
+                          [-coupling, self.stator_schur + coupling]])
+            self.interface_lu = lu_factor(K, overwrite_a=True, check_finite=False)
+        else:
+            self.interface_operator = self.create_interface_operator(permutation, conductance)
+        self.interface_step = step
+
+    def create_interface_operator(self, permutation, conductance):
+        # Hệ mặt trượt dạng LinearOperator và tiền điều kiện đường chéo (đường chéo của G_gg
+        # là chặn trên của đường chéo bù Schur)
+        n = self.n_interface
+
+        def matvec(x):
+            x = np.ravel(x)
+            rotor_x = np.empty(n)
+            rotor_x[permutation] = x[:n]
+            rotor_y = self.apply_schur_complement(rotor_x, self.rotor_interface_matrix,
+                                                  self.rotor_coupling, self.rotor_inner_lu)[permutation]
+            stator_y = self.apply_schur_complement(x[n:], self.stator_interface_matrix,
+                                                   self.stator_coupling, self.stator_inner_lu)
+            difference = conductance * (x[:n] - x[n:])
+            return np.concatenate([rotor_y + difference, stator_y - difference])
+
+        diagonal = np.concatenate([self.rotor_interface_matrix.diagonal()[permutation] + conductance,
+                                   self.stator_interface_matrix.diagonal() + conductance])
+        self.interface_preconditioner = LinearOperator((2 * n, 2 * n), matvec=lambda x: np.ravel(x) / diagonal,
+                                                       dtype=float)
+        return LinearOperator((2 * n, 2 * n), matvec=matvec, dtype=float)
+
+    def solve_interface(self, b):
+        if self.dense:
+            return lu_solve(self.interface_lu, b, check_finite=False)
+        x, info = cg(self.interface_operator, b,
+                     rtol=ITERATIVE_RELATIVE_TOLERANCE,
+                     maxiter=ITERATIVE_MAX_ITERATION_FACTOR * b.size,
+                     M=self.interface_preconditioner)
+        if info > 0:
+            print(f"[WARNING] Conjugate gradient did not converge in {info} iterations.")
+        return x
+
+    def create_source(self, rotor_offset):
+        """Vế phải J (N - 1 phần tử, theo hệ stator) tại vị trí rotor_offset"""
+        step = self.find_step(rotor_offset)
+        m = self.n_rotor_layer
+        J = np.concatenate([np.roll(self.rotor_J, step, axis=1), self.stator_J], axis=2)
+
+        r = np.roll(self.rotor_reluctance, step, axis=1) + self.stator_reluctance
+        flux = (np.roll(self.rotor_source, step, axis=1) + self.stator_source) / r
+        J[:, :, m] += flux
+        J[:, :, m - 1] -= flux
+        return J.ravel(order='F')[:-1]
+
+    def solve_equation(self, b, rotor_offset):
+        """Giải G x = b (b, x theo hệ stator, N - 1 phần tử) tại vị trí rotor_offset"""
+        self.set_rotor_offset(rotor_offset)
+        step = self.interface_step
+        n = self.n_interface
+        m = self.n_rotor_layer
+        permutation = self.find_interface_permutation(step)
+
+        full = np.append(np.asarray(b, dtype=float), 0.0).reshape(self.shape, order='F')
+        rotor_b = np.roll(full[:, :, :m], -step, axis=1).ravel(order='F')
+        stator_b = full[:, :, m:].ravel(order='F')[:-1]
+        rotor_inner_b, rotor_interface_b = rotor_b[:-n], rotor_b[-n:]
+        stator_interface_b, stator_inner_b = stator_b[:n], stator_b[n:]
+
+        # Khử phần trong của hai miền
+        rotor_g = rotor_interface_b.copy()
+        if self.rotor_inner_lu is not None:
+            rotor_g -= self.rotor_coupling.T @ self.rotor_inner_lu.solve(rotor_inner_b)
+        stator_g = stator_interface_b - self.stator_coupling.T @ self.stator_inner_lu.solve(stator_inner_b)
+
+        x_interface = self.solve_interface(np.concatenate([rotor_g[permutation], stator_g]))
+        rotor_interface_x = np.empty(n)
+        rotor_interface_x[permutation] = x_interface[:n]
+        stator_interface_x = x_interface[n:]
+
+        # Thế ngược vào phần trong
+        rotor_x = rotor_interface_x
+        if self.rotor_inner_lu is not None:
+            rotor_inner_x = self.rotor_inner_lu.solve(rotor_inner_b - self.rotor_coupling @ rotor_interface_x)
+            rotor_x = np.concatenate([rotor_inner_x, rotor_interface_x])
+        stator_inner_x = self.stator_inner_lu.solve(stator_inner_b - self.stator_coupling @ stator_interface_x)
+        stator_x = np.concatenate([stator_interface_x, stator_inner_x, [0.0]])
+
+        potential = np.concatenate([np.roll(rotor_x.reshape(self.rotor_shape, order='F'), step, axis=1),
+                                    stator_x.reshape(self.stator_shape, order='F')], axis=2)
+        return potential.ravel(order='F')[:-1]
+
+    def solve(self, rotor_offset):
+        """Thế từ (nr, nt, nz) tại vị trí rotor_offset với từ trở đã đóng băng"""
+        x = self.solve_equation(self.create_source(rotor_offset), rotor_offset)
+        return np.append(x, 0.0).reshape(self.shape, order='F')
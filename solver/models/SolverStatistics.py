@@ -0,0 +1,81 @@
+from dataclasses import dataclass, field
+from typing import List
+
+@dataclass
+class IterationStatistics:
+    """Số liệu của một vòng lặp phi tuyến (kể cả vòng bị từ chối do residual tăng)"""
+    load_step: int
+    iteration: int
+    residual: float
+    damping: float
+    accepted: bool
+    assembly_time: float = 0.0          # dựng G, J
+    linear_solve_time: float = 0.0      # phân rã LU + giải
+    update_time: float = 0.0            # update_reluctance_network
+    bookkeeping_time: float = 0.0       # residual, hướng tìm kiếm, cập nhật thế
+    n_factorization: int = 0            # số lần phân rã LU
+    n_permeability_changed: int = 0     # số ô thép có mu_r thay đổi sau vòng lặp
+
+    @property
+    def total_time(self):
+        return self.assembly_time + self.linear_solve_time + self.update_time + self.bookkeeping_time
+
+@dataclass
+class SolverStatistics:
+    """Thời gian theo từng giai đoạn và các bộ đếm của solve_magnetic_equation"""
+    method: str = ""
+    iterations: List[IterationStatistics] = field(default_factory=list)
+    setup_time: float = 0.0             # reset thế + cập nhật mạng ban đầu
+    finalize_time: float = 0.0          # vẽ residual, ghi solution history
+    total_time: float = 0.0
+
+    def add_iteration(self, iteration_statistics):
+        self.iterations.append(iteration_statistics)
+
+    @property
+    def n_iteration(self):
+        return len(self.iterations)
+
+    @property
+    def n_rejected_step(self):
+        return sum(1 for item in self.iterations if not item.accepted)
+
+    @property
+    def n_factorization(self):
+        return sum(item.n_factorization for item in self.iterations)
+
+    @property
+    def damping_history(self):
+        return [item.damping for item in self.iterations]
+
+    @property
+    def assembly_time(self):
+        return sum(item.assembly_time for item in self.iterations)
+
+    @property
+    def linear_solve_time(self):
+        return sum(item.linear_solve_time for item in self.iterations)
+
+    @property
+    def update_time(self):
+        return sum(item.update_time for item in self.iterations)
+
+    @property
+    def bookkeeping_time(self):
+        return sum(item.bookkeeping_time for item in self.iterations)
+
+    def summary(self):
+        lines = [f"Solver statistics ({self.method}): {self.n_iteration} iterations, "
+                 f"{self.n_rejected_step} rejected, {self.n_factorization} factorizations",
+                 f"{'STAGE':<16}{'TIME (s)':>12}{'SHARE':>9}"]
+        stages = [("setup", self.setup_time),
+                  ("assembly", self.assembly_time),
+                  ("linear solve", self.linear_solve_time),
+                  ("update", self.update_time),
+                  ("bookkeeping", self.bookkeeping_time),
+                  ("finalize", self.finalize_time)]
+        for name, value in stages:
+            share = value / self.total_time if self.total_time > 0 else 0.0
+            lines.append(f"{name:<16}{value:>12.4f}{share:>9.1%}")
+        lines.append(f"{'total':<16}{self.total_time:>12.4f}")
+        return "\n".join(lines)
@@ -0,0 +1,91 @@
+import sys
+import os
+import numpy as np
+import paths
+
+MESH = dict(n_r_in=2, n_r_1=2, n_r_2=3, n_r_3=2, n_r_out=2, n_theta=13,
+            n_z_in_air=2, n_z_rotor_yoke=2, n_z_magnet=2, n_z_airgap=2,
+            n_z_tooth_tip_1=2, n_z_tooth_tip_2=2, n_z_tooth_body=3, n_z_stator_yoke=2, n_z_out_air=2)
+# Dòng pha khác 0 để mô-men và các đạo hàm đủ lớn (~ -4 N.m ở vị trí rotor 2)
+WINDING_CURRENT = [5.0, -2.5, -2.5]
+ROTOR_OFFSET = 2
+SOLVER = dict(method="newton", max_iteration=50, max_relative_residual=1e-12, load_step=1, debug=False)
+
+def create_motor():
+    from motor_type.models.AxialFluxMotorType1 import AxialFluxMotorType1
+
+    motor = AxialFluxMotorType1(magnet_length=4e-3, airgap=0.5e-3)
+    motor.create_geometry()
+    motor.create_adaptive_mesh(**MESH)
+    motor.create_reluctance_network()
+    motor.rotate_rotor(ROTOR_OFFSET)
+    motor.reluctance_network.update_reluctance_network(magnetic_potential=motor.reluctance_network.magnetic_potential,
+                                                       winding_current=np.array(WINDING_CURRENT))
+    return motor
+
+def find_solved_torque(motor):
+    motor.reluctance_network.solve_magnetic_equation(**SOLVER)
+    return motor.find_torque().torque
+
+def find_branch_difference(motor, name, index, relative_step=1e-4):
+    # Sai phân trung tâm của mô-men theo một tham số nhánh, giải lại nghiệm phi tuyến
+    value = getattr(motor.reluctance_network.elements[index[:3]], name)
+    base = value[index[3:]]
+    h = relative_step * abs(base)
+    torque = []
+    for sign in (1.0, -1.0):
+        value[index[3:]] = base + sign * h
+        torque.append(find_solved_torque(motor))
+    value[index[3:]] = base
+    return (torque[0] - torque[1]) / (2 * h)
+
+def find_largest_branch(gradient, material_mask):
+    # Nhánh có |đạo hàm| lớn nhất trong các ô của vật liệu cho trước
+    masked = np.where(material_mask[..., None, None], np.abs(gradient), 0.0)
+    return tuple(int(i) for i in np.unravel_index(np.argmax(masked), masked.shape))
+
+def test():
+    from motor_type.utils.for_axial_flux_motor_type_1.find_design_sensitivity import create_perturbed_motor
+    from motor_type.utils.for_axial_flux_motor_type_1.find_torque_gradient import find_torque_gradient
+
+    motor = create_motor()
+    network = motor.reluctance_network
+    result = network.solve_magnetic_equation(**SOLVER)
+    assert result.residual_history[-1] < 1e-12
+
+    sensitivity = network.find_adjoint_sensitivity(lambda link_flux: find_torque_gradient(motor, link_flux))
+    assert sensitivity.relative_residual < 1e-10
+    torque = motor.find_torque().torque
+    assert abs(torque) > 1.0
+    assert np.isclose(sensitivity.value, torque, rtol=1e-6, atol=0)
+
+    shape = network.elements.shape
+    material = np.array([network.elements[index].material for index in np.ndindex(shape)]).reshape(shape)
+
+    # Đạo hàm theo tham số nhánh so với sai phân của nghiệm phi tuyến
+    for name, gradient, cells in (("magnetic_source", sensitivity.magnetic_source_gradient, "magnet"),
+                                  ("vacuum_reluctance", sensitivity.vacuum_reluctance_gradient, "air"),
+                                  ("vacuum_reluctance", sensitivity.vacuum_reluctance_gradient, "iron")):
+        index = find_largest_branch(gradient, material == cells)
+        assert abs(gradient[index]) > 1e-6 * abs(torque) / abs(getattr(network.elements[index[:3]], name)[index[3:]])
+        difference = find_branch_difference(motor, name, index)
+        assert np.isclose(gradient[index], difference, rtol=1e-4, atol=0), (name, cells, gradient[index], difference)
+
+    # Đạo hàm theo tham số thiết kế so với sai phân (dựng lại geometry / lưới / mạng và giải lại)
+    find_solved_torque(motor)
+    design = motor.find_design_sensitivity(["airgap", "magnet_length"])
+    for name, gradient, h in zip(design.parameters, design.gradient, design.step):
+        torque = [find_solved_torque(create_perturbed_motor(motor, name, getattr(motor, name) + sign * h))
+                  for sign in (1.0, -1.0)]
+        difference = (torque[0] - torque[1]) / (2 * h)
+        assert abs(gradient) * getattr(motor, name) > 1e-3 * abs(design.value), (name, gradient)
+        assert np.isclose(gradient, difference, rtol=1e-3, atol=0), (name, gradient, difference)
+
+if __name__ == "__main__":
+    current_file = os.path.abspath(__file__)
+    root_dir = os.path.dirname(os.path.dirname(os.path.dirname(current_file)))
+
+    if root_dir not in sys.path:
+        sys.path.append(root_dir)
+
+    test()
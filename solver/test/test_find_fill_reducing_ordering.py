@@ -0,0 +1,55 @@
+import sys
+import os
+import numpy as np
+import paths
+
+def create_conductance(shape, periodic_boundary, rng):
+    # Độ dẫn mặt ngẫu nhiên theo quy ước find_face_conductance
+    conductance = []
+    for axis in range(3):
+        face_shape = list(shape)
+        if not (axis == 1 and periodic_boundary):
+            face_shape[axis] -= 1
+        conductance.append(rng.uniform(0.1, 10.0, face_shape))
+    return conductance
+
+def test():
+    from scipy.sparse.linalg import spsolve, splu
+    from solver.utils.find_fill_reducing_ordering import find_fill_reducing_ordering
+    from solver.utils.create_stencil_matrix import create_stencil_matrix
+    from solver.core.solve_linear_equation import solve_linear_equation
+
+    rng = np.random.default_rng(0)
+    for shape in ((1, 1, 2), (4, 9, 3), (5, 12, 6), (6, 24, 8)):
+        for periodic_boundary in (True, False):
+            n_cells = int(np.prod(shape))
+            permutation = find_fill_reducing_ordering(shape, periodic_boundary=periodic_boundary).permutation
+
+            # Hoán vị hợp lệ của mọi ẩn, không chứa ô tham chiếu (ô cuối)
+            assert np.array_equal(np.sort(permutation), np.arange(n_cells - 1)), (shape, periodic_boundary)
+
+            # Giải với hoán vị cho cùng nghiệm với spsolve
+            G = create_stencil_matrix(create_conductance(shape, periodic_boundary, rng),
+                                      shape, periodic_boundary).matrix[:-1, :-1].tocsc()
+            b = rng.standard_normal(n_cells - 1)
+            expected = spsolve(G, b)
+            x = solve_linear_equation(G, b, permutation=permutation)
+            assert np.abs(x - expected).max() < 1e-10 * np.abs(expected).max(), (shape, periodic_boundary)
+
+    # Nested dissection giảm fill-in so với thứ tự tự nhiên
+    shape = (6, 24, 8)
+    G = create_stencil_matrix(create_conductance(shape, True, rng), shape).matrix[:-1, :-1].tocsr()
+    permutation = find_fill_reducing_ordering(shape).permutation
+    options = dict(permc_spec="NATURAL", diag_pivot_thresh=0.0, options={"SymmetricMode": True})
+    natural = splu(G.tocsc(), **options)
+    dissected = splu(G[permutation][:, permutation].tocsc(), **options)
+    assert dissected.L.nnz + dissected.U.nnz < 0.5 * (natural.L.nnz + natural.U.nnz)
+
+if __name__ == "__main__":
+    current_file = os.path.abspath(__file__)
+    root_dir = os.path.dirname(os.path.dirname(os.path.dirname(current_file)))
+
+    if root_dir not in sys.path:
+        sys.path.append(root_dir)
+
+    test()
@@ -0,0 +1,59 @@
+import sys
+import os
+import numpy as np
+import paths
+
+def create_layer_conductance(shape, weak_layer, weak=1e-3):
+    # Độ dẫn mặt (trung bình điều hòa của hai ô) của lưới đều có một lớp z dẫn từ kém
+    mu = np.ones(shape)
+    mu[:, :, weak_layer] = weak
+    conductance = []
+    for axis in range(3):
+        face = 2 / (1 / mu + 1 / np.roll(mu, -1, axis=axis))
+        if axis != 1:
+            face = np.take(face, np.arange(shape[axis] - 1), axis=axis)
+        conductance.append(face)
+    return conductance
+
+def count_iteration(shape, weak_layer):
+    from scipy.sparse.linalg import cg
+    from solver.models.GeometricMultigrid import GeometricMultigrid
+    from solver.models.ReluctanceStencilOperator import ReluctanceStencilOperator
+
+    G = ReluctanceStencilOperator(create_layer_conductance(shape, weak_layer), shape)
+    multigrid = GeometricMultigrid.from_operator(G)
+    b = np.random.default_rng(0).standard_normal(G.shape[0])
+    iteration = [0]
+    x, info = cg(G, b, rtol=1e-10, maxiter=1000, M=multigrid.aslinearoperator(),
+                 callback=lambda _: iteration.__setitem__(0, iteration[0] + 1))
+    assert info == 0
+    assert np.linalg.norm(b - G.matvec(x)) < 1e-9 * np.linalg.norm(b)
+    return multigrid, iteration[0]
+
+def test():
+    from solver.utils.create_coarse_level import find_pair_map
+
+    assert np.array_equal(find_pair_map(5), [0, 0, 1, 1, 2])
+    assert np.array_equal(find_pair_map(6, np.array([False, True, False, False, True])), [0, 0, 1, 1, 2, 3])
+
+    for shape in ((8, 40, 20), (16, 80, 40)):
+        for weak_layer in (shape[2] // 2 - 1, shape[2] // 2):
+            multigrid, n_iteration = count_iteration(shape, weak_layer)
+
+            # Lớp yếu đứng riêng theo z ở mức thô đầu tiên
+            level = multigrid.levels[0]
+            coarse_shape = multigrid.levels[1].operator.grid_shape
+            z_map = level.cell_map.reshape(shape, order='F')[0, 0] // (coarse_shape[0] * coarse_shape[1])
+            assert np.count_nonzero(z_map == z_map[weak_layer]) == 1, (shape, weak_layer, z_map)
+
+            # Số vòng CG gần như không đổi theo kích thước lưới (gấp 8 lần ô)
+            assert n_iteration <= 25, (shape, weak_layer, n_iteration)
+
+if __name__ == "__main__":
+    current_file = os.path.abspath(__file__)
+    root_dir = os.path.dirname(os.path.dirname(os.path.dirname(current_file)))
+
+    if root_dir not in sys.path:
+        sys.path.append(root_dir)
+
+    test()
@@ -0,0 +1,43 @@
+import sys
+import os
+import numpy as np
+import paths
+
+def test():
+    from solver.models.ReluctanceStencilOperator import ReluctanceStencilOperator
+    from solver.utils.create_stencil_matrix import create_stencil_matrix
+
+    rng = np.random.default_rng(1)
+    for shape in ((3, 7, 4), (5, 12, 2), (1, 6, 3)):
+        for periodic_boundary in (True, False):
+            conductance = []
+            for axis in range(3):
+                face_shape = list(shape)
+                if not (axis == 1 and periodic_boundary):
+                    face_shape[axis] -= 1
+                conductance.append(rng.uniform(0.1, 10.0, face_shape))
+
+            G = ReluctanceStencilOperator(conductance, shape, periodic_boundary=periodic_boundary)
+            matrix = create_stencil_matrix(conductance, shape, periodic_boundary).matrix[:-1, :-1]
+            assert G.shape == matrix.shape
+
+            # G x và G^T x matrix-free trùng với ma trận thưa
+            x = rng.standard_normal(G.shape[0])
+            expected = matrix @ x
+            scale = np.abs(expected).max()
+            assert np.abs(G.matvec(x) - expected).max() < 1e-12 * scale, (shape, periodic_boundary)
+            assert np.abs(G.rmatvec(x) - expected).max() < 1e-12 * scale
+            X = rng.standard_normal((G.shape[0], 2))
+            assert np.allclose(G.matmat(X), matrix @ X, rtol=1e-12, atol=0)
+
+            assert np.allclose(G.diagonal(), matrix.diagonal(), rtol=1e-14, atol=0)
+            assert abs(G.to_sparse() - matrix).max() == 0.0
+
+if __name__ == "__main__":
+    current_file = os.path.abspath(__file__)
+    root_dir = os.path.dirname(os.path.dirname(os.path.dirname(current_file)))
+
+    if root_dir not in sys.path:
+        sys.path.append(root_dir)
+
+    test()
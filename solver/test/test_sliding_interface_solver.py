@@ -0,0 +1,49 @@
+import sys
+import os
+import numpy as np
+import paths
+
+MESH = dict(n_r_in=2, n_r_1=2, n_r_2=3, n_r_3=2, n_r_out=2, n_theta=13,
+            n_z_in_air=2, n_z_rotor_yoke=2, n_z_magnet=2, n_z_airgap=2,
+            n_z_tooth_tip_1=2, n_z_tooth_tip_2=2, n_z_tooth_body=3, n_z_stator_yoke=2, n_z_out_air=2)
+
+def test():
+    from scipy.sparse.linalg import spsolve
+    from motor_type.models.AxialFluxMotorType1 import AxialFluxMotorType1
+
+    motor = AxialFluxMotorType1(magnet_length=4e-3, airgap=0.5e-3)
+    motor.create_geometry()
+    motor.create_adaptive_mesh(**MESH)
+    network = motor.create_reluctance_network()
+    network.solve_magnetic_equation(method="newton", max_relative_residual=1e-8, load_step=1)
+    shape = network.elements.shape
+
+    dense = motor.create_sliding_interface_solver()
+    assert dense.dense
+    implicit = network.create_sliding_interface_solver(n_rotor_layer=dense.n_rotor_layer, dense=False)
+    assert implicit.rotor_schur is None and implicit.stator_schur is None
+
+    # Vị trí dựng: cùng nghiệm với giải trực tiếp G P = J của mạng (độ từ thẩm đóng băng)
+    equation = network.create_magnetic_potential_equation(debug=False)
+    direct = np.append(spsolve(equation.G.tocsc(), equation.J), 0.0).reshape(shape, order='F')
+    scale = np.abs(direct).max()
+    assert np.abs(dense.solve(0) - direct).max() < 1e-8 * scale
+    assert np.abs(implicit.solve(0) - direct).max() < 1e-6 * scale
+
+    # Vị trí khác (kể cả âm và quá một vòng theta): cùng nghiệm với quay rotor rồi giải
+    # trực tiếp, và hai cách giải hệ mặt trượt cho cùng nghiệm
+    for rotor_offset in (1, 3, -2, shape[1] + 2):
+        motor.rotate_rotor(rotor_offset - motor.rotor_offset)
+        equation = network.create_magnetic_potential_equation(debug=False)
+        direct = np.append(spsolve(equation.G.tocsc(), equation.J), 0.0).reshape(shape, order='F')
+        assert np.abs(dense.solve(rotor_offset) - direct).max() < 1e-11 * scale, rotor_offset
+        assert np.abs(implicit.solve(rotor_offset) - direct).max() < 1e-8 * scale, rotor_offset
+
+if __name__ == "__main__":
+    current_file = os.path.abspath(__file__)
+    root_dir = os.path.dirname(os.path.dirname(os.path.dirname(current_file)))
+
+    if root_dir not in sys.path:
+        sys.path.append(root_dir)
+
+    test()
@@ -0,0 +1,90 @@
+from dataclasses import dataclass, field
+from typing import List, Tuple
+import numpy as np
+
+@dataclass
+class Output:
+    conductance: List[np.ndarray] = field(default_factory=list)    # độ dẫn mặt của lưới thô (cùng quy ước find_face_conductance)
+    shape: Tuple[int, int, int] = (1, 1, 1)
+    cell_map: np.ndarray = None         # chỉ số phẳng (F) của ô thô chứa mỗi ô mịn, thứ tự F của lưới mịn
+
+def find_link_shape(shape, axis, periodic):
+    # Số liên kết theo axis: n (tuần hoàn) hoặc n - 1
+    link_shape = list(shape)
+    link_shape[axis] = shape[axis] if periodic else shape[axis] - 1
+    return tuple(link_shape)
+
+def find_pair_map(n, blocked=None):
+    """
+    Chỉ số ô thô của n ô liền kề khi gộp từng cặp, duyệt từ đầu: ô i gộp với ô i + 1
+    trừ khi blocked[i] (liên kết i -> i + 1 yếu), khi đó ô i đứng riêng.
+    """
+    pair_map = np.zeros(n, dtype=int)
+    i = 0
+    coarse = 0
+    while i < n:
+        pair_map[i] = coarse
+        if i + 1 < n and (blocked is None or not blocked[i]):
+            pair_map[i + 1] = coarse
+            i += 1
+        i += 1
+        coarse += 1
+    return pair_map
+
+def create_coarse_level(conductance, shape, coarsen_axes, periodic_boundary=True, blocked_links=None):
+    """
+    Gộp từng cặp đường node liền kề theo các hướng trong coarsen_axes (semi-coarsening),
+    ô thô = khối 2 ô mịn theo mỗi hướng được gộp (ô lẻ cuối cùng đứng riêng).
+    blocked_links: {axis: mảng bool (n_axis - 1,)}, không gộp qua liên kết bị chặn (lớp
+    độ dẫn thấp như khe hở), ô trước nó đứng riêng; chỉ dùng cho hướng không tuần hoàn.
+    Độ dẫn của mặt thô = tổng độ dẫn các liên kết mịn cắt qua mặt đó (mắc song song),
+    liên kết nằm trong một ô thô bị bỏ. Với nội suy hằng trên mỗi ô thô đây chính là
+    P^T G P nên giữ đúng các bước nhảy độ từ thẩm sắt / không khí.
+    Theta (axis 1) tuần hoàn nếu periodic_boundary.
+    """
+    shape = tuple(int(n) for n in shape)
+    blocked_links = blocked_links or {}
+    axis_map = [find_pair_map(n, blocked_links.get(axis)) if axis in coarsen_axes else np.arange(n)
+                for axis, n in enumerate(shape)]
+    coarse_shape = tuple(int(axis_map[axis][-1]) + 1 for axis in range(3))
+
+    def coarse_index(axis, index):
+        return axis_map[axis][index]
+
+    result = Output(shape=coarse_shape)
+
+    fine_index = np.indices(shape)
+    coarse_position = [coarse_index(axis, fine_index[axis]) for axis in range(3)]
+    cell_map = (coarse_position[0]
+                + coarse_position[1] * coarse_shape[0]
+                + coarse_position[2] * coarse_shape[0] * coarse_shape[1])
+    result.cell_map = cell_map.ravel(order='F')
+
+    for axis in range(3):
+        periodic = axis == 1 and periodic_boundary
+        c = conductance[axis]
+        n_link = c.shape[axis]
+
+        link = np.arange(n_link)
+        lower_cell = coarse_index(axis, link)
+        upper_cell = coarse_index(axis, (link + 1) % shape[axis])
+        crossing = lower_cell != upper_cell
+
+        coarse_link_shape = find_link_shape(coarse_shape, axis, periodic)
+        coarse_conductance = np.zeros(coarse_link_shape)
+
+        crossing_links = np.flatnonzero(crossing)
+        if coarse_link_shape[axis] > 0 and crossing_links.size > 0:
+            crossing_conductance = np.take(c, crossing_links, axis=axis)
+            link_index = np.indices(crossing_conductance.shape)
+            target = []
+            for other in range(3):
+                if other == axis:
+                    target.append(lower_cell[crossing_links][link_index[axis]])
+                else:
+                    target.append(coarse_index(other, link_index[other]))
+            np.add.at(coarse_conductance, tuple(target), crossing_conductance)
+
+        result.conductance.append(coarse_conductance)
+
+    return result
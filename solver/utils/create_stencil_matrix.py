@@ -0,0 +1,39 @@
+from dataclasses import dataclass
+from typing import Any
+import numpy as np
+import scipy.sparse as sp
+
+@dataclass
+class Output:
+    matrix: Any     # csc, (n, n) với n = nr * nt * nz, chưa bỏ ô tham chiếu
+
+def create_stencil_matrix(conductance, shape, periodic_boundary=True):
+    """
+    Ma trận thưa đầy đủ của mạng độ dẫn trên lưới (nr, nt, nz) (thứ tự F), mỗi
+    liên kết giữa hai ô a, b góp +c vào G[a, a], G[b, b] và -c vào G[a, b], G[b, a].
+    conductance theo quy ước find_face_conductance. Ma trận suy biến (chưa chọn
+    ô tham chiếu), bỏ hàng / cột của các ô có thế cố định khi dùng.
+    """
+    shape = tuple(int(n) for n in shape)
+    index = np.arange(int(np.prod(shape))).reshape(shape, order='F')
+    rows, cols, values = [], [], []
+    for axis, c in enumerate(conductance):
+        if axis == 1 and periodic_boundary:
+            lower_index, upper_index = index, np.roll(index, -1, axis=axis)
+        else:
+            lower = [slice(None)] * 3
+            upper = [slice(None)] * 3
+            lower[axis] = slice(0, shape[axis] - 1)
+            upper[axis] = slice(1, None)
+            lower_index, upper_index = index[tuple(lower)], index[tuple(upper)]
+        rows.append(lower_index.ravel())
+        cols.append(upper_index.ravel())
+        values.append(np.asarray(c).ravel())
+
+    rows, cols, values = np.concatenate(rows), np.concatenate(cols), np.concatenate(values)
+    n = index.size
+    matrix = sp.coo_matrix((np.concatenate([-values, -values, values, values]),
+                            (np.concatenate([rows, cols, rows, cols]),
+                             np.concatenate([cols, rows, rows, cols]))),
+                           shape=(n, n)).tocsc()
+    return Output(matrix=matrix)
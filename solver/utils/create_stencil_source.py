@@ -0,0 +1,24 @@
+from dataclasses import dataclass
+import numpy as np
+
+@dataclass
+class Output:
+    source: np.ndarray      # (nr, nt, nz), thông lượng nguồn đi vào mỗi ô
+
+def create_stencil_source(source_flux, shape, periodic_boundary=True):
+    """
+    Vế phải J của mạng từ thông lượng nguồn trên từng liên kết (quy ước
+    find_face_conductance): thông lượng đi vào ô trên (+) và ra khỏi ô dưới (-).
+    """
+    J = np.zeros(shape)
+    for axis, flux in enumerate(source_flux):
+        if axis == 1 and periodic_boundary:
+            J += np.roll(flux, 1, axis=axis) - flux
+        else:
+            lower = [slice(None)] * 3
+            upper = [slice(None)] * 3
+            lower[axis] = slice(0, shape[axis] - 1)
+            upper[axis] = slice(1, None)
+            J[tuple(upper)] += flux
+            J[tuple(lower)] -= flux
+    return Output(source=J)
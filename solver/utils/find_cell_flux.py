@@ -0,0 +1,40 @@
+from dataclasses import dataclass, field
+from typing import List
+import numpy as np
+
+@dataclass
+class Output:
+    cell_flux: List[np.ndarray] = field(default_factory=list)   # flux_direct[0, n] + flux_direct[1, n] của từng ô
+
+def find_cell_flux(link_flux, shape, periodic_boundary=True):
+    """
+    Tổng từ thông qua mặt dưới và mặt trên của mỗi ô theo từng hướng,
+    ô ở biên không tuần hoàn chỉ có một mặt có liên kết.
+    """
+    result = Output()
+    for axis, flux in enumerate(link_flux):
+        result.cell_flux.append(spread_link_value(flux, axis, shape, periodic_boundary))
+    return result
+
+def spread_link_value(value, axis, shape, periodic_boundary=True):
+    # Cộng giá trị của mỗi liên kết vào hai ô của nó
+    if axis == 1 and periodic_boundary:
+        return value + np.roll(value, 1, axis=axis)
+    cell_value = np.zeros(shape)
+    lower = [slice(None)] * 3
+    upper = [slice(None)] * 3
+    lower[axis] = slice(0, shape[axis] - 1)
+    upper[axis] = slice(1, None)
+    cell_value[tuple(lower)] += value
+    cell_value[tuple(upper)] += value
+    return cell_value
+
+def gather_cell_value(cell_value, axis, periodic_boundary=True):
+    """Chuyển vị của spread_link_value: mỗi liên kết nhận tổng giá trị của hai ô"""
+    if axis == 1 and periodic_boundary:
+        return cell_value + np.roll(cell_value, -1, axis=axis)
+    lower = [slice(None)] * 3
+    upper = [slice(None)] * 3
+    lower[axis] = slice(0, cell_value.shape[axis] - 1)
+    upper[axis] = slice(1, None)
+    return cell_value[tuple(lower)] + cell_value[tuple(upper)]
@@ -0,0 +1,86 @@
+from dataclasses import dataclass, field
+from typing import List
+import numpy as np
+from material.core.lookup_material import lookup_material
+from solver.utils.find_face_conductance import find_link_pair
+from solver.utils.find_link_flux import find_link_potential_difference, scatter_link_value, spread_link_difference
+
+# Số lần chia đôi khoảng của từ thông trên mỗi liên kết (độ chính xác tương đối ~ 2^-60)
+N_BISECTION = 60
+
+@dataclass
+class Output:
+    flux: List[np.ndarray] = field(default_factory=list)                     # phi trên từng liên kết, quy ước find_link_flux
+    incremental_conductance: List[np.ndarray] = field(default_factory=list)  # d phi / d(P_a - P_b)
+    source_flux: List[np.ndarray] = field(default_factory=list)              # (F_a + F_b) * load_factor / (R_a + R_b)
+    net_flux: np.ndarray = None                                               # D^T phi: từ thông ra khỏi mỗi ô (residual KCL)
+    # Trạng thái nhánh (nr, nt, nz, 2, 3) như element.reluctance
+    reluctance: np.ndarray = None
+    relative_permeability: np.ndarray = None
+    d_relative_permeability_d_B: np.ndarray = None
+
+def find_consistent_link_flux(potential,
+                              vacuum_reluctance,
+                              minimum_reluctance,
+                              section_area,
+                              magnetic_source,
+                              material_id,
+                              material_database,
+                              load_factor=1.0,
+                              periodic_boundary=True):
+    """
+    Từ thông trên mọi liên kết tự nhất quán với đường cong B-H tại thế potential:
+        phi * (R_a(phi) + R_b(phi)) = (P_a - P_b) + (F_a + F_b) * load_factor,
+    R = R_vac / mu_r(phi / A) của từng nhánh. Vế trái đơn điệu theo phi (H(B) tăng) nên
+    chia đôi trên [0, |vế phải| / (R_min_a + R_min_b)], mọi liên kết cùng lúc, mu_r tra
+    theo nhóm vật liệu (lookup_material). Khác update_reluctance_network (từ thông tính
+    với từ trở của vòng trước), kết quả chỉ phụ thuộc potential.
+    Các mảng nhánh có shape (nr, nt, nz, 2, 3), material_id (nr, nt, nz).
+    """
+    shape = potential.shape
+    target = []
+    reluctance_limit = []
+    for axis in range(3):
+        lower_source, upper_source = find_link_pair(magnetic_source, axis, periodic_boundary)
+        target.append(find_link_potential_difference(potential, axis, periodic_boundary)
+                      + (lower_source + upper_source) * load_factor)
+        reluctance_limit.append(sum(find_link_pair(minimum_reluctance, axis, periodic_boundary)))
+
+    def find_branch_state(link_flux):
+        branch_flux = np.zeros(shape + (2, 3))
+        for axis in range(3):
+            branch_flux[..., 1, axis] = scatter_link_value(link_flux[axis], axis, shape, periodic_boundary, "lower")
+            branch_flux[..., 0, axis] = scatter_link_value(link_flux[axis], axis, shape, periodic_boundary, "upper")
+        data = lookup_material(B_input=branch_flux / section_area,
+                               material_id=material_id,
+                               material_database=material_database)
+        return vacuum_reluctance / data.mu_r, data
+
+    low = [np.zeros_like(value) for value in target]
+    high = [np.abs(value) / limit for value, limit in zip(target, reluctance_limit)]
+    for _ in range(N_BISECTION):
+        middle = [np.sign(value) * (a + b) / 2 for value, a, b in zip(target, low, high)]
+        reluctance = find_branch_state(middle)[0]
+        for axis in range(3):
+            too_small = np.abs(middle[axis]) * sum(find_link_pair(reluctance, axis, periodic_boundary)) < np.abs(target[axis])
+            low[axis] = np.where(too_small, np.abs(middle[axis]), low[axis])
+            high[axis] = np.where(too_small, high[axis], np.abs(middle[axis]))
+
+    flux = [np.sign(value) * (a + b) / 2 for value, a, b in zip(target, low, high)]
+    reluctance, data = find_branch_state(flux)
+    # dR/dphi của từng nhánh: R = R_vac / mu_r(phi / A)
+    d_reluctance = -reluctance * data.dmu_r_dB / (data.mu_r * section_area)
+
+    result = Output(flux=flux,
+                    net_flux=np.zeros(shape),
+                    reluctance=reluctance,
+                    relative_permeability=data.mu_r,
+                    d_relative_permeability_d_B=data.dmu_r_dB)
+    for axis in range(3):
+        total_reluctance = sum(find_link_pair(reluctance, axis, periodic_boundary))
+        lower_source, upper_source = find_link_pair(magnetic_source, axis, periodic_boundary)
+        result.source_flux.append((lower_source + upper_source) * load_factor / total_reluctance)
+        result.incremental_conductance.append(
+            1.0 / (total_reluctance + flux[axis] * sum(find_link_pair(d_reluctance, axis, periodic_boundary))))
+        result.net_flux += spread_link_difference(flux[axis], axis, shape, periodic_boundary)
+    return result
@@ -0,0 +1,52 @@
+from dataclasses import dataclass, field
+from typing import List
+import numpy as np
+from core_class.utils.save_reluctance_network import stack_element_field
+
+@dataclass
+class Output:
+    # Với mỗi hướng n (r, theta, z): liên kết giữa ô "dưới" a và ô "trên" b = a + 1 theo hướng n
+    conductance: List[np.ndarray] = field(default_factory=list)    # 1 / (R_a[1, n] + R_b[0, n])
+    source_flux: List[np.ndarray] = field(default_factory=list)    # (F_a[1, n] + F_b[0, n]) * load_factor / R
+    periodic_boundary: bool = True
+
+def find_face_conductance(reluctance_network, load_factor=1.0):
+    """
+    Độ dẫn từ và thông lượng nguồn trên từng mặt chung của hai ô lân cận,
+    dạng mảng theo lưới (nr, nt, nz). Theo theta, nếu biên tuần hoàn thì liên
+    kết cuối nối ô nt-1 với ô 0 (mảng đủ nt phần tử), nếu không thì có nt-1 liên kết.
+    Cùng công thức với create_magnetic_potential_equation, không dựng ma trận.
+    """
+    elements = reluctance_network.elements
+    shape = elements.shape
+    element_list = [elements[index] for index in np.ndindex(shape)]
+    # ndindex duyệt theo thứ tự C nên reshape theo shape là đúng vị trí (i, j, k)
+    reluctance = stack_element_field(element_list, "reluctance", shape)
+    magnetic_source = stack_element_field(element_list, "magnetic_source", shape)
+
+    periodic_boundary = bool(reluctance_network.magnetic_potential.periodic_boundary)
+    result = Output(periodic_boundary=periodic_boundary)
+
+    for n in range(3):
+        lower_reluctance, upper_reluctance = find_link_pair(reluctance, n, periodic_boundary)
+        lower_source, upper_source = find_link_pair(magnetic_source, n, periodic_boundary)
+
+        r = lower_reluctance + upper_reluctance
+        result.conductance.append(1.0 / r)
+        result.source_flux.append((lower_source + upper_source) * load_factor / r)
+
+    return result
+
+def find_link_pair(value, axis, periodic_boundary=True):
+    """
+    Giá trị nhánh hai bên mỗi liên kết theo axis từ mảng (nr, nt, nz, 2, 3) của các ô:
+    nhánh trên [1, axis] của ô dưới và nhánh dưới [0, axis] của ô trên.
+    """
+    lower = value[..., 1, axis]
+    upper = np.roll(value[..., 0, axis], -1, axis=axis)
+    if not (axis == 1 and periodic_boundary):
+        # Bỏ liên kết vòng (ô cuối với ô đầu) ở hướng không tuần hoàn
+        keep = [slice(None)] * 3
+        keep[axis] = slice(0, value.shape[axis] - 1)
+        lower, upper = lower[tuple(keep)], upper[tuple(keep)]
+    return lower, upper
@@ -0,0 +1,59 @@
+from dataclasses import dataclass
+import numpy as np
+
+@dataclass
+class Output:
+    permutation: np.ndarray     # permutation[new] = chỉ số ẩn cũ (thứ tự F, bỏ ô tham chiếu)
+
+def find_fill_reducing_ordering(shape, periodic_boundary=True, leaf_size=8):
+    """
+    Nested dissection hình học trên lưới logic (nr, nt, nz) của mạng từ trở.
+    Mỗi ô chỉ nối với 6 ô lân cận nên có thể chia đôi hộp chỉ số bằng một mặt
+    phẳng phân cách theo chiều dài nhất, đánh số hai nửa trước rồi tới mặt phân cách.
+    Với biên tuần hoàn theo theta, mặt phân cách đầu tiên cắt vòng theta thành đoạn thẳng.
+    Ô cuối cùng (điểm tham chiếu thế = 0, không có trong ma trận) bị loại khỏi hoán vị.
+    """
+    shape = tuple(int(n) for n in shape)
+    index = np.arange(int(np.prod(shape))).reshape(shape, order='F')
+    blocks = []
+
+    def take(box):
+        blocks.append(index[tuple(box)].ravel(order='F'))
+
+    def replace(box, axis, start, stop):
+        new_box = list(box)
+        new_box[axis] = slice(start, stop)
+        return new_box
+
+    def dissect(box, periodic):
+        lengths = [b.stop - b.start for b in box]
+        if min(lengths) <= 0:
+            return
+        if int(np.prod(lengths)) <= leaf_size:
+            take(box)
+            return
+
+        axis = int(np.argmax(lengths))
+        start, stop = box[axis].start, box[axis].stop
+
+        if periodic and axis == 1:
+            # Cắt vòng theta tại một mặt, phần còn lại không còn tuần hoàn
+            dissect(replace(box, axis, start + 1, stop), False)
+            take(replace(box, axis, start, start + 1))
+            return
+
+        if lengths[axis] < 3:
+            take(box)
+            return
+
+        middle = (start + stop) // 2
+        # Mặt phân cách không cắt vòng theta nên hai nửa vẫn giữ cờ tuần hoàn nếu cắt theo r / z
+        dissect(replace(box, axis, start, middle), periodic)
+        dissect(replace(box, axis, middle + 1, stop), periodic)
+        take(replace(box, axis, middle, middle + 1))
+
+    dissect([slice(0, n) for n in shape], periodic_boundary and shape[1] > 2)
+
+    permutation = np.concatenate(blocks)
+    reference = index.size - 1
+    return Output(permutation=permutation[permutation != reference])
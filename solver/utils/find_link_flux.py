@@ -0,0 +1,42 @@
+from dataclasses import dataclass, field
+from typing import List
+import numpy as np
+
+@dataclass
+class Output:
+    potential_difference: List[np.ndarray] = field(default_factory=list)   # P_dưới - P_trên trên từng liên kết
+    flux: List[np.ndarray] = field(default_factory=list)                   # từ thông từ ô dưới sang ô trên
+
+def find_link_potential_difference(potential, axis, periodic_boundary=True):
+    if axis == 1 and periodic_boundary:
+        return potential - np.roll(potential, -1, axis=axis)
+    return np.diff(-potential, axis=axis)
+
+def find_link_flux(potential, conductance, source_flux, periodic_boundary=True):
+    """
+    Từ thông trên mỗi liên kết (quy ước find_face_conductance):
+        phi = c * (P_a - P_b) + source_flux = ((P_a - P_b) + (F_a + F_b)) / (R_a + R_b)
+    giống find_flux_direct: flux_direct[1, n] của ô a = flux_direct[0, n] của ô b = phi.
+    potential: mảng (nr, nt, nz).
+    """
+    result = Output()
+    for axis in range(3):
+        difference = find_link_potential_difference(potential, axis, periodic_boundary)
+        result.potential_difference.append(difference)
+        result.flux.append(conductance[axis] * difference + source_flux[axis])
+    return result
+
+def scatter_link_value(value, axis, shape, periodic_boundary, cells):
+    # Đưa giá trị của mỗi liên kết về ô dưới (cells='lower') hoặc ô trên ('upper') của nó
+    if axis == 1 and periodic_boundary:
+        return value if cells == "lower" else np.roll(value, 1, axis=axis)
+    cell_value = np.zeros(shape)
+    index = [slice(None)] * 3
+    index[axis] = slice(0, shape[axis] - 1) if cells == "lower" else slice(1, None)
+    cell_value[tuple(index)] = value
+    return cell_value
+
+def spread_link_difference(value, axis, shape, periodic_boundary):
+    # D^T: +value vào ô dưới, -value vào ô trên
+    return (scatter_link_value(value, axis, shape, periodic_boundary, "lower")
+            - scatter_link_value(value, axis, shape, periodic_boundary, "upper"))
@@ -0,0 +1,61 @@
+from dataclasses import dataclass, field
+from typing import List, Tuple
+import numpy as np
+from core_class.utils.save_reluctance_network import stack_element_field
+from solver.utils.find_face_conductance import find_face_conductance
+
+@dataclass
+class Output:
+    shape: Tuple[int, int, int] = (1, 1, 1)
+    n_rotor_layer: int = 1
+    periodic_boundary: bool = True
+    # Liên kết bên trong rotor (lớp z < n_rotor_layer) và stator (phần còn lại), quy ước find_face_conductance
+    rotor_conductance: List[np.ndarray] = field(default_factory=list)
+    rotor_source_flux: List[np.ndarray] = field(default_factory=list)
+    stator_conductance: List[np.ndarray] = field(default_factory=list)
+    stator_source_flux: List[np.ndarray] = field(default_factory=list)
+    # Nửa liên kết z hai bên mặt trượt, (nr, nt): mặt trên của lớp rotor cuối, mặt dưới của lớp stator đầu
+    rotor_reluctance: np.ndarray = None
+    rotor_source: np.ndarray = None
+    stator_reluctance: np.ndarray = None
+    stator_source: np.ndarray = None
+
+def find_sliding_interface(reluctance_network, n_rotor_layer, load_factor=1.0):
+    """
+    Tách mạng tại mặt trượt z giữa lớp n_rotor_layer - 1 (rotor) và lớp n_rotor_layer
+    (stator): độ dẫn / thông lượng nguồn của các liên kết bên trong mỗi miền, và nửa
+    từ trở / nguồn z của hai lớp sát mặt trượt để dựng lại liên kết qua mặt khi rotor quay.
+    Mảng theo vị trí hiện tại của rotor (hệ toạ độ stator).
+    """
+    elements = reluctance_network.elements
+    shape = elements.shape
+    nr, nt, nz = shape
+    if not 1 <= n_rotor_layer <= nz - 2:
+        raise ValueError(f"n_rotor_layer must be in [1, {nz - 2}], got {n_rotor_layer}")
+
+    face = find_face_conductance(reluctance_network, load_factor=load_factor)
+    result = Output(shape=tuple(shape),
+                    n_rotor_layer=int(n_rotor_layer),
+                    periodic_boundary=face.periodic_boundary)
+
+    rotor_cells = slice(0, n_rotor_layer)
+    stator_cells = slice(n_rotor_layer, nz)
+    for axis in range(3):
+        if axis == 2:
+            # Liên kết z thứ n_rotor_layer - 1 là liên kết qua mặt trượt
+            rotor_links, stator_links = slice(0, n_rotor_layer - 1), slice(n_rotor_layer, nz - 1)
+        else:
+            rotor_links, stator_links = rotor_cells, stator_cells
+        result.rotor_conductance.append(face.conductance[axis][:, :, rotor_links])
+        result.rotor_source_flux.append(face.source_flux[axis][:, :, rotor_links])
+        result.stator_conductance.append(face.conductance[axis][:, :, stator_links])
+        result.stator_source_flux.append(face.source_flux[axis][:, :, stator_links])
+
+    for name, z, side in (("rotor", n_rotor_layer - 1, 1), ("stator", n_rotor_layer, 0)):
+        element_list = [elements[i, j, z] for j in range(nt) for i in range(nr)]
+        reluctance = stack_element_field(element_list, "reluctance", (nt, nr))
+        magnetic_source = stack_element_field(element_list, "magnetic_source", (nt, nr))
+        setattr(result, f"{name}_reluctance", reluctance[..., side, 2].T.copy())
+        setattr(result, f"{name}_source", magnetic_source[..., side, 2].T * load_factor)
+
+    return result
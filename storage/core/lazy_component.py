@@ -0,0 +1,30 @@
+def set_lazy_component(obj, name, loader):
+    """
+    Đăng ký một thành phần được load khi truy cập lần đầu (obj.name).
+    Lớp của obj cần gọi load_lazy_component trong __getattr__.
+    """
+    obj.__dict__.pop(name, None)
+    obj.__dict__.setdefault("lazy_components", {})[name] = loader
+
+def load_lazy_component(obj, name):
+    lazy_components = obj.__dict__.get("lazy_components")
+    if not lazy_components or name not in lazy_components:
+        raise AttributeError(f"'{type(obj).__name__}' object has no attribute '{name}'")
+
+    loader = lazy_components.pop(name)
+    if name in obj.__dict__:
+        # Đã được gán giá trị mới trước khi load
+        return obj.__dict__[name]
+    value = loader()
+    setattr(obj, name, value)
+    return value
+
+def load_all_lazy_components(obj):
+    """Load mọi thành phần còn chờ, ví dụ trước khi pickle"""
+    lazy_components = obj.__dict__.get("lazy_components")
+    while lazy_components:
+        load_lazy_component(obj, next(iter(lazy_components)))
+    obj.__dict__.pop("lazy_components", None)
+
+def is_lazy_component_loaded(obj, name):
+    return name not in obj.__dict__.get("lazy_components", {})
@@ -1,69 +1,99 @@
 import os
 import pickle
-import sys 
+from storage.models.KeyValueStore import KeyValueStore
 
-# Tên file dữ liệu (nằm cùng thư mục với file script này)
-DATA_FILE_NAME = "workspace.pkl"
+# Thư mục dữ liệu (nằm cùng thư mục với file script này), mỗi biến là một file
+DATA_DIR_NAME = "workspace"
+
+# File pickle cũ (một file chứa toàn bộ workspace), chỉ còn dùng để đọc
+LEGACY_DATA_FILE_NAME = "workspace.pkl"
 
 def _get_data_path():
     """
-    Trả về đường dẫn tuyệt đối của file workspace.pkl
-    Logic: Lấy đường dẫn của file code này -> ghép với tên file pkl
+    Trả về đường dẫn tuyệt đối của thư mục workspace
+    Logic: Lấy đường dẫn của file code này -> ghép với tên thư mục
     """
     # Lấy đường dẫn thư mục hiện tại (thư mục 'core')
     current_dir = os.path.dirname(os.path.abspath(__file__))
-    
-    return os.path.join(current_dir, DATA_FILE_NAME)
+
+    return os.path.join(current_dir, DATA_DIR_NAME)
+
+def _get_legacy_data_path():
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    return os.path.join(current_dir, LEGACY_DATA_FILE_NAME)
+
+def _get_store():
+    return KeyValueStore(_get_data_path())
+
+def _load_legacy():
+    filepath = _get_legacy_data_path()
+    if not os.path.exists(filepath):
+        return {}
+    try:
+        with open(filepath, "rb") as f:
+            return pickle.load(f)
+    except (pickle.UnpicklingError, EOFError, AttributeError, ImportError) as error:
+        # Ví dụ pickle cũ còn tham chiếu lớp đã bị xóa (ElementLite): báo rõ thay vì trả về None
+        raise ValueError(f"Cannot read legacy workspace file '{filepath}' "
+                         f"({type(error).__name__}: {error}). It was written by an older version "
+                         f"of the code: rebuild the objects and save them again, or delete this file.") from error
 
 def save(**kwargs):
     """
-    Lưu biến vào workspace.pkl
+    Lưu biến vào workspace, mỗi biến ghi atomic vào một file riêng.
+    Chỉ các biến được truyền vào bị ghi lại.
+    Motor / ReluctanceNetwork được lưu dạng mảng (thư mục .dir), không pickle đệ quy.
     Ví dụ: workspace.save(x=10, data=[1,2])
     """
-    sys.setrecursionlimit(1000000000)
-    filepath = _get_data_path()
-    data = {}
-    
-    # Load dữ liệu cũ để không bị mất
-    if os.path.exists(filepath):
-        try:
-            with open(filepath, "rb") as f:
-                data = pickle.load(f)
-        except:
-            data = {} # Nếu file lỗi thì reset
-            
-    data.update(kwargs)
-    
-    with open(filepath, "wb") as f:
-        pickle.dump(data, f)
-
-def load(*varnames):
+    store = _get_store()
+
+    for key, value in kwargs.items():
+        store.save(key, value)
+
+def load(*varnames, mmap_mode=None):
     """
-    Load biến từ workspace.pkl
-    Ví dụ: 
+    Load biến từ workspace, chỉ đọc file của các biến được yêu cầu.
+    mmap_mode='r' cho phép memory-map các mảng numpy.
+    Ví dụ:
         val = workspace.load("x")
         x, y = workspace.load("x", "y")
     """
-    filepath = _get_data_path()
-    
-    if not os.path.exists(filepath):
-        return None
+    store = _get_store()
+
+    if not varnames:
+        data = _load_legacy()
+        for key in store.keys():
+            data[key] = store.load(key, mmap_mode=mmap_mode)
+        return data
+
+    legacy_data = None
+    values = []
+    for key in varnames:
+        if key in store:
+            values.append(store.load(key, mmap_mode=mmap_mode))
+        else:
+            # Biến chưa có trong thư mục mới -> tìm trong workspace.pkl cũ
+            if legacy_data is None:
+                legacy_data = _load_legacy()
+            values.append(legacy_data.get(key))
 
-    try:
-        with open(filepath, "rb") as f:
-            data = pickle.load(f)
-    except:
-        return None
-        
     if len(varnames) == 1:
-        return data.get(varnames[0])
-    elif varnames:
-        return tuple(data.get(k) for k in varnames)
-    return data
+        return values[0]
+    return tuple(values)
+
+def keys():
+    """Danh sách các biến đang lưu"""
+    return _get_store().keys()
+
+def delete(*varnames):
+    """Xóa các biến khỏi workspace"""
+    store = _get_store()
+    for key in varnames:
+        store.delete(key)
 
 def clear():
     """Xóa sạch dữ liệu"""
-    filepath = _get_data_path()
+    _get_store().clear()
+    filepath = _get_legacy_data_path()
     if os.path.exists(filepath):
-        with open(filepath, "wb") as f:
-            pickle.dump({}, f)
\ No newline at end of file
+        os.remove(filepath)
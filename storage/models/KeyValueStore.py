@@ -0,0 +1,153 @@
+import os
+import re
+import pickle
+import shutil
+import importlib
+import tempfile
+import numpy as np
+
+KEY_PATTERN = re.compile(r"^[A-Za-z0-9_.\-]+$")
+
+NUMPY_EXTENSION = ".npy"
+PICKLE_EXTENSION = ".pkl"
+DIRECTORY_EXTENSION = ".dir"
+
+# File ghi lớp của đối tượng bên trong thư mục .dir
+CLASS_MARKER_NAME = "__class__.pkl"
+
+
+class KeyValueStore:
+    """
+    Kho lưu trữ theo thư mục: mỗi key là một file riêng.
+    - Mảng numpy (dtype không phải object) lưu dạng .npy, có thể memory-map khi load.
+    - Đối tượng có thuộc tính lớp array_native_storage = True (motor, reluctance network)
+      tự lưu vào thư mục .dir bằng phương thức save(path)/load(path) của lớp đó.
+    - Các đối tượng khác lưu dạng .pkl.
+    Mọi thao tác ghi đều atomic (ghi ra file tạm rồi os.replace), nên một lần ghi
+    bị ngắt giữa chừng không làm hỏng dữ liệu đã có.
+    """
+
+    def __init__(self, root):
+        self.root = os.path.abspath(root)
+        os.makedirs(self.root, exist_ok=True)
+
+    def _check_key(self, key):
+        if not isinstance(key, str) or not KEY_PATTERN.match(key):
+            raise ValueError(f"Invalid key '{key}': use letters, digits, '_', '-' or '.'")
+
+    def _path(self, key, extension):
+        return os.path.join(self.root, key + extension)
+
+    def _find_path(self, key):
+        candidates = [self._path(key, ext) for ext in (NUMPY_EXTENSION, PICKLE_EXTENSION, DIRECTORY_EXTENSION)]
+        candidates = [path for path in candidates if os.path.exists(path)]
+        if not candidates:
+            return None
+        # Nếu còn sót cả hai định dạng (bị ngắt khi đổi định dạng) thì lấy file mới nhất
+        return max(candidates, key=os.path.getmtime)
+
+    def _atomic_write(self, path, write):
+        file_descriptor, temp_path = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+        try:
+            with os.fdopen(file_descriptor, "wb") as f:
+                write(f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def _save_directory(self, key, value):
+        # Ghi vào thư mục tạm, sau đó mới thay thế thư mục cũ
+        temp_path = tempfile.mkdtemp(dir=self.root, suffix=".tmp")
+        try:
+            value.save(temp_path)
+            with open(os.path.join(temp_path, CLASS_MARKER_NAME), "wb") as f:
+                pickle.dump((type(value).__module__, type(value).__qualname__), f)
+        except BaseException:
+            shutil.rmtree(temp_path, ignore_errors=True)
+            raise
+
+        path = self._path(key, DIRECTORY_EXTENSION)
+        if os.path.exists(path):
+            old_path = tempfile.mkdtemp(dir=self.root, suffix=".tmp")
+            os.rmdir(old_path)
+            os.rename(path, old_path)
+            os.rename(temp_path, path)
+            shutil.rmtree(old_path, ignore_errors=True)
+        else:
+            os.rename(temp_path, path)
+
+    def _load_directory(self, path):
+        with open(os.path.join(path, CLASS_MARKER_NAME), "rb") as f:
+            module_name, class_name = pickle.load(f)
+        value_class = importlib.import_module(module_name)
+        for name in class_name.split("."):
+            value_class = getattr(value_class, name)
+        return value_class.load(path)
+
+    def _remove_path(self, path):
+        if os.path.isdir(path):
+            shutil.rmtree(path)
+        elif os.path.exists(path):
+            os.remove(path)
+
+    def save(self, key, value):
+        self._check_key(key)
+
+        if getattr(type(value), "array_native_storage", False):
+            self._save_directory(key, value)
+            kept_extension = DIRECTORY_EXTENSION
+        elif isinstance(value, np.ndarray) and value.dtype != object:
+            path = self._path(key, NUMPY_EXTENSION)
+            self._atomic_write(path, lambda f: np.save(f, value, allow_pickle=False))
+            kept_extension = NUMPY_EXTENSION
+        else:
+            path = self._path(key, PICKLE_EXTENSION)
+            self._atomic_write(path, lambda f: pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL))
+            kept_extension = PICKLE_EXTENSION
+
+        for extension in (NUMPY_EXTENSION, PICKLE_EXTENSION, DIRECTORY_EXTENSION):
+            if extension != kept_extension:
+                self._remove_path(self._path(key, extension))
+
+    def load(self, key, default=None, mmap_mode=None):
+        """
+        Chỉ đọc file của key được yêu cầu.
+        mmap_mode ('r', 'r+', 'c') áp dụng cho dữ liệu numpy.
+        """
+        self._check_key(key)
+        path = self._find_path(key)
+        if path is None:
+            return default
+
+        if path.endswith(DIRECTORY_EXTENSION):
+            return self._load_directory(path)
+
+        if path.endswith(NUMPY_EXTENSION):
+            return np.load(path, mmap_mode=mmap_mode, allow_pickle=False)
+
+        with open(path, "rb") as f:
+            return pickle.load(f)
+
+    def keys(self):
+        keys = set()
+        for name in os.listdir(self.root):
+            key, extension = os.path.splitext(name)
+            if extension in (NUMPY_EXTENSION, PICKLE_EXTENSION, DIRECTORY_EXTENSION):
+                keys.add(key)
+        return sorted(keys)
+
+    def delete(self, key):
+        self._check_key(key)
+        for extension in (NUMPY_EXTENSION, PICKLE_EXTENSION, DIRECTORY_EXTENSION):
+            self._remove_path(self._path(key, extension))
+
+    def clear(self):
+        for key in self.keys():
+            self.delete(key)
+
+    def __contains__(self, key):
+        return self._find_path(key) is not None
@@ -0,0 +1,77 @@
+import os
+import re
+import tempfile
+import numpy as np
+
+CACHE_EXTENSION = ".npz"
+KEY_PATTERN = re.compile(r"^[0-9a-f]+$")
+
+
+class SolveCache:
+    """
+    Cache kết quả giải theo nội dung: mỗi key (mã băm đầu vào) là một file .npz
+    chứa thế từ và các trường dẫn xuất. Thời gian truy cập được ghi vào mtime;
+    khi tổng dung lượng vượt max_bytes, các entry dùng lâu nhất bị xóa (LRU).
+    """
+
+    def __init__(self, root, max_bytes=2 * 1024 ** 3):
+        self.root = os.path.abspath(root)
+        self.max_bytes = max_bytes
+        os.makedirs(self.root, exist_ok=True)
+
+    def _path(self, key):
+        if not KEY_PATTERN.match(key):
+            raise ValueError(f"Invalid cache key '{key}'")
+        return os.path.join(self.root, key + CACHE_EXTENSION)
+
+    def load(self, key):
+        """Trả về dict các mảng, hoặc None nếu không có trong cache"""
+        path = self._path(key)
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                entry = {name: data[name] for name in data.files}
+        except (FileNotFoundError, ValueError, OSError):
+            return None
+        # Đánh dấu vừa được dùng
+        os.utime(path)
+        return entry
+
+    def save(self, key, **arrays):
+        path = self._path(key)
+        file_descriptor, temp_path = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+        try:
+            with os.fdopen(file_descriptor, "wb") as f:
+                np.savez(f, **arrays)
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        self.evict()
+
+    def evict(self):
+        entries = []
+        for name in os.listdir(self.root):
+            if name.endswith(CACHE_EXTENSION):
+                path = os.path.join(self.root, name)
+                status = os.stat(path)
+                entries.append((status.st_mtime, status.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            os.remove(path)
+            total -= size
+
+    def size(self):
+        return sum(os.path.getsize(os.path.join(self.root, name))
+                   for name in os.listdir(self.root) if name.endswith(CACHE_EXTENSION))
+
+    def __contains__(self, key):
+        return os.path.exists(self._path(key))
+
+    def clear(self):
+        for name in os.listdir(self.root):
+            if name.endswith(CACHE_EXTENSION):
+                os.remove(os.path.join(self.root, name))
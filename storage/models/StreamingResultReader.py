@@ -0,0 +1,69 @@
+import io
+import os
+import json
+import numpy as np
+
+DATA_FILE_NAME = "results.bin"
+INDEX_FILE_NAME = "index.jsonl"
+
+
+class StreamingResultReader:
+    """
+    Đọc thư mục kết quả của StreamingResultWriter mà không sửa gì trên đĩa: không
+    cắt dữ liệu dở dang, không viết lại index, không có luồng nền. Dùng được khi
+    một sweep khác đang ghi vào cùng thư mục; chỉ thấy các case đã có dòng index
+    đầy đủ lúc mở (dòng dở dang và mọi thứ sau nó bị bỏ qua).
+    """
+
+    def __init__(self, root):
+        self.root = os.path.abspath(root)
+        self.data_path = os.path.join(self.root, DATA_FILE_NAME)
+        self.index_path = os.path.join(self.root, INDEX_FILE_NAME)
+        self.index = self._read_index()
+
+    def _read_index(self):
+        # self._index_torn: có dòng ghi dở (không parse được hoặc thiếu ký tự xuống dòng)
+        index = {}
+        self._index_torn = False
+        if not os.path.exists(self.index_path):
+            return index
+        with open(self.index_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # Dòng cuối bị ghi dở, bỏ nó và mọi thứ sau nó
+                    self._index_torn = True
+                    break
+                index[record["case_id"]] = record
+                if not line.endswith("\n"):
+                    # Dòng đủ nhưng thiếu "\n": dòng nối tiếp sẽ bị dính vào nó
+                    self._index_torn = True
+        return index
+
+    def completed_cases(self):
+        return list(self.index.keys())
+
+    def is_completed(self, case_id):
+        return str(case_id) in self.index
+
+    def load(self, case_id):
+        """Đọc lại mảng của một case đã hoàn thành"""
+        record = self.index[str(case_id)]
+        with open(self.data_path, "rb") as f:
+            f.seek(record["offset"])
+            payload = f.read(record["size"])
+        with np.load(io.BytesIO(payload), allow_pickle=False) as data:
+            return {name: data[name] for name in data.files}
+
+    def info(self, case_id):
+        return self.index[str(case_id)]["info"]
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,119 @@
+import io
+import os
+import json
+import queue
+import threading
+import numpy as np
+from storage.models.StreamingResultReader import StreamingResultReader
+
+
+class StreamingResultWriter(StreamingResultReader):
+    """
+    File kết quả chỉ ghi nối (append-only) cho các sweep dài.
+    - results.bin: các bản ghi .npz nối tiếp nhau.
+    - index.jsonl: mỗi dòng ghi case_id, offset, size của một bản ghi đã ghi xong.
+    Một case chỉ được coi là hoàn thành khi dòng index của nó đã được fsync, nên
+    khi job bị dừng giữa chừng, phần dữ liệu dở dang bị cắt bỏ lúc mở lại.
+    Việc ghi chạy trên luồng nền, write() chỉ đưa dữ liệu vào hàng đợi.
+    Chỉ đọc kết quả thì dùng StreamingResultReader (không cắt, không viết lại file).
+    """
+
+    def __init__(self, root, max_pending=4):
+        os.makedirs(root, exist_ok=True)
+        super().__init__(root)
+        self._truncate_incomplete()
+
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._error = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _truncate_incomplete(self):
+        end = max((record["offset"] + record["size"] for record in self.index.values()), default=0)
+        if os.path.exists(self.data_path) and os.path.getsize(self.data_path) > end:
+            with open(self.data_path, "r+b") as f:
+                f.truncate(end)
+                f.flush()
+                os.fsync(f.fileno())
+
+        if self._index_torn:
+            # Viết index sạch ra file tạm rồi thay thế nguyên tử: bị dừng giữa chừng
+            # thì vẫn còn index cũ (có dòng dở, sẽ được bỏ qua lần mở sau)
+            temporary_path = self.index_path + ".tmp"
+            with open(temporary_path, "w", encoding="utf-8") as f:
+                for record in self.index.values():
+                    f.write(json.dumps(record) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temporary_path, self.index_path)
+            self._fsync_directory()
+            self._index_torn = False
+
+    def _fsync_directory(self):
+        # Ghi nhận phép os.replace; Windows không mở được thư mục để fsync
+        if os.name == "nt":
+            return
+        descriptor = os.open(self.root, os.O_RDONLY)
+        try:
+            os.fsync(descriptor)
+        finally:
+            os.close(descriptor)
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                if self._error is None:
+                    self._append(*item)
+            except BaseException as error:
+                self._error = error
+            finally:
+                self._queue.task_done()
+
+    def _append(self, case_id, arrays, info):
+        buffer = io.BytesIO()
+        np.savez(buffer, **arrays)
+        payload = buffer.getvalue()
+
+        with open(self.data_path, "ab") as f:
+            offset = f.tell()
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+
+        record = {"case_id": case_id, "offset": offset, "size": len(payload), "info": info}
+        with open(self.index_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self.index[case_id] = record
+
+    def _raise_error(self):
+        if self._error is not None:
+            raise RuntimeError("Background result writer failed") from self._error
+
+    def write(self, case_id, info=None, **arrays):
+        """
+        Đưa kết quả của một case vào hàng đợi ghi. Mảng được copy ngay nên
+        solver có thể tiếp tục sửa dữ liệu gốc. info: dict nhỏ dạng JSON.
+        """
+        self._raise_error()
+        arrays = {name: np.array(value) for name, value in arrays.items()}
+        self._queue.put((str(case_id), arrays, info or {}))
+
+    def flush(self):
+        """Chờ mọi case trong hàng đợi được ghi xuống đĩa"""
+        self._queue.join()
+        self._raise_error()
+
+    def close(self):
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+        self._raise_error()
+
+    def completed_cases(self):
+        self.flush()
+        return list(self.index.keys())
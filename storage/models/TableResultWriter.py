@@ -0,0 +1,86 @@
+import os
+import csv
+import io
+
+
+class TableResultWriter:
+    """
+    Bảng kết quả CSV chỉ ghi nối (append-only), mỗi dòng một case.
+    - Cột cố định khi tạo file (dòng tiêu đề), mở lại file cũ phải cùng cột.
+    - key_column: cột định danh case, dùng để bỏ qua case đã xong khi chạy lại.
+    - status_column: nếu bảng có cột này, chỉ dòng có giá trị completed_status được
+      tính là đã xong; case lỗi (kể cả lỗi tạm thời) được giải lại ở lần chạy sau.
+    Mỗi dòng được fsync ngay sau khi ghi; dòng cuối ghi dở (job bị dừng giữa chừng)
+    bị cắt bỏ lúc mở lại.
+    """
+
+    def __init__(self, path, columns, key_column="case_id", status_column="status", completed_status="ok"):
+        self.path = os.path.abspath(path)
+        self.columns = list(columns)
+        self.key_column = key_column
+        self.status_column = status_column if status_column in self.columns else None
+        self.completed_status = completed_status
+        if key_column not in self.columns:
+            raise ValueError(f"key_column '{key_column}' is not in columns")
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.completed = set()
+        if os.path.exists(self.path) and os.path.getsize(self.path) > 0:
+            self._truncate_incomplete()
+            self._read_existing()
+        else:
+            with open(self.path, "w", encoding="utf-8", newline="") as f:
+                f.write(self._format_row(self.columns))
+                f.flush()
+                os.fsync(f.fileno())
+
+    def _truncate_incomplete(self):
+        # Cắt phần sau ký tự xuống dòng cuối cùng (dòng ghi dở)
+        with open(self.path, "rb") as f:
+            data = f.read()
+        end = data.rfind(b"\n") + 1
+        if end < len(data):
+            with open(self.path, "r+b") as f:
+                f.truncate(end)
+
+    def _read_existing(self):
+        with open(self.path, "r", encoding="utf-8", newline="") as f:
+            reader = csv.reader(f)
+            header = next(reader, None)
+            if header != self.columns:
+                raise ValueError(f"Columns of existing table '{self.path}' do not match")
+            key_index = self.columns.index(self.key_column)
+            status_index = None if self.status_column is None else self.columns.index(self.status_column)
+            for row in reader:
+                if status_index is None or row[status_index] == self.completed_status:
+                    self.completed.add(row[key_index])
+
+    def _format_row(self, values):
+        buffer = io.StringIO()
+        csv.writer(buffer, lineterminator="\n").writerow(values)
+        return buffer.getvalue()
+
+    def write(self, row):
+        """Ghi một dòng (dict theo tên cột, cột thiếu để trống)"""
+        unknown = set(row) - set(self.columns)
+        if unknown:
+            raise ValueError(f"Unknown columns: {sorted(unknown)}")
+        values = ["" if row.get(name) is None else row.get(name) for name in self.columns]
+
+        with open(self.path, "a", encoding="utf-8", newline="") as f:
+            f.write(self._format_row(values))
+            f.flush()
+            os.fsync(f.fileno())
+        if self.status_column is None or str(row.get(self.status_column)) == self.completed_status:
+            self.completed.add(str(row[self.key_column]))
+
+    def is_completed(self, key):
+        return str(key) in self.completed
+
+    def read(self):
+        """Toàn bộ bảng: list dict (giá trị dạng chuỗi như trong CSV)"""
+        with open(self.path, "r", encoding="utf-8", newline="") as f:
+            return list(csv.DictReader(f))
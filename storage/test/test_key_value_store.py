@@ -0,0 +1,75 @@
+import sys
+import os
+import tempfile
+import numpy as np
+import paths
+
+class ArrayNative:
+    array_native_storage = True
+
+    def __init__(self, data):
+        self.data = data
+
+    def save(self, path):
+        np.save(os.path.join(path, "data.npy"), self.data)
+
+    @staticmethod
+    def load(path):
+        return ArrayNative(np.load(os.path.join(path, "data.npy")))
+
+def test():
+    from storage.models.KeyValueStore import KeyValueStore
+
+    with tempfile.TemporaryDirectory() as root:
+        store = KeyValueStore(root)
+
+        data = np.arange(12, dtype=float).reshape(3, 4)
+        store.save("potential", data)
+        store.save("settings", {"method": "conjugate_gradient", "max_iteration": 7})
+
+        assert store.keys() == ["potential", "settings"]
+        assert os.path.exists(os.path.join(root, "potential.npy"))
+
+        mapped = store.load("potential", mmap_mode="r")
+        assert isinstance(mapped, np.memmap)
+        assert np.array_equal(mapped, data)
+        del mapped
+
+        assert store.load("settings")["max_iteration"] == 7
+        assert store.load("missing") is None
+
+        # Đổi định dạng: file cũ của key phải bị xóa
+        store.save("potential", [1, 2, 3])
+        assert not os.path.exists(os.path.join(root, "potential.npy"))
+        assert store.load("potential") == [1, 2, 3]
+
+        # Đối tượng array_native_storage lưu thành thư mục .dir
+        store.save("network", ArrayNative(data))
+        assert os.path.isdir(os.path.join(root, "network.dir"))
+        assert np.array_equal(store.load("network").data, data)
+        store.save("network", ArrayNative(2 * data))
+        assert np.array_equal(store.load("network").data, 2 * data)
+        store.delete("network")
+        assert not os.path.exists(os.path.join(root, "network.dir"))
+
+        store.delete("settings")
+        assert "settings" not in store
+        assert not any(name.endswith(".tmp") for name in os.listdir(root))
+
+        try:
+            store.save("../outside", 1)
+            assert False, "invalid key must raise"
+        except ValueError:
+            pass
+
+        store.clear()
+        assert store.keys() == []
+
+if __name__ == "__main__":
+    current_file = os.path.abspath(__file__)
+    root_dir = os.path.dirname(os.path.dirname(os.path.dirname(current_file)))
+
+    if root_dir not in sys.path:
+        sys.path.append(root_dir)
+
+    test()
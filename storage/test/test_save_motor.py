@@ -0,0 +1,116 @@
+import sys
+import os
+import tempfile
+import numpy as np
+import paths
+
+MESH = dict(n_r_in=2, n_r_1=2, n_r_2=3, n_r_3=2, n_r_out=2, n_theta=13,
+            n_z_in_air=2, n_z_rotor_yoke=2, n_z_magnet=2, n_z_airgap=2,
+            n_z_tooth_tip_1=2, n_z_tooth_tip_2=2, n_z_tooth_body=3, n_z_stator_yoke=2, n_z_out_air=2)
+WINDING_CURRENT = [5.0, -2.5, -2.5]
+SOLVER = dict(method="newton", max_iteration=50, max_relative_residual=1e-12, load_step=1, debug=False)
+
+def create_motor():
+    from motor_type.models.AxialFluxMotorType1 import AxialFluxMotorType1
+
+    motor = AxialFluxMotorType1(magnet_length=4e-3, airgap=0.5e-3)
+    motor.create_geometry()
+    motor.create_adaptive_mesh(**MESH)
+    motor.create_reluctance_network()
+    motor.rotate_rotor(2)
+    motor.reluctance_network.update_reluctance_network(magnetic_potential=motor.reluctance_network.magnetic_potential,
+                                                       winding_current=np.array(WINDING_CURRENT))
+    motor.reluctance_network.solve_magnetic_equation(**SOLVER)
+    return motor
+
+def find_element_field(reluctance_network, name):
+    return np.array([getattr(element, name) for element in reluctance_network.elements.ravel(order='F')])
+
+def check_same_network(network, reference):
+    assert network.elements.shape == reference.elements.shape
+    assert np.array_equal(network.magnetic_potential.data, reference.magnetic_potential.data)
+    assert np.array_equal(network.material_ids, reference.material_ids)
+    assert np.array_equal(find_element_field(network, "material_id"), find_element_field(reference, "material_id"))
+    for name in ("reluctance", "magnetic_source", "flux_density_average"):
+        assert np.array_equal(find_element_field(network, name), find_element_field(reference, name)), name
+    assert np.array_equal(network.winding_current, reference.winding_current)
+    assert len(network.solution_history) == len(reference.solution_history)
+    assert np.array_equal(np.asarray(network.solution_history.data[:len(network.solution_history)]),
+                          np.asarray(reference.solution_history.data[:len(reference.solution_history)]))
+
+def check_resolve(network, reference):
+    # Giải lại từ trạng thái đã load cho cùng nghiệm với mạng gốc
+    network.solve_magnetic_equation(**SOLVER)
+    reference.solve_magnetic_equation(**SOLVER)
+    scale = np.max(np.abs(reference.magnetic_potential.data))
+    assert np.allclose(network.magnetic_potential.data, reference.magnetic_potential.data, rtol=0, atol=1e-9 * scale)
+
+def fail_material_database(*args, **kwargs):
+    raise AssertionError("load_motor must not rebuild the MaterialDataBase")
+
+def check_lazy_load(motor_path, motor):
+    from motor_type.models.AxialFluxMotorType1 import AxialFluxMotorType1
+    from material.models.MaterialDataBase import MaterialDataBase
+    from storage.core.lazy_component import is_lazy_component_loaded
+
+    constructor = MaterialDataBase.__init__
+    MaterialDataBase.__init__ = fail_material_database
+    try:
+        loaded = AxialFluxMotorType1.load(motor_path)
+    finally:
+        MaterialDataBase.__init__ = constructor
+
+    # Trạng thái motor có ngay, các thành phần lớn chưa được đọc
+    assert loaded.symmetry_factor == motor.symmetry_factor and loaded.rotor_offset == motor.rotor_offset
+    assert np.array_equal(loaded.winding_matrix, motor.winding_matrix)
+    assert loaded.material_database.iron.name == motor.material_database.iron.name
+    for name in ("geometry", "mesh", "reluctance_network"):
+        assert not is_lazy_component_loaded(loaded, name), name
+
+    # Mạng từ trở load khi truy cập, elements / lịch sử / geometry vẫn chờ
+    network = loaded.reluctance_network
+    assert is_lazy_component_loaded(loaded, "mesh") and not is_lazy_component_loaded(loaded, "geometry")
+    for name in ("elements", "solution_history", "geometry"):
+        assert not is_lazy_component_loaded(network, name), name
+    assert len(network.solution_history) == len(motor.reluctance_network.solution_history)
+    assert not is_lazy_component_loaded(network, "elements")
+    assert network.elements.shape == motor.reluctance_network.elements.shape
+
+def test():
+    from motor_type.models.AxialFluxMotorType1 import AxialFluxMotorType1
+    from core_class.utils.save_reluctance_network import save_reluctance_network
+    from core_class.utils.load_reluctance_network import load_reluctance_network
+
+    motor = create_motor()
+    with tempfile.TemporaryDirectory() as root:
+        # Mạng từ trở lưu riêng: có mesh của chính nó
+        network_path = os.path.join(root, "network")
+        save_reluctance_network(motor.reluctance_network, network_path)
+        assert os.path.isdir(os.path.join(network_path, "mesh"))
+        network = load_reluctance_network(network_path, lazy=False)
+        check_same_network(network, motor.reluctance_network)
+
+        # Motor: mesh chỉ lưu một lần, mạng dùng chung mesh của motor khi load
+        motor_path = os.path.join(root, "motor")
+        motor.save(motor_path)
+        assert os.path.isdir(os.path.join(motor_path, "mesh"))
+        assert not os.path.isdir(os.path.join(motor_path, "reluctance_network", "mesh"))
+        loaded = AxialFluxMotorType1.load(motor_path)
+        assert loaded.rotor_offset == motor.rotor_offset
+        assert loaded.reluctance_network.mesh is loaded.mesh
+        assert np.array_equal(loaded.mesh.theta_nodes, motor.mesh.theta_nodes)
+        check_same_network(loaded.reluctance_network, motor.reluctance_network)
+        assert np.isclose(loaded.find_torque().torque, motor.find_torque().torque, rtol=1e-12, atol=0)
+
+        check_lazy_load(motor_path, motor)
+        check_resolve(network, motor.reluctance_network)
+        check_resolve(loaded.reluctance_network, motor.reluctance_network)
+
+if __name__ == "__main__":
+    current_file = os.path.abspath(__file__)
+    root_dir = os.path.dirname(os.path.dirname(os.path.dirname(current_file)))
+
+    if root_dir not in sys.path:
+        sys.path.append(root_dir)
+
+    test()
@@ -0,0 +1,40 @@
+import sys
+import os
+import time
+import tempfile
+import numpy as np
+import paths
+
+def test():
+    from storage.models.SolveCache import SolveCache
+
+    with tempfile.TemporaryDirectory() as root:
+        cache = SolveCache(root)
+        potential = np.arange(1000, dtype=float)
+
+        for key in ["aa", "bb", "cc"]:
+            cache.save(key, potential=potential)
+            time.sleep(0.01)
+        assert cache.load("dd") is None
+        assert np.array_equal(cache.load("aa")["potential"], potential)
+
+        # "aa" vừa được dùng nên "bb" là entry cũ nhất và bị xóa trước
+        entry_size = cache.size() // 3
+        cache.max_bytes = 2 * entry_size
+        cache.evict()
+        assert "aa" in cache and "cc" in cache and "bb" not in cache
+
+        try:
+            cache.load("../outside")
+            assert False, "invalid key must raise"
+        except ValueError:
+            pass
+
+if __name__ == "__main__":
+    current_file = os.path.abspath(__file__)
+    root_dir = os.path.dirname(os.path.dirname(os.path.dirname(current_file)))
+
+    if root_dir not in sys.path:
+        sys.path.append(root_dir)
+
+    test()
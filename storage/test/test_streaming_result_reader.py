@@ -0,0 +1,43 @@
+import sys
+import os
+import tempfile
+import numpy as np
+import paths
+
+def test():
+    from storage.models.StreamingResultReader import StreamingResultReader
+    from storage.models.StreamingResultWriter import StreamingResultWriter
+
+    with tempfile.TemporaryDirectory() as root:
+        with StreamingResultWriter(root) as writer:
+            for case in range(2):
+                writer.write(case, info={"torque": 0.1 * case}, potential=np.full((2, 3), case, dtype=float))
+
+        # Sweep đang ghi dở: reader không được cắt hay viết lại file
+        with open(os.path.join(root, "results.bin"), "ab") as f:
+            f.write(b"partial")
+        with open(os.path.join(root, "index.jsonl"), "a") as f:
+            f.write('{"case_id": "2", "off')
+        content = {}
+        for name in ("results.bin", "index.jsonl"):
+            with open(os.path.join(root, name), "rb") as f:
+                content[name] = f.read()
+
+        with StreamingResultReader(root) as reader:
+            assert reader.completed_cases() == ["0", "1"]
+            assert not reader.is_completed(2)
+            assert np.array_equal(reader.load(1)["potential"], np.full((2, 3), 1.0))
+            assert abs(reader.info(1)["torque"] - 0.1) < 1e-12
+
+        for name, data in content.items():
+            with open(os.path.join(root, name), "rb") as f:
+                assert f.read() == data
+
+if __name__ == "__main__":
+    current_file = os.path.abspath(__file__)
+    root_dir = os.path.dirname(os.path.dirname(os.path.dirname(current_file)))
+
+    if root_dir not in sys.path:
+        sys.path.append(root_dir)
+
+    test()
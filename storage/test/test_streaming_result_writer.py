@@ -0,0 +1,54 @@
+import sys
+import os
+import json
+import tempfile
+import numpy as np
+import paths
+
+def test():
+    from storage.models.StreamingResultWriter import StreamingResultWriter
+
+    with tempfile.TemporaryDirectory() as root:
+        with StreamingResultWriter(root) as writer:
+            for case in range(3):
+                writer.write(case, info={"torque": 0.1 * case}, potential=np.full((2, 3), case, dtype=float))
+            assert writer.completed_cases() == ["0", "1", "2"]
+
+        # Mở lại khi không có gì dở dang: index giữ nguyên, không viết lại
+        index_path = os.path.join(root, "index.jsonl")
+        before = os.stat(index_path)
+        with open(index_path, "rb") as f:
+            content = f.read()
+        StreamingResultWriter(root).close()
+        with open(index_path, "rb") as f:
+            assert f.read() == content
+        assert os.stat(index_path).st_ino == before.st_ino
+
+        # Mô phỏng job bị dừng khi đang ghi: dữ liệu và dòng index dở dang
+        with open(os.path.join(root, "results.bin"), "ab") as f:
+            f.write(b"partial")
+        with open(os.path.join(root, "index.jsonl"), "a") as f:
+            f.write('{"case_id": "3", "off')
+
+        with StreamingResultWriter(root) as writer:
+            assert writer.completed_cases() == ["0", "1", "2"]
+            assert not writer.is_completed(3)
+            writer.write(3, potential=np.ones((2, 3)))
+        assert not os.path.exists(index_path + ".tmp")
+        with open(index_path, "r") as f:
+            assert [json.loads(line)["case_id"] for line in f] == ["0", "1", "2", "3"]
+
+        writer = StreamingResultWriter(root)
+        assert np.array_equal(writer.load(1)["potential"], np.full((2, 3), 1.0))
+        assert np.array_equal(writer.load(3)["potential"], np.ones((2, 3)))
+        assert abs(writer.info(2)["torque"] - 0.2) < 1e-12
+        writer.close()
+
+if __name__ == "__main__":
+    current_file = os.path.abspath(__file__)
+    root_dir = os.path.dirname(os.path.dirname(os.path.dirname(current_file)))
+
+    if root_dir not in sys.path:
+        sys.path.append(root_dir)
+
+    test()
@@ -0,0 +1,61 @@
+import sys
+import os
+import tempfile
+import paths
+
+def test():
+    from storage.models.TableResultWriter import TableResultWriter
+
+    columns = ["case_id", "airgap", "torque"]
+    with tempfile.TemporaryDirectory() as root:
+        path = os.path.join(root, "study", "results.csv")
+        writer = TableResultWriter(path, columns)
+        for case in range(3):
+            writer.write({"case_id": f"d{case}", "airgap": 1e-3 * (case + 1), "torque": 0.5 * case})
+
+        # Mô phỏng job bị dừng khi đang ghi một dòng
+        with open(path, "a", encoding="utf-8") as f:
+            f.write("d3,0.004")
+
+        writer = TableResultWriter(path, columns)
+        assert writer.is_completed("d2")
+        assert not writer.is_completed("d3")
+        writer.write({"case_id": "d3", "airgap": 4e-3})
+
+        rows = TableResultWriter(path, columns).read()
+        assert [row["case_id"] for row in rows] == ["d0", "d1", "d2", "d3"]
+        assert float(rows[1]["torque"]) == 0.5
+        assert rows[3]["torque"] == ""
+
+        try:
+            TableResultWriter(path, ["case_id", "torque"])
+            assert False, "mismatched columns must be rejected"
+        except ValueError:
+            pass
+
+        check_failed_rows_are_retried(root)
+
+def check_failed_rows_are_retried(root):
+    from storage.models.TableResultWriter import TableResultWriter
+
+    columns = ["case_id", "status", "torque"]
+    path = os.path.join(root, "status.csv")
+    writer = TableResultWriter(path, columns)
+    writer.write({"case_id": "d0", "status": "ok", "torque": 1.0})
+    writer.write({"case_id": "d1", "status": "failed"})
+    assert writer.is_completed("d0") and not writer.is_completed("d1")
+
+    # Chạy lại: case lỗi chưa xong, giải lại thành công thì được tính là xong
+    writer = TableResultWriter(path, columns)
+    assert writer.is_completed("d0") and not writer.is_completed("d1")
+    writer.write({"case_id": "d1", "status": "ok", "torque": 2.0})
+    assert TableResultWriter(path, columns).is_completed("d1")
+
+if __name__ == "__main__":
+    current_file = os.path.abspath(__file__)
+    root_dir = os.path.dirname(os.path.dirname(os.path.dirname(current_file)))
+
+    if root_dir not in sys.path:
+        sys.path.append(root_dir)
+
+    test()
@@ -0,0 +1,41 @@
+import sys
+import os
+import pickle
+import tempfile
+import paths
+
+def test():
+    from storage.core import workspace
+
+    data_path, legacy_data_path = workspace._get_data_path, workspace._get_legacy_data_path
+    with tempfile.TemporaryDirectory() as root:
+        legacy_path = os.path.join(root, "workspace.pkl")
+        workspace._get_data_path = lambda: os.path.join(root, "workspace")
+        workspace._get_legacy_data_path = lambda: legacy_path
+        try:
+            # Biến chưa có trong thư mục mới được đọc từ workspace.pkl cũ
+            with open(legacy_path, "wb") as f:
+                pickle.dump({"old": [1, 2]}, f)
+            workspace.save(x=10)
+            assert workspace.load("x", "old") == (10, [1, 2])
+
+            # Pickle cũ tham chiếu lớp đã bị xóa: báo lỗi kèm nguyên nhân, không trả về None
+            with open(legacy_path, "wb") as f:
+                f.write(b"\x80\x04ccore_class.models.ElementLite\nElementLite\n.")
+            assert workspace.load("x") == 10
+            try:
+                workspace.load("aft1")
+                assert False, "unreadable legacy workspace must raise"
+            except ValueError as error:
+                assert "ElementLite" in str(error) and isinstance(error.__cause__, ImportError)
+        finally:
+            workspace._get_data_path, workspace._get_legacy_data_path = data_path, legacy_data_path
+
+if __name__ == "__main__":
+    current_file = os.path.abspath(__file__)
+    root_dir = os.path.dirname(os.path.dirname(os.path.dirname(current_file)))
+
+    if root_dir not in sys.path:
+        sys.path.append(root_dir)
+
+    test()
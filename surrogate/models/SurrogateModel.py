@@ -0,0 +1,141 @@
+from dataclasses import dataclass, field
+from typing import Dict
+import warnings
+import numpy as np
+from sklearn.exceptions import ConvergenceWarning
+from sklearn.gaussian_process import GaussianProcessRegressor
+from sklearn.gaussian_process.kernels import ConstantKernel, Matern, WhiteKernel
+from storage.models.KeyValueStore import KeyValueStore
+
+STORE_KEY = "surrogate_model"
+
+@dataclass
+class Prediction:
+    mean: Dict[str, np.ndarray] = field(default_factory=dict)  # giá trị dự đoán của từng output
+    std: Dict[str, np.ndarray] = field(default_factory=dict)   # độ lệch chuẩn (ước lượng sai số) của từng output
+
+class SurrogateModel:
+    """
+    Mô hình thay thế cho kết quả solver: mỗi output (vd. average_torque, torque_ripple,
+    flux_linkage_peak_1) là một Gaussian process trên các inputs (tham số thiết kế,
+    dòng điện pha), kernel Matern với độ dài riêng theo từng input + nhiễu trắng.
+    Inputs được chuẩn hóa về [0, 1] theo khoảng của dữ liệu huấn luyện; input phân loại
+    (giá trị chuỗi, vd. loại thép) được mã hóa one-hot theo các mức có khi huấn luyện.
+    Dữ liệu là list dict, vd. find_operating_point_table(...).rows.
+    """
+
+    def __init__(self, inputs, outputs, nu=2.5, n_restarts_optimizer=2, seed=0):
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+        self.nu = nu
+        self.n_restarts_optimizer = n_restarts_optimizer
+        self.seed = seed
+
+        self.categories = {}        # input phân loại -> các mức (cột one-hot), xác định khi fit
+        self.input_low = None
+        self.input_scale = None
+        self.regressors = {}
+        self.output_scale = {}      # độ lệch chuẩn của output trên dữ liệu huấn luyện
+        self.n_train = {}
+
+    def find_categories(self, rows):
+        # Input có giá trị chuỗi ở bất kỳ dòng nào là input phân loại
+        categories = {}
+        for name in self.inputs:
+            values = {row.get(name) for row in rows}
+            if any(isinstance(value, str) for value in values):
+                categories[name] = sorted(str(value) for value in values if value is not None)
+        return categories
+
+    @property
+    def n_column(self):
+        return sum(len(self.categories[name]) if name in self.categories else 1 for name in self.inputs)
+
+    def create_input_matrix(self, samples):
+        # list dict hoặc mảng đã mã hóa (n, n_column) -> mảng float, ô số thiếu = 0
+        if isinstance(samples, np.ndarray):
+            return np.atleast_2d(samples).astype(float)
+        return np.array([self.create_input_row(sample) for sample in samples],
+                        dtype=float).reshape(-1, self.n_column)
+
+    def create_input_row(self, sample):
+        row = []
+        for name in self.inputs:
+            value = sample.get(name)
+            if name in self.categories:
+                levels = self.categories[name]
+                if str(value) not in levels:
+                    raise ValueError(f"Unknown level {value!r} of categorical input '{name}', "
+                                     f"trained levels are {levels}")
+                row.extend(float(str(value) == level) for level in levels)
+                continue
+            try:
+                row.append(float(value or 0.0))
+            except (TypeError, ValueError):
+                raise ValueError(f"Input '{name}' has non-numeric value {value!r} "
+                                 f"but was numeric in the training rows") from None
+        return row
+
+    def normalize(self, X):
+        return (X - self.input_low) / self.input_scale
+
+    def create_kernel(self):
+        return (ConstantKernel(1.0, (1e-3, 1e3))
+                * Matern(length_scale=np.ones(self.n_column), length_scale_bounds=(1e-2, 1e2), nu=self.nu)
+                + WhiteKernel(1e-6, (1e-10, 1e-1)))
+
+    def fit(self, rows):
+        """Huấn luyện mỗi output trên các dòng có giá trị hữu hạn của output đó"""
+        if len(rows) == 0:
+            raise ValueError("No training rows")
+        self.categories = self.find_categories(rows)
+        X = self.create_input_matrix(rows)
+        self.input_low = X.min(axis=0)
+        span = X.max(axis=0) - self.input_low
+        self.input_scale = np.where(span > 0, span, 1.0)
+
+        for name in self.outputs:
+            y = np.array([np.nan if row.get(name) is None else float(row[name]) for row in rows])
+            keep = np.isfinite(y)
+            if np.count_nonzero(keep) < 2:
+                raise ValueError(f"Output '{name}' has fewer than 2 training values")
+
+            regressor = GaussianProcessRegressor(kernel=self.create_kernel(),
+                                                 normalize_y=True,
+                                                 n_restarts_optimizer=self.n_restarts_optimizer,
+                                                 random_state=self.seed)
+            with warnings.catch_warnings():
+                # Ít dữ liệu: siêu tham số chạm biên là bình thường
+                warnings.simplefilter("ignore", ConvergenceWarning)
+                regressor.fit(self.normalize(X[keep]), y[keep])
+            self.regressors[name] = regressor
+            self.output_scale[name] = float(np.std(y[keep])) or 1.0
+            self.n_train[name] = int(np.count_nonzero(keep))
+        return self
+
+    def predict(self, samples):
+        """Giá trị dự đoán và độ lệch chuẩn của mọi output tại samples"""
+        if not self.regressors:
+            raise RuntimeError("SurrogateModel is not trained, call fit() first")
+        X = self.normalize(self.create_input_matrix(samples))
+        prediction = Prediction()
+        for name in self.outputs:
+            mean, std = self.regressors[name].predict(X, return_std=True)
+            prediction.mean[name] = mean
+            prediction.std[name] = std
+        return prediction
+
+    def find_relative_uncertainty(self, samples):
+        """Max theo output của std / độ lệch chuẩn output khi huấn luyện, cho mỗi sample"""
+        prediction = self.predict(samples)
+        return np.max([prediction.std[name] / self.output_scale[name] for name in self.outputs], axis=0)
+
+    def save(self, path):
+        KeyValueStore(path).save(STORE_KEY, self)
+
+    @staticmethod
+    def load(path):
+        model = KeyValueStore(path).load(STORE_KEY)
+        if model is None:
+            raise FileNotFoundError(f"No surrogate model stored at '{path}'")
+        return model
@@ -0,0 +1,47 @@
+import sys
+import os
+import numpy as np
+import paths
+
+def test():
+    from surrogate.utils.find_operating_point_table import find_operating_point_table
+
+    rows = []
+    for iron in ("M19", "M27"):
+        for offset, torque in enumerate((1.0, 3.0, 2.0)):
+            rows.append({"rotor_iron_type": iron, "airgap": 5e-4, "winding_current_1": 2.0,
+                         "rotor_offset": offset, "torque": torque + (iron == "M27"),
+                         "flux_linkage_1": -0.1 * (offset + 1), "flux_linkage_2": 0.05})
+    rows.append({"rotor_iron_type": "M19", "airgap": 5e-4, "winding_current_1": 2.0, "torque": None})
+    # Dòng điện trống = 0: cùng điểm làm việc với dòng điện 0
+    rows.append({"rotor_iron_type": "M19", "airgap": 5e-4, "winding_current_1": None, "torque": -1.0})
+    rows.append({"rotor_iron_type": "M19", "airgap": 5e-4, "winding_current_1": 0.0, "torque": 1.0})
+
+    table = find_operating_point_table(rows, ["rotor_iron_type", "airgap", "winding_current_1"])
+    assert table.outputs == ["average_torque", "torque_ripple", "torque_peak_to_peak",
+                             "flux_linkage_peak_1", "flux_linkage_peak_2"]
+    points = {(point["rotor_iron_type"], point["winding_current_1"]): point for point in table.rows}
+    assert set(points) == {("M19", 2.0), ("M27", 2.0), ("M19", 0.0)}
+
+    point = points[("M19", 2.0)]
+    assert point["n_position"] == 3
+    assert np.isclose(point["average_torque"], 2.0)
+    assert np.isclose(point["torque_peak_to_peak"], 2.0)
+    assert np.isclose(point["torque_ripple"], 1.0)
+    assert np.isclose(point["flux_linkage_peak_1"], 0.3)
+    assert np.isclose(point["flux_linkage_peak_2"], 0.05)
+    assert np.isclose(points[("M27", 2.0)]["average_torque"], 3.0)
+
+    # Trung bình bằng 0: không định nghĩa ripple, không có từ thông thì để None
+    point = points[("M19", 0.0)]
+    assert point["n_position"] == 2 and point["torque_ripple"] is None
+    assert point["flux_linkage_peak_1"] is None
+
+if __name__ == "__main__":
+    current_file = os.path.abspath(__file__)
+    root_dir = os.path.dirname(os.path.dirname(os.path.dirname(current_file)))
+
+    if root_dir not in sys.path:
+        sys.path.append(root_dir)
+
+    test()
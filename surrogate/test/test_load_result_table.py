@@ -0,0 +1,47 @@
+import sys
+import os
+import tempfile
+import numpy as np
+import paths
+
+def test():
+    from storage.models.StreamingResultWriter import StreamingResultWriter
+    from storage.models.TableResultWriter import TableResultWriter
+    from surrogate.utils.load_result_table import load_result_table
+
+    with tempfile.TemporaryDirectory() as root:
+        # Bảng CSV của design study: chỉ lấy case 'ok', số -> float, chuỗi giữ nguyên, ô trống -> None
+        path = os.path.join(root, "study.csv")
+        writer = TableResultWriter(path, ["case_id", "status", "rotor_iron_type", "airgap", "torque"])
+        writer.write({"case_id": "d0", "status": "ok", "rotor_iron_type": "M19", "airgap": 5e-4, "torque": 1.5})
+        writer.write({"case_id": "d1", "status": "failed", "rotor_iron_type": "M27", "airgap": 6e-4})
+        writer.write({"case_id": "d2", "status": "ok", "rotor_iron_type": "M27", "airgap": 7e-4})
+
+        rows = load_result_table(path, constant={"magnet_length": 4e-3}).rows
+        assert [row["case_id"] for row in rows] == ["d0", "d2"]
+        assert rows[0]["rotor_iron_type"] == "M19" and rows[0]["torque"] == 1.5
+        assert rows[1]["torque"] is None
+        assert all(row["magnet_length"] == 4e-3 for row in rows)
+
+        # Thư mục sweep: info + flux_linkage tách theo pha
+        sweep = os.path.join(root, "sweep")
+        with StreamingResultWriter(sweep) as writer:
+            for offset in range(2):
+                writer.write(offset,
+                             info={"rotor_offset": offset, "torque": 0.5 * offset, "winding_current": [5.0, -2.5, -2.5]},
+                             flux_linkage=np.array([0.1, -0.05, -0.05]) * (offset + 1))
+
+        rows = load_result_table(sweep).rows
+        assert [row["case_id"] for row in rows] == ["0", "1"]
+        assert rows[1]["rotor_offset"] == 1.0 and rows[1]["torque"] == 0.5
+        assert rows[1]["winding_current_3"] == -2.5
+        assert np.isclose(rows[1]["flux_linkage_1"], 0.2)
+
+if __name__ == "__main__":
+    current_file = os.path.abspath(__file__)
+    root_dir = os.path.dirname(os.path.dirname(os.path.dirname(current_file)))
+
+    if root_dir not in sys.path:
+        sys.path.append(root_dir)
+
+    test()
@@ -0,0 +1,64 @@
+import sys
+import os
+import tempfile
+import numpy as np
+import paths
+
+def find_torque(airgap, current, iron):
+    return (1.0 + 0.5 * (iron == "M27")) * current * (1.0 - 200.0 * airgap)
+
+def test():
+    from surrogate.models.SurrogateModel import SurrogateModel
+
+    rows = [{"airgap": airgap, "winding_current_1": current, "rotor_iron_type": iron,
+             "average_torque": find_torque(airgap, current, iron)}
+            for airgap in np.linspace(5e-4, 1.5e-3, 4)
+            for current in (0.0, 2.5, 5.0)
+            for iron in ("M19", "M27")]
+    model = SurrogateModel(["airgap", "winding_current_1", "rotor_iron_type"], ["average_torque"]).fit(rows)
+    assert model.categories == {"rotor_iron_type": ["M19", "M27"]}
+    assert model.n_column == 4
+
+    # Điểm huấn luyện: nội suy gần đúng, độ bất định nhỏ
+    prediction = model.predict(rows)
+    target = np.array([row["average_torque"] for row in rows])
+    assert np.max(np.abs(prediction.mean["average_torque"] - target)) < 1e-2 * np.max(np.abs(target))
+    assert np.all(model.find_relative_uncertainty(rows) < 0.1)
+
+    # Điểm giữa: mức phân loại khác nhau cho dự đoán khác nhau
+    samples = [{"airgap": 1e-3, "winding_current_1": 4.0, "rotor_iron_type": iron} for iron in ("M19", "M27")]
+    mean = model.predict(samples).mean["average_torque"]
+    expected = [find_torque(1e-3, 4.0, iron) for iron in ("M19", "M27")]
+    assert np.allclose(mean, expected, rtol=0.05), (mean, expected)
+
+    try:
+        model.predict([{"airgap": 1e-3, "winding_current_1": 4.0, "rotor_iron_type": "M36"}])
+        assert False, "unknown categorical level must be rejected"
+    except ValueError:
+        pass
+
+    with tempfile.TemporaryDirectory() as root:
+        model.save(root)
+        loaded = SurrogateModel.load(root)
+        assert loaded.categories == model.categories
+        assert np.allclose(loaded.predict(samples).mean["average_torque"], mean)
+        try:
+            SurrogateModel.load(os.path.join(root, "empty"))
+            assert False, "missing model must raise"
+        except FileNotFoundError:
+            pass
+
+    try:
+        SurrogateModel(["airgap"], ["average_torque"]).predict(samples)
+        assert False, "untrained model must raise"
+    except RuntimeError:
+        pass
+
+if __name__ == "__main__":
+    current_file = os.path.abspath(__file__)
+    root_dir = os.path.dirname(os.path.dirname(os.path.dirname(current_file)))
+
+    if root_dir not in sys.path:
+        sys.path.append(root_dir)
+
+    test()
@@ -0,0 +1,57 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, List
+import numpy as np
+
+@dataclass
+class Output:
+    inputs: List[str] = field(default_factory=list)
+    outputs: List[str] = field(default_factory=list)
+    rows: List[Dict[str, Any]] = field(default_factory=list)   # mỗi điểm làm việc (thiết kế + dòng điện) một dict
+
+def find_operating_point_table(rows, inputs):
+    """
+    Gộp các case cùng giá trị inputs (tham số thiết kế, dòng điện pha) qua mọi vị trí rotor:
+    - average_torque: mô-men trung bình,
+    - torque_ripple: (max - min) / |trung bình| (None khi trung bình bằng 0),
+    - torque_peak_to_peak: max - min,
+    - flux_linkage_peak_k: max |flux_linkage_k| của pha k,
+    - n_position: số vị trí rotor đã gộp.
+    Ô trống của inputs (vd. dòng điện không có) được coi là 0; input dạng chuỗi (vd. loại
+    thép) được giữ nguyên làm mức phân loại.
+    """
+    groups = {}
+    for row in rows:
+        if row.get("torque") is None:
+            continue
+        key = tuple(find_input_value(row.get(name)) for name in inputs)
+        groups.setdefault(key, []).append(row)
+
+    flux_linkage_columns = sorted({name for row in rows for name in row
+                                   if name.startswith("flux_linkage_") and row[name] is not None},
+                                  key=lambda name: int(name.rsplit("_", 1)[1]))
+    result = Output(inputs=list(inputs),
+                    outputs=["average_torque", "torque_ripple", "torque_peak_to_peak"]
+                            + [name.replace("flux_linkage_", "flux_linkage_peak_") for name in flux_linkage_columns])
+
+    for key, group in groups.items():
+        torque = np.array([row["torque"] for row in group], dtype=float)
+        average = float(np.mean(torque))
+        peak_to_peak = float(np.ptp(torque))
+        point = dict(zip(inputs, key),
+                     average_torque=average,
+                     torque_ripple=peak_to_peak / abs(average) if average != 0 else None,
+                     torque_peak_to_peak=peak_to_peak,
+                     n_position=len(group))
+        for name in flux_linkage_columns:
+            values = [abs(row[name]) for row in group if row.get(name) is not None]
+            point[name.replace("flux_linkage_", "flux_linkage_peak_")] = float(max(values)) if values else None
+        result.rows.append(point)
+    return result
+
+def find_input_value(value):
+    # Ô trống -> 0, chuỗi (tham số phân loại) giữ nguyên, còn lại -> float
+    if value is None or value == "":
+        return 0.0
+    if isinstance(value, str):
+        return value
+    return float(value)
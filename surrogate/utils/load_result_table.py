@@ -0,0 +1,57 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, List
+import os
+import csv
+import numpy as np
+from storage.models.StreamingResultReader import INDEX_FILE_NAME, StreamingResultReader
+
+@dataclass
+class Output:
+    rows: List[Dict[str, Any]] = field(default_factory=list)   # mỗi case một dict, số đã chuyển sang float
+
+def load_result_table(path, constant=None):
+    """
+    Đọc kết quả đã lưu thành danh sách dòng:
+    - file CSV của run_design_study (TableResultWriter): chỉ lấy case có status 'ok';
+    - thư mục StreamingResultWriter của run_rotor_sweep / run_case_file (đọc bằng
+      StreamingResultReader, không sửa file): info của mỗi case
+      (rotor_offset, torque, winding_current) và mảng flux_linkage, tách theo pha thành
+      cột winding_current_k / flux_linkage_k như bảng design study.
+    constant: dict cột thêm vào mọi dòng (vd. tham số của motor đã sweep).
+    """
+    if os.path.isdir(path) and os.path.exists(os.path.join(path, INDEX_FILE_NAME)):
+        rows = load_sweep_rows(path)
+    else:
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            rows = [{name: parse_value(value) for name, value in row.items()}
+                    for row in csv.DictReader(f)
+                    if row.get("status", "ok") == "ok"]
+
+    if constant:
+        rows = [dict(row, **constant) for row in rows]
+    return Output(rows=rows)
+
+def load_sweep_rows(path):
+    rows = []
+    # Chỉ đọc: sweep có thể vẫn đang ghi vào thư mục này
+    with StreamingResultReader(path) as reader:
+        for case_id in reader.completed_cases():
+            info = reader.info(case_id)
+            row = {"case_id": case_id,
+                   "rotor_offset": float(info.get("rotor_offset", 0)),
+                   "torque": float(info["torque"])}
+            for name, values in (("winding_current", info.get("winding_current")),
+                                 ("flux_linkage", reader.load(case_id).get("flux_linkage"))):
+                if values is not None:
+                    row.update({f"{name}_{phase + 1}": float(value) for phase, value in enumerate(np.ravel(values))})
+            rows.append(row)
+    return rows
+
+def parse_value(value):
+    # Giá trị CSV: số -> float, ô trống -> None, còn lại giữ chuỗi
+    if value is None or value == "":
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return value
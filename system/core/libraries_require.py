@@ -16,6 +16,7 @@ def install_library():
         'rtree': 'rtree',
         'tqdm': 'tqdm',
         'imageio': 'imageio',
+        'imageio_ffmpeg': 'imageio-ffmpeg',
         'pympler': 'pympler',
         'win32com.client': 'pywin32',
         'ansys.motorcad.core': 'ansys-motorcad-core',
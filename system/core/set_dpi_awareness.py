@@ -0,0 +1,22 @@
+import sys
+
+_dpi_awareness_set = False
+
+def set_dpi_awareness():
+    """
+    Bật DPI awareness để cửa sổ VTK / Qt không bị mờ trên màn hình scale cao.
+    Chỉ có tác dụng trên Windows, gọi ngay trước khi mở cửa sổ đầu tiên.
+    """
+    global _dpi_awareness_set
+    if _dpi_awareness_set or sys.platform != "win32":
+        return
+    _dpi_awareness_set = True
+
+    import ctypes
+    try:
+        ctypes.windll.shcore.SetProcessDpiAwareness(1)
+    except Exception:
+        try:
+            ctypes.windll.user32.SetProcessDPIAware()
+        except Exception:
+            pass